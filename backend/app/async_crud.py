@@ -0,0 +1,127 @@
+"""Async CRUD operations for tasks.
+
+Each coroutine runs the matching function from ``app.crud`` on the async
+session's connection via ``AsyncSession.run_sync``, so the query logic is
+shared with the sync path while all database I/O goes through the async
+driver without blocking the event loop.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.models import Task, TaskStatus
+from app.schemas import TaskCreate, TaskUpdate, TaskUpdateStatus
+from app.writer import awrite
+
+
+async def create_task(db: AsyncSession, task_data: TaskCreate) -> Task:
+    """Create a new task."""
+    return await awrite(db, crud.create_task, task_data)
+
+
+async def get_task(db: AsyncSession, task_id: int) -> Optional[Task]:
+    """Retrieve a single task by ID."""
+    return await db.run_sync(crud.get_task, task_id)
+
+
+async def get_task_stamp(db: AsyncSession, task_id: int) -> Optional[datetime]:
+    """Return a task's ``updated_at``, which validates its cached payload."""
+    return await db.run_sync(crud.get_task_stamp, task_id)
+
+
+async def get_task_row(
+    db: AsyncSession, task_id: int, fields: Optional[tuple[str, ...]] = None
+) -> Optional[Row]:
+    """Select only ``fields`` (default all) of one task as a plain row."""
+    return await db.run_sync(crud.get_task_row, task_id, fields)
+
+
+async def get_all_tasks(
+    db: AsyncSession,
+    status: Optional[TaskStatus] = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    q: Optional[str] = None,
+    due_before: Optional[datetime] = None,
+    due_after: Optional[datetime] = None,
+    overdue: bool = False,
+) -> tuple[list[Task], Optional[int]]:
+    """Retrieve all tasks with optional filtering and pagination."""
+    return await db.run_sync(
+        crud.get_all_tasks,
+        status=status,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total,
+        q=q,
+        due_before=due_before,
+        due_after=due_after,
+        overdue=overdue,
+    )
+
+
+async def get_task_rows(
+    db: AsyncSession,
+    status: Optional[TaskStatus] = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    q: Optional[str] = None,
+    due_before: Optional[datetime] = None,
+    due_after: Optional[datetime] = None,
+    overdue: bool = False,
+    fields: Optional[tuple[str, ...]] = None,
+    include_archived: bool = False,
+) -> tuple[list[Row], Optional[int]]:
+    """Like ``get_all_tasks`` but returns plain rows without ORM hydration."""
+    return await db.run_sync(
+        crud.get_task_rows,
+        status=status,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total,
+        q=q,
+        due_before=due_before,
+        due_after=due_after,
+        overdue=overdue,
+        fields=fields,
+        include_archived=include_archived,
+    )
+
+
+async def get_data_version(db: AsyncSession) -> int:
+    """Return the current data version, which every write to tasks bumps."""
+    return await db.run_sync(crud.get_data_version)
+
+
+async def next_overdue_at(db: AsyncSession) -> Optional[datetime]:
+    """Return when the next open task falls due, or ``None`` if none will."""
+    return await db.run_sync(crud.next_overdue_at)
+
+
+async def update_task_status(
+    db: AsyncSession, task_id: int, status_data: TaskUpdateStatus
+) -> Optional[Task]:
+    """Update only the status of a task; ``None`` if it does not exist."""
+    return await awrite(db, crud.update_task_status, task_id, status_data)
+
+
+async def update_task(
+    db: AsyncSession, task_id: int, task_data: TaskUpdate
+) -> Optional[Task]:
+    """Update any fields of a task; ``None`` if it does not exist."""
+    return await awrite(db, crud.update_task, task_id, task_data)
+
+
+async def delete_task(db: AsyncSession, task_id: int) -> bool:
+    """Delete a task; returns ``False`` if it does not exist."""
+    return await awrite(db, crud.delete_task, task_id)
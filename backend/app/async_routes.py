@@ -0,0 +1,173 @@
+"""Async API route handlers for task management.
+
+Mounted instead of the sync handlers in ``app.routes`` when
+``DATABASE_MODE=async``; ``without_replaced`` leaves the sync versions of
+these operations out so each appears once in the OpenAPI schema. Task ids
+use the ``int`` path convertor so these routes never shadow the static paths
+on the sync router.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import async_crud
+from app.cache import task_cache
+from app.database import get_async_db
+from app.etags import cache_headers, make_etag, not_modified
+from app.routes import (
+    LIST_TASKS_DESCRIPTION,
+    TaskListParams,
+    selected_fields,
+    serialize_task,
+)
+from app.schemas import (
+    TaskCreate,
+    TaskListResponse,
+    TaskResponse,
+    TaskUpdate,
+    TaskUpdateStatus,
+)
+
+router = APIRouter(prefix="/tasks", tags=["Tasks"])
+
+
+def _or_404(task, task_id: int):
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Task with id {task_id} not found",
+        )
+    return task
+
+
+@router.post(
+    "",
+    response_model=TaskResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create a new task",
+    description="Create a new task with a title, optional description, status, and due date.",
+)
+async def create_task(task_data: TaskCreate, db: AsyncSession = Depends(get_async_db)):
+    """Create a new caseworker task."""
+    return await async_crud.create_task(db, task_data)
+
+
+@router.get(
+    "",
+    response_model=TaskListResponse,
+    summary="Retrieve all tasks",
+    description=LIST_TASKS_DESCRIPTION,
+)
+async def get_all_tasks(
+    request: Request,
+    params: TaskListParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Retrieve all tasks, optionally filtered by status."""
+    version = await async_crud.get_data_version(db)
+    if params.overdue:
+        # The overdue set also changes when the next open task falls due
+        version = f"{version}.{await async_crud.next_overdue_at(db)}"
+    etag = make_etag(version, request)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    try:
+        rows, total = await async_crud.get_task_rows(db, **params.crud_kwargs())
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    return params.response(rows, total, etag)
+
+
+@router.get(
+    "/{task_id:int}",
+    response_model=TaskResponse,
+    summary="Retrieve a task by ID",
+    description="Retrieve a single task by its unique identifier.",
+)
+async def get_task(
+    task_id: int,
+    request: Request,
+    selected: Optional[tuple[str, ...]] = Depends(selected_fields),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Retrieve a task by ID."""
+    version = await async_crud.get_data_version(db)
+    etag = make_etag(version, request)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    if selected:
+        # Projections skip the cache, which holds full payloads
+        row = await async_crud.get_task_row(db, task_id, selected)
+        body = serialize_task(_or_404(row, task_id), selected)
+        return Response(
+            body, media_type="application/json", headers=cache_headers(etag)
+        )
+    stamp = None
+    if task_cache.needs_stamp(task_id):
+        stamp = await async_crud.get_task_stamp(db, task_id)
+    body = task_cache.get(task_id, stamp)
+    if body is None:
+        task = _or_404(await async_crud.get_task(db, task_id), task_id)
+        body = serialize_task(task)
+        task_cache.put(task_id, task.updated_at, body)
+    return Response(body, media_type="application/json", headers=cache_headers(etag))
+
+
+@router.patch(
+    "/{task_id:int}/status",
+    response_model=TaskResponse,
+    summary="Update a task's status",
+    description="Update only the status field of an existing task.",
+)
+async def update_task_status(
+    task_id: int,
+    status_data: TaskUpdateStatus,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Update the status of an existing task."""
+    task = await async_crud.update_task_status(db, task_id, status_data)
+    return _or_404(task, task_id)
+
+
+@router.put(
+    "/{task_id:int}",
+    response_model=TaskResponse,
+    summary="Update a task",
+    description="Update any fields of an existing task.",
+)
+async def update_task(
+    task_id: int, task_data: TaskUpdate, db: AsyncSession = Depends(get_async_db)
+):
+    """Update an existing task."""
+    return _or_404(await async_crud.update_task(db, task_id, task_data), task_id)
+
+
+@router.delete(
+    "/{task_id:int}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Delete a task",
+    description="Delete a task by its unique identifier.",
+)
+async def delete_task(task_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Delete a task."""
+    _or_404(await async_crud.delete_task(db, task_id), task_id)
+
+
+def without_replaced(sync_router: APIRouter) -> APIRouter:
+    """Return ``sync_router`` minus the operations this module's router serves."""
+    replaced = {
+        (route.path_format, method)
+        for route in router.routes
+        for method in route.methods
+    }
+    return APIRouter(
+        routes=[
+            route
+            for route in sync_router.routes
+            if not any((route.path_format, m) in replaced for m in route.methods)
+        ]
+    )
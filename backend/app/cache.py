@@ -0,0 +1,96 @@
+"""In-process read-through cache of serialized task payloads."""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+TASK_CACHE_SIZE = int(os.getenv("TASK_CACHE_SIZE", "10000"))
+TASK_CACHE_TTL = float(os.getenv("TASK_CACHE_TTL", "30"))
+
+# "version": an entry is served only while the task's row still carries the
+# stamp (its ``updated_at``) it was filled with, which keeps several workers
+# coherent without a write to one task evicting every other.
+# "ttl": trust in-process invalidation and let entries live for the TTL;
+# only safe with a single worker or when TTL-bounded staleness is fine.
+TASK_CACHE_COHERENCE = os.getenv("TASK_CACHE_COHERENCE", "version")
+
+
+class TaskCache:
+    """Bounded LRU cache with per-entry TTL, keyed by task id."""
+
+    def __init__(self, capacity: int, ttl: float, coherence: str = "version"):
+        self.capacity = capacity
+        self.ttl = ttl
+        self.coherence = coherence
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[int, tuple[float, Hashable, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def needs_stamp(self, task_id: int) -> bool:
+        """Whether ``get`` for this task must be given the row's current stamp.
+
+        Only true in ``version`` mode while an entry is held, so a miss costs
+        no extra lookup.
+        """
+        with self._lock:
+            return self.coherence == "version" and task_id in self._entries
+
+    def get(self, task_id: int, stamp: Optional[Hashable]) -> Optional[bytes]:
+        """Return the cached payload if it was filled at the row's ``stamp``.
+
+        ``stamp`` is ignored in ``ttl`` mode; ``None`` (row gone) is a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(task_id)
+            if entry is not None:
+                expires_at, entry_stamp, body = entry
+                fresh = expires_at > time.monotonic() and (
+                    self.coherence != "version"
+                    or (stamp is not None and entry_stamp == stamp)
+                )
+                if fresh:
+                    self._entries.move_to_end(task_id)
+                    self.hits += 1
+                    return body
+                del self._entries[task_id]
+            self.misses += 1
+            return None
+
+    def put(self, task_id: int, stamp: Hashable, body: bytes) -> None:
+        """Store a payload, evicting the least recently used entry if full."""
+        if self.capacity <= 0:
+            return
+        with self._lock:
+            self._entries[task_id] = (time.monotonic() + self.ttl, stamp, body)
+            self._entries.move_to_end(task_id)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, task_id: int) -> None:
+        """Drop the entry for a task after it was written."""
+        with self._lock:
+            self._entries.pop(task_id, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return the hit/miss/eviction counters and current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "capacity": self.capacity,
+            }
+
+
+task_cache = TaskCache(TASK_CACHE_SIZE, TASK_CACHE_TTL, TASK_CACHE_COHERENCE)
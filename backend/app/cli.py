@@ -0,0 +1,95 @@
+"""Maintenance commands for the task database.
+
+Usage (from the ``backend`` directory)::
+
+    python -m app.cli rebuild-stats
+    python -m app.cli archive --days 30
+    python -m app.cli compact-changes --tombstone-days 7
+"""
+
+import argparse
+from datetime import timedelta
+from typing import Optional
+
+from app import crud
+from app.database import SessionLocal, get_engine
+from app.maintenance import (
+    ARCHIVE_AFTER_DAYS,
+    CHANGE_TOMBSTONE_DAYS,
+    archive_completed,
+    compact_changes,
+)
+from app.models import init_schema
+
+
+def rebuild_stats() -> None:
+    """Rebuild the per-status counters and dashboard summary from the tasks."""
+    engine = get_engine()
+    init_schema(engine)
+    with SessionLocal(bind=engine) as db:
+        counter_drift = crud.reconcile_task_counters(db)
+        stats_drift = crud.rebuild_task_stats(db)
+    for task_status, drift in counter_drift.items():
+        print(f"task_counters   {task_status.value:<12} {drift:+d}")
+    for (task_status, day), drift in sorted(stats_drift.items()):
+        print(f"task_due_stats  {task_status.value:<12} {day} {drift:+d}")
+    print(
+        f"Rebuilt statistics: {len(counter_drift)} counter(s) and "
+        f"{len(stats_drift)} summary bucket(s) corrected."
+    )
+
+
+def archive(days: Optional[float] = None) -> None:
+    """Move tasks completed more than ``days`` ago to the archive table."""
+    if days is None:
+        days = ARCHIVE_AFTER_DAYS or 30
+    engine = get_engine()
+    init_schema(engine)
+    moved = archive_completed(engine, timedelta(days=days))
+    print(f"Archived {moved} task(s) completed more than {days:g} day(s) ago.")
+
+
+def compact(tombstone_days: Optional[float] = None) -> None:
+    """Drop superseded change-log entries and tombstones past their TTL."""
+    if tombstone_days is None:
+        tombstone_days = CHANGE_TOMBSTONE_DAYS
+    engine = get_engine()
+    init_schema(engine)
+    removed = compact_changes(engine, timedelta(days=tombstone_days))
+    print(
+        f"Removed {removed} change log entries "
+        f"(tombstones older than {tombstone_days:g} day(s))."
+    )
+
+
+COMMANDS = {
+    "archive": archive,
+    "compact-changes": compact,
+    "rebuild-stats": rebuild_stats,
+}
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Task database maintenance")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    parser.add_argument(
+        "--days",
+        type=float,
+        help="archive: age in days of completed tasks to move (default 30)",
+    )
+    parser.add_argument(
+        "--tombstone-days",
+        type=float,
+        help="compact-changes: age in days of deletions to forget (default 7)",
+    )
+    args = parser.parse_args(argv)
+    if args.command == "archive":
+        archive(args.days)
+    elif args.command == "compact-changes":
+        compact(args.tombstone_days)
+    else:
+        COMMANDS[args.command]()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""Negotiated response compression with a cache of compressed bodies.
+
+``CompressionMiddleware`` compresses single-chunk responses of at least
+``COMPRESSION_MIN_SIZE`` bytes with the best encoding the client accepts:
+zstd or brotli when their packages (``zstandard``, ``brotli``) are
+installed, else gzip. Streaming responses (exports, the change feed) pass
+through untouched. Responses with an ETag (task lists, single tasks,
+stats) are keyed by ETag and encoding in a small LRU cache; the ETag
+already covers the path, query and data version, so a popular page is
+compressed once per write instead of once per request. Compressed
+responses, and 304s revalidating one, carry the ETag with the
+content-coding appended so each variant has its own validator. Set
+``COMPRESSION_ENABLED=false`` to leave responses alone.
+"""
+
+import gzip
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from app.etags import encoded_etag
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+# Overrides each codec's default level below when set
+COMPRESSION_LEVEL = os.getenv("COMPRESSION_LEVEL")
+COMPRESSION_CACHE_SIZE = int(os.getenv("COMPRESSION_CACHE_SIZE", "256"))
+
+# Default levels trade a little ratio for speed; all three compress JSON
+# task lists to well under a fifth of their size at these settings
+DEFAULT_LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+
+# Content types worth compressing; anything else passes through
+_COMPRESSIBLE = ("application/json", "text/", "application/x-ndjson")
+
+
+def _codecs(level: Optional[int]) -> dict[str, Callable[[bytes], bytes]]:
+    """Available encoders in order of preference for equally weighted tokens."""
+    codecs = {}
+    if zstandard is not None:
+        zstd_level = level if level is not None else DEFAULT_LEVELS["zstd"]
+        codecs["zstd"] = zstandard.ZstdCompressor(level=zstd_level).compress
+    if brotli is not None:
+        quality = level if level is not None else DEFAULT_LEVELS["br"]
+        codecs["br"] = lambda body: brotli.compress(body, quality=quality)
+    gzip_level = level if level is not None else DEFAULT_LEVELS["gzip"]
+    codecs["gzip"] = lambda body: gzip.compress(body, gzip_level, mtime=0)
+    return codecs
+
+
+def choose_encoding(accept_encoding: str, available) -> Optional[str]:
+    """Pick the best of ``available`` for an ``Accept-Encoding`` header.
+
+    Honours q-values (``q=0`` refuses an encoding) and ``*``; ties go to the
+    earlier entry in ``available``. Returns ``None`` for identity.
+    """
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        token, _, params = item.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[token] = weight
+    best, best_weight = None, 0.0
+    for encoding in available:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+class CompressedBodyCache:
+    """Bounded LRU of compressed bodies keyed by ``(etag, encoding)``."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, etag: str, encoding: str) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get((etag, encoding))
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((etag, encoding))
+            self.hits += 1
+            return body
+
+    def put(self, etag: str, encoding: str, body: bytes) -> None:
+        if self.capacity <= 0:
+            return
+        with self._lock:
+            self._entries[(etag, encoding)] = body
+            self._entries.move_to_end((etag, encoding))
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+            }
+
+
+compressed_cache = CompressedBodyCache(COMPRESSION_CACHE_SIZE)
+
+
+def _encode_etag(headers, encoding: str) -> list[tuple[bytes, bytes]]:
+    """Copy of ``headers`` with the ETag, if any, suffixed with ``encoding``."""
+    return [
+        (
+            name,
+            encoded_etag(value.decode("latin-1"), encoding).encode("latin-1")
+            if name == b"etag"
+            else value,
+        )
+        for name, value in headers
+    ]
+
+
+def _vary_on_encoding(headers) -> list[tuple[bytes, bytes]]:
+    """Copy of ``headers`` with ``Accept-Encoding`` added to ``Vary``."""
+    vary, others = [b"Accept-Encoding"], []
+    for name, value in headers:
+        if name == b"vary":
+            vary.insert(0, value)
+        else:
+            others.append((name, value))
+    return [*others, (b"vary", b", ".join(vary))]
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing complete responses for capable clients."""
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = COMPRESSION_MIN_SIZE,
+        level: Optional[int] = (
+            int(COMPRESSION_LEVEL) if COMPRESSION_LEVEL else None
+        ),
+        cache: CompressedBodyCache = compressed_cache,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.codecs = _codecs(level)
+        self.cache = cache
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = if_none_match = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+            elif name == b"if-none-match":
+                if_none_match = value.decode("latin-1")
+        encoding = choose_encoding(accept, self.codecs) if accept else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        passthrough = False
+
+        async def _send(message) -> None:
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                # Held back until the body shows whether to compress
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+            body = message.get("body", b"")
+            if start["status"] == 304 and f'-{encoding}"' in if_none_match:
+                # Revalidated the compressed variant: confirm its ETag
+                passthrough = True
+                headers = _vary_on_encoding(
+                    _encode_etag(start.get("headers", []), encoding)
+                )
+                await send({**start, "headers": headers})
+                await send(message)
+                return
+            if message.get("more_body", False) or not self._compressible(start, body):
+                # Streaming or unsuitable: send everything as it comes
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+            await self._send_compressed(start, body, encoding, send)
+
+        await self.app(scope, receive, _send)
+
+    def _compressible(self, start, body: bytes) -> bool:
+        if len(body) < self.minimum_size or start["status"] < 200:
+            return False
+        content_type = b""
+        for name, value in start.get("headers", []):
+            if name == b"content-encoding":
+                return False
+            if name == b"content-type":
+                content_type = value
+        return content_type.decode("latin-1").startswith(_COMPRESSIBLE)
+
+    async def _send_compressed(self, start, body: bytes, encoding: str, send) -> None:
+        headers = _vary_on_encoding(
+            [item for item in start.get("headers", []) if item[0] != b"content-length"]
+        )
+        etag = next((value for name, value in headers if name == b"etag"), None)
+        key = etag.decode("latin-1") if etag else None
+        compressed = self.cache.get(key, encoding) if key else None
+        if compressed is None:
+            compressed = self.codecs[encoding](body)
+            if key:
+                self.cache.put(key, encoding, compressed)
+        if key:
+            headers = _encode_etag(headers, encoding)
+        headers += [
+            (b"content-encoding", encoding.encode()),
+            (b"content-length", str(len(compressed)).encode()),
+        ]
+        await send({**start, "headers": headers})
+        await send({"type": "http.response.body", "body": compressed})
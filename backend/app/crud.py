@@ -1,11 +1,38 @@
 """CRUD operations for tasks."""
 
-from datetime import datetime, timezone
-from typing import Optional
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Optional, Union
 
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.engine import Row, RowMapping
+from sqlalchemy.orm import Session, aliased
 
-from app.models import Task, TaskStatus
+from app.cache import task_cache
+from app.models import (
+    ArchivedTask,
+    ArchivedTaskCounter,
+    DataVersion,
+    Task,
+    TaskChange,
+    TaskChangeHorizon,
+    TaskChangeOp,
+    TaskCounter,
+    TaskDueStat,
+    TaskStatus,
+    tasks_fts,
+)
 from app.schemas import TaskCreate, TaskUpdate, TaskUpdateStatus
 
 
@@ -23,47 +50,673 @@ def create_task(db: Session, task_data: TaskCreate) -> Task:
     return task
 
 
+def bulk_create_tasks(
+    db: Session, tasks: list[TaskCreate], chunk_size: int = 500
+) -> list[Union[int, str]]:
+    """Create many tasks with one multi-row INSERT ... RETURNING per chunk.
+
+    Each chunk is committed in its own transaction. Returns, in input order,
+    the new task id or, if that item's chunk failed, the error message.
+    """
+    statement = insert(Task.__table__).returning(
+        Task.id, sort_by_parameter_order=True
+    )
+    results: list[Union[int, str]] = []
+    for start in range(0, len(tasks), chunk_size):
+        rows = [task.model_dump() for task in tasks[start : start + chunk_size]]
+        try:
+            ids = list(db.execute(statement, rows).scalars())
+            db.commit()
+        except SQLAlchemyError as exc:
+            db.rollback()
+            results.extend([str(getattr(exc, "orig", None) or exc)] * len(rows))
+        else:
+            results.extend(ids)
+    return results
+
+
 def get_task(db: Session, task_id: int) -> Optional[Task]:
     """Retrieve a single task by ID."""
     return db.query(Task).filter(Task.id == task_id).first()
 
 
+def get_task_stamp(db: Session, task_id: int) -> Optional[datetime]:
+    """Return a task's ``updated_at``, which validates its cached payload."""
+    return db.scalar(select(Task.updated_at).where(Task.id == task_id))
+
+
+TASK_FIELDS = tuple(Task.__table__.columns.keys())
+
+
+def parse_fields(fields: Optional[str]) -> Optional[tuple[str, ...]]:
+    """Turn a comma-separated ``fields`` parameter into task column names.
+
+    Returns ``None`` (every field) for an empty value. ``id`` is always
+    included and names come back in column order. Raises ``ValueError`` for
+    unknown names.
+    """
+    names = {name.strip() for name in (fields or "").split(",")} - {""}
+    if not names:
+        return None
+    unknown = names - set(TASK_FIELDS)
+    if unknown:
+        raise ValueError(
+            f"Unknown field(s): {', '.join(sorted(unknown))}; "
+            f"expected any of {', '.join(TASK_FIELDS)}"
+        )
+    return tuple(name for name in TASK_FIELDS if name in names or name == "id")
+
+
+def _columns(fields: Optional[tuple[str, ...]], *required: str) -> list:
+    """The task columns to select for ``fields`` plus any ``required`` ones."""
+    wanted = set(fields or TASK_FIELDS) | set(required)
+    return [column for column in Task.__table__.columns if column.name in wanted]
+
+
+def get_task_row(
+    db: Session, task_id: int, fields: Optional[tuple[str, ...]] = None
+) -> Optional[Row]:
+    """Select only ``fields`` (default all) of one task as a plain row."""
+    statement = select(*_columns(fields)).where(Task.id == task_id)
+    return db.execute(statement).first()
+
+
+# Statuses a task can be overdue in
+OPEN_STATUSES = (TaskStatus.TODO, TaskStatus.IN_PROGRESS)
+
+
+def _utc_wall_clock(value: datetime) -> datetime:
+    """Turn a bound into the naive UTC form ``due_date`` is stored in.
+
+    SQLite drops ``tzinfo`` when binding, so an offset-aware bound would
+    otherwise be compared as its local wall-clock time. Naive input is
+    taken to be UTC already.
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _filter_tasks(
+    statement,
+    status=None,
+    due_before=None,
+    due_after=None,
+    overdue=False,
+    table=Task.__table__,
+):
+    """Restrict a select/update statement by status and due-date range.
+
+    ``overdue`` keeps only open tasks whose due date has passed. ``table``
+    is ``tasks`` or ``archived_tasks``.
+    """
+    if status:
+        statement = statement.where(table.c.status == status)
+    if overdue:
+        statement = statement.where(
+            table.c.status.in_(OPEN_STATUSES),
+            table.c.due_date < datetime.now(timezone.utc),
+        )
+    if due_before:
+        statement = statement.where(table.c.due_date < _utc_wall_clock(due_before))
+    if due_after:
+        statement = statement.where(table.c.due_date >= _utc_wall_clock(due_after))
+    return statement
+
+
+def _filter_listed_tasks(
+    statement,
+    status=None,
+    due_before=None,
+    due_after=None,
+    overdue=False,
+    table=Task.__table__,
+):
+    """``_filter_tasks`` for list and count queries.
+
+    A due-date range with no status filter spells out every status so the
+    ``(status, due_date)`` index serves it as a few range scans.
+    """
+    if (due_before or due_after) and not (status or overdue):
+        statement = statement.where(table.c.status.in_(list(TaskStatus)))
+    return _filter_tasks(statement, status, due_before, due_after, overdue, table)
+
+
+def iter_task_rows(
+    db: Session,
+    status: Optional[TaskStatus] = None,
+    due_before: Optional[datetime] = None,
+    due_after: Optional[datetime] = None,
+    batch_size: int = 1000,
+) -> Iterator[list[RowMapping]]:
+    """Stream matching tasks as plain rows, ``batch_size`` rows at a time.
+
+    Rows are fetched incrementally from the cursor, so memory use does not
+    grow with the number of tasks.
+    """
+    statement = _filter_tasks(
+        select(*Task.__table__.columns), status, due_before, due_after
+    ).order_by(Task.id)
+    result = db.execute(statement, execution_options={"yield_per": batch_size})
+    for partition in result.mappings().partitions():
+        yield partition
+
+
+def encode_cursor(task: Union[Task, Row]) -> str:
+    """Build an opaque pagination cursor pointing just past the given task."""
+    payload = json.dumps([task.created_at.isoformat(), task.id])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor produced by ``encode_cursor``.
+
+    Raises ``ValueError`` if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, task_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(task_id)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid pagination cursor") from exc
+
+
+def _paginate(
+    statement, skip: int, limit: int, cursor: Optional[str], columns=Task.__table__.c
+):
+    """Order newest first and apply offset or keyset pagination.
+
+    ``columns`` holds the ``created_at`` and ``id`` to order and seek on.
+    """
+    if cursor:
+        created_at, task_id = decode_cursor(cursor)
+        statement = statement.where(
+            tuple_(columns.created_at, columns.id) < (created_at, task_id)
+        )
+        skip = 0
+    return (
+        statement.order_by(columns.created_at.desc(), columns.id.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+
+
+def fts_query(q: str) -> str:
+    """Turn free text into a safe FTS5 query.
+
+    Every word must match; a trailing ``*`` makes a word a prefix match.
+    Raises ``ValueError`` if there is nothing to search for.
+    """
+    terms = []
+    for word in q.split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*").replace('"', '""')
+        if word:
+            terms.append(f'"{word}"' + ("*" if prefix else ""))
+    if not terms:
+        raise ValueError("Search query has no terms")
+    return " ".join(terms)
+
+
+def _search(statement, q: str):
+    """Restrict a select statement to tasks matching the full-text query."""
+    return statement.join(tasks_fts, tasks_fts.c.rowid == Task.id).where(
+        tasks_fts.c.tasks_fts.match(fts_query(q))
+    )
+
+
+def _list_statement(
+    columns,
+    filters: dict,
+    q: Optional[str],
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+):
+    """Build the page query shared by ``get_all_tasks`` and ``get_task_rows``.
+
+    Searches are ordered by relevance and paged by offset only.
+    """
+    statement = _filter_listed_tasks(select(*columns), **filters)
+    if not q:
+        return _paginate(statement, skip, limit, cursor)
+    if cursor:
+        raise ValueError("Cursor pagination is not supported with a search query")
+    return (
+        _search(statement, q)
+        .order_by(tasks_fts.c.rank, Task.id.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+
+
+def _archive_union(
+    names: list[str], filters: dict, skip: int, limit: int, cursor: Optional[str]
+):
+    """Page over live and archived tasks together, newest first.
+
+    Each table contributes at most the rows the page could need, read in
+    index order, so the merge stays bounded however large the archive is.
+    """
+    window = limit if cursor else skip + limit
+    parts = []
+    for table in (Task.__table__, ArchivedTask.__table__):
+        part = _filter_listed_tasks(
+            select(*(table.c[name] for name in names)), table=table, **filters
+        )
+        part = _paginate(part, 0, window, cursor, table.c).subquery()
+        parts.append(select(part))
+    merged = union_all(*parts).subquery("all_tasks")
+    return _paginate(select(merged), 0 if cursor else skip, limit, None, merged.c)
+
+
+def _count_matching(db: Session, filters: dict, q: Optional[str]) -> int:
+    """Count matching tasks, from the counters when only status is filtered."""
+    if not q and not any(v for k, v in filters.items() if k != "status"):
+        return count_tasks(db, filters["status"])
+    statement = _filter_listed_tasks(
+        select(func.count()).select_from(Task), **filters
+    )
+    if q:
+        statement = _search(statement, q)
+    return db.scalar(statement)
+
+
 def get_all_tasks(
     db: Session,
     status: Optional[TaskStatus] = None,
     skip: int = 0,
     limit: int = 100,
-) -> tuple[list[Task], int]:
-    """Retrieve all tasks with optional filtering and pagination."""
-    query = db.query(Task)
-    if status:
-        query = query.filter(Task.status == status)
-    total = query.count()
-    tasks = query.order_by(Task.created_at.desc()).offset(skip).limit(limit).all()
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    q: Optional[str] = None,
+    due_before: Optional[datetime] = None,
+    due_after: Optional[datetime] = None,
+    overdue: bool = False,
+) -> tuple[list[Task], Optional[int]]:
+    """Retrieve all tasks with optional filtering and pagination.
+
+    When ``cursor`` is given the page is located by seeking on
+    ``(created_at, id)`` instead of ``OFFSET``, so ``skip`` is ignored and
+    every page costs the same regardless of depth. ``q`` is a full-text
+    search over title and description; results are then ranked by
+    relevance. ``due_before``/``due_after`` bound the due date and
+    ``overdue`` keeps open tasks that are past due. The total is read from
+    the maintained counters where possible, or omitted (``None``) if
+    ``include_total`` is off.
+    """
+    filters = dict(
+        status=status, due_before=due_before, due_after=due_after, overdue=overdue
+    )
+    statement = _list_statement([Task], filters, q, skip, limit, cursor)
+    tasks = list(db.scalars(statement))
+    total = _count_matching(db, filters, q) if include_total else None
     return tasks, total
 
 
-def update_task_status(db: Session, task: Task, status_data: TaskUpdateStatus) -> Task:
-    """Update only the status of a task."""
-    task.status = status_data.status
-    task.updated_at = datetime.now(timezone.utc)
+def get_task_rows(
+    db: Session,
+    status: Optional[TaskStatus] = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    q: Optional[str] = None,
+    due_before: Optional[datetime] = None,
+    due_after: Optional[datetime] = None,
+    overdue: bool = False,
+    fields: Optional[tuple[str, ...]] = None,
+    include_archived: bool = False,
+) -> tuple[list[Row], Optional[int]]:
+    """Like ``get_all_tasks`` but returns plain rows without ORM hydration.
+
+    ``fields`` (from ``parse_fields``) limits the selected columns, so
+    unrequested ones such as ``description`` are never read; ``created_at``
+    is added when the page may need a cursor. ``include_archived`` merges
+    in tasks moved to the archive (not available with ``q``).
+    """
+    filters = dict(
+        status=status, due_before=due_before, due_after=due_after, overdue=overdue
+    )
+    columns = _columns(fields, *(() if q else ("created_at",)))
+    if include_archived:
+        if q:
+            raise ValueError("Search does not cover archived tasks")
+        statement = _archive_union(
+            [column.name for column in columns], filters, skip, limit, cursor
+        )
+    else:
+        statement = _list_statement(columns, filters, q, skip, limit, cursor)
+    rows = db.execute(statement).all()
+    total = None
+    if include_total:
+        total = _count_matching(db, filters, q)
+        if include_archived:
+            total += count_archived_tasks(db, filters)
+    return rows, total
+
+
+def next_overdue_at(db: Session) -> Optional[datetime]:
+    """Return when the next open task falls due, or ``None`` if none will.
+
+    Until then (or the next write) the set of overdue tasks cannot change.
+    """
+    return db.scalar(
+        select(func.min(Task.due_date)).where(
+            Task.status.in_(OPEN_STATUSES),
+            Task.due_date >= datetime.now(timezone.utc),
+        )
+    )
+
+
+def count_archived_tasks(db: Session, filters: Optional[dict] = None) -> int:
+    """Count archived tasks matching the list filters.
+
+    Reads the maintained counters unless due dates are filtered.
+    """
+    filters = filters or {}
+    if not any(v for k, v in filters.items() if k != "status"):
+        query = db.query(func.coalesce(func.sum(ArchivedTaskCounter.count), 0))
+        if filters.get("status"):
+            query = query.filter(ArchivedTaskCounter.status == filters["status"])
+        return query.scalar()
+    table = ArchivedTask.__table__
+    statement = _filter_listed_tasks(
+        select(func.count()).select_from(table), table=table, **filters
+    )
+    return db.scalar(statement)
+
+
+def archive_completed_tasks(
+    db: Session, older_than: timedelta, chunk_size: int = 500
+) -> int:
+    """Move tasks completed more than ``older_than`` ago to the archive.
+
+    Works in chunks of ``chunk_size``, each its own short transaction, so
+    the write lock is never held for long and other writers interleave.
+    The first statement of each chunk writes, so the lock is taken up front
+    rather than upgraded from a (possibly stale) read. Returns the number of
+    tasks moved.
+    """
+    now = datetime.now(timezone.utc)
+    cutoff = now - older_than
+    columns = [column.name for column in Task.__table__.columns]
+    moved = 0
+    while True:
+        candidates = (
+            select(
+                *Task.__table__.columns, literal(now, ArchivedTask.archived_at.type)
+            )
+            .where(Task.status == TaskStatus.COMPLETED, Task.updated_at < cutoff)
+            .order_by(Task.id)
+            .limit(chunk_size)
+        )
+        ids = db.scalars(
+            insert(ArchivedTask)
+            .from_select([*columns, "archived_at"], candidates)
+            .returning(ArchivedTask.id)
+        ).all()
+        if ids:
+            db.execute(delete(Task.__table__).where(Task.id.in_(ids)))
+        db.commit()
+        for task_id in ids:
+            task_cache.invalidate(task_id)
+        moved += len(ids)
+        if len(ids) < chunk_size:
+            return moved
+
+
+def count_tasks(db: Session, status: Optional[TaskStatus] = None) -> int:
+    """Return the number of tasks, optionally for one status, in O(1)."""
+    query = db.query(func.coalesce(func.sum(TaskCounter.count), 0))
+    if status:
+        query = query.filter(TaskCounter.status == status)
+    return query.scalar()
+
+
+def get_data_version(db: Session) -> int:
+    """Return the current data version, which every write to tasks bumps."""
+    return db.query(DataVersion.version).filter(DataVersion.id == 1).scalar() or 0
+
+
+def reconcile_task_counters(db: Session) -> dict[TaskStatus, int]:
+    """Rebuild the per-status counters from the tasks table.
+
+    Returns the drift that was corrected for each status (counter minus
+    actual); an empty dict means the counters were already accurate.
+    """
+    actual = dict(
+        db.query(Task.status, func.count(Task.id)).group_by(Task.status).all()
+    )
+    stored = dict(db.query(TaskCounter.status, TaskCounter.count).all())
+    drift = {}
+    for task_status in TaskStatus:
+        expected = actual.get(task_status, 0)
+        if stored.get(task_status) != expected:
+            db.merge(TaskCounter(status=task_status, count=expected))
+        if stored.get(task_status, 0) != expected:
+            drift[task_status] = stored.get(task_status, 0) - expected
     db.commit()
-    db.refresh(task)
-    return task
+    return drift
+
+
+def get_task_stats(db: Session, days: int = 14) -> dict:
+    """Return dashboard statistics from the maintained ``task_due_stats``.
+
+    Gives the number of tasks per status, the number of overdue tasks and
+    the number of open tasks due on each of the next ``days`` days (UTC,
+    starting today). Past days come straight from the summary; only today's
+    already-overdue tasks need a (small, indexed) lookup of the tasks table.
+    """
+    now = datetime.now(timezone.utc)
+    today = now.date()
+    by_status = {task_status: 0 for task_status in TaskStatus}
+    by_status.update(
+        db.execute(
+            select(TaskDueStat.status, func.sum(TaskDueStat.count)).group_by(
+                TaskDueStat.status
+            )
+        ).all()
+    )
+    open_stats = select(func.coalesce(func.sum(TaskDueStat.count), 0)).where(
+        TaskDueStat.status.in_(OPEN_STATUSES)
+    )
+    overdue_before_today = db.scalar(
+        open_stats.where(TaskDueStat.due_day < today.isoformat())
+    )
+    overdue_today = db.scalar(
+        select(func.count())
+        .select_from(Task)
+        .where(
+            Task.status.in_(OPEN_STATUSES),
+            Task.due_date >= now.replace(hour=0, minute=0, second=0, microsecond=0),
+            Task.due_date < now,
+        )
+    )
+    window = [today + timedelta(days=offset) for offset in range(days)]
+    due = dict(
+        db.execute(
+            select(TaskDueStat.due_day, func.sum(TaskDueStat.count))
+            .where(
+                TaskDueStat.status.in_(OPEN_STATUSES),
+                TaskDueStat.due_day.between(
+                    window[0].isoformat(), window[-1].isoformat()
+                ),
+            )
+            .group_by(TaskDueStat.due_day)
+        ).all()
+    )
+    return {
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+        "overdue": overdue_before_today + overdue_today,
+        "due_by_day": [
+            {"day": day, "count": due.get(day.isoformat(), 0)} for day in window
+        ],
+    }
+
 
+def rebuild_task_stats(db: Session) -> dict[tuple[TaskStatus, str], int]:
+    """Rebuild ``task_due_stats`` from the tasks table with a GROUP BY.
 
-def update_task(db: Session, task: Task, task_data: TaskUpdate) -> Task:
-    """Update any fields of a task."""
-    update_data = task_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(task, field, value)
-    task.updated_at = datetime.now(timezone.utc)
+    Returns the drift that was corrected for each (status, due_day) bucket
+    (summary minus actual); an empty dict means the summary was accurate.
+    """
+    due_day = func.date(Task.due_date)
+    actual = {
+        (task_status, day): count
+        for task_status, day, count in db.execute(
+            select(Task.status, due_day, func.count()).group_by(
+                Task.status, due_day
+            )
+        )
+    }
+    stored = {
+        (stat.status, stat.due_day): stat.count
+        for stat in db.scalars(select(TaskDueStat))
+    }
+    drift = {
+        bucket: stored.get(bucket, 0) - actual.get(bucket, 0)
+        for bucket in stored.keys() | actual.keys()
+        if stored.get(bucket, 0) != actual.get(bucket, 0)
+    }
+    db.execute(delete(TaskDueStat))
+    if actual:
+        db.execute(
+            insert(TaskDueStat),
+            [
+                {"status": task_status, "due_day": day, "count": count}
+                for (task_status, day), count in actual.items()
+            ],
+        )
     db.commit()
-    db.refresh(task)
-    return task
+    return drift
+
+
+def _update_returning(db: Session, task_id: int, values: dict) -> Optional[Task]:
+    """Apply ``values`` to one task with a single UPDATE ... RETURNING.
+
+    Returns the updated task as a transient object (so reading it after the
+    commit issues no refresh query), or ``None`` if no task has that id.
+    """
+    statement = (
+        update(Task.__table__)
+        .where(Task.id == task_id)
+        .values(**values, updated_at=datetime.now(timezone.utc))
+        .returning(*Task.__table__.columns)
+    )
+    row = db.execute(statement).mappings().first()
+    db.commit()
+    task_cache.invalidate(task_id)
+    return Task(**row) if row else None
+
+
+def update_task_status(
+    db: Session, task_id: int, status_data: TaskUpdateStatus
+) -> Optional[Task]:
+    """Update only the status of a task; ``None`` if it does not exist."""
+    return _update_returning(db, task_id, {"status": status_data.status})
+
+
+def update_task(db: Session, task_id: int, task_data: TaskUpdate) -> Optional[Task]:
+    """Update any fields of a task; ``None`` if it does not exist."""
+    return _update_returning(db, task_id, task_data.model_dump(exclude_unset=True))
+
+
+def bulk_update_task_status(
+    db: Session,
+    new_status: TaskStatus,
+    ids: Optional[list[int]] = None,
+    status: Optional[TaskStatus] = None,
+    due_before: Optional[datetime] = None,
+    due_after: Optional[datetime] = None,
+) -> list[int]:
+    """Move every matching task to ``new_status`` in one UPDATE statement.
+
+    Tasks are matched by ``ids`` and/or the status and due-date filters.
+    Tasks already in ``new_status`` are left untouched. Returns the ids of
+    the tasks that changed.
+    """
+    statement = (
+        update(Task)
+        .where(Task.status != new_status)
+        .values(status=new_status, updated_at=datetime.now(timezone.utc))
+        .returning(Task.id)
+        .execution_options(synchronize_session=False)
+    )
+    if ids is not None:
+        statement = statement.where(Task.id.in_(ids))
+    statement = _filter_tasks(statement, status, due_before, due_after)
+    changed = sorted(db.execute(statement).scalars())
+    db.commit()
+    for task_id in changed:
+        task_cache.invalidate(task_id)
+    return changed
+
+
+def delete_task(db: Session, task_id: int) -> bool:
+    """Delete a task; returns ``False`` if it does not exist."""
+    statement = delete(Task.__table__).where(Task.id == task_id).returning(Task.id)
+    deleted = db.execute(statement).scalar() is not None
+    db.commit()
+    task_cache.invalidate(task_id)
+    return deleted
+
+
+def get_task_changes(
+    db: Session, since: int, limit: int = 500
+) -> list[tuple[TaskChange, Optional[Task]]]:
+    """Return change-log entries after ``since``, oldest first.
+
+    Each entry is paired with the task's current state, or ``None`` if the
+    task no longer exists.
+    """
+    statement = (
+        select(TaskChange, Task)
+        .outerjoin(Task, Task.id == TaskChange.task_id)
+        .where(TaskChange.seq > since)
+        .order_by(TaskChange.seq)
+        .limit(limit)
+    )
+    return [tuple(row) for row in db.execute(statement)]
+
+
+def get_change_horizon(db: Session) -> int:
+    """Return the sequence number below which the change log is incomplete."""
+    query = db.query(TaskChangeHorizon.seq).filter(TaskChangeHorizon.id == 1)
+    return query.scalar() or 0
+
 
+def get_last_change_seq(db: Session) -> int:
+    """Return the sequence number of the latest change."""
+    last = db.query(func.max(TaskChange.seq)).scalar() or 0
+    return max(last, get_change_horizon(db))
+
+
+def compact_task_changes(db: Session, tombstone_ttl: timedelta) -> int:
+    """Shrink the change log; returns the number of entries removed.
+
+    Entries superseded by a later entry for the same task are always safe to
+    drop. Tombstones older than ``tombstone_ttl`` are dropped too, and the
+    horizon is advanced past them so lagging clients know to resync.
+    """
+    newer = aliased(TaskChange)
+    superseded = delete(TaskChange).where(
+        select(newer.seq)
+        .where(newer.task_id == TaskChange.task_id, newer.seq > TaskChange.seq)
+        .exists()
+    )
+    removed = db.execute(superseded).rowcount
 
-def delete_task(db: Session, task: Task) -> None:
-    """Delete a task."""
-    db.delete(task)
+    cutoff = datetime.now(timezone.utc) - tombstone_ttl
+    expired = (TaskChange.op == TaskChangeOp.DELETE, TaskChange.changed_at < cutoff)
+    horizon = db.query(func.max(TaskChange.seq)).filter(*expired).scalar()
+    if horizon:
+        removed += db.execute(delete(TaskChange).where(*expired)).rowcount
+        db.execute(
+            update(TaskChangeHorizon)
+            .where(TaskChangeHorizon.id == 1, TaskChangeHorizon.seq < horizon)
+            .values(seq=horizon)
+        )
     db.commit()
+    return removed
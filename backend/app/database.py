@@ -1,26 +1,249 @@
 """Database configuration and session management."""
 
 import os
-from sqlalchemy import create_engine
+import threading
+from typing import Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import declarative_base, sessionmaker
 
+from app.metrics import METRICS_ENABLED, instrument_engine, instrument_sessions
+
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./tasks.db")
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False},  # Required for SQLite
-    echo=False,
+# "sync" serves the task routes from the threadpool with blocking sessions;
+# "async" serves them as coroutines on an aiosqlite engine.
+DATABASE_MODE = os.getenv("DATABASE_MODE", "sync")
+ASYNC_DATABASE_URL = os.getenv(
+    "ASYNC_DATABASE_URL", DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Named PRAGMA profiles applied to every new SQLite connection. Individual
+# values can be overridden with SQLITE_PRAGMA_<NAME>, e.g.
+# SQLITE_PRAGMA_BUSY_TIMEOUT=10000.
+SQLITE_PROFILES = {
+    # SQLite's built-in defaults: rollback journal, full fsync, no busy timeout
+    "none": {},
+    # WAL lets readers run alongside the writer; NORMAL only fsyncs at
+    # checkpoints, which is safe against corruption in WAL mode
+    "production": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 268435456,
+        "cache_size": -65536,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    # As production, but fsync on every commit so no committed write is
+    # lost on power failure
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "mmap_size": 268435456,
+        "cache_size": -65536,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+}
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "production")
+
+# GET routes read through a pool of read-only connections (WAL lets them
+# read a snapshot while the writer commits); mutating routes share one
+# writer connection, since SQLite runs one write transaction at a time.
+# The default matches the size of the threadpool that runs sync handlers.
+# 0 turns the split off: every route uses the main engine's default pool.
+READ_POOL_SIZE = int(os.getenv("READ_POOL_SIZE", "40"))
+POOL_TIMEOUT = float(os.getenv("POOL_TIMEOUT", "30"))
+
+
+def sqlite_pragmas(profile: str = SQLITE_PROFILE) -> dict:
+    """Return the PRAGMAs for a profile, with env overrides applied."""
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(
+            f"Unknown SQLITE_PROFILE {profile!r}; "
+            f"expected one of {', '.join(SQLITE_PROFILES)}"
+        )
+    pragmas = dict(SQLITE_PROFILES[profile])
+    for key, value in os.environ.items():
+        if key.startswith("SQLITE_PRAGMA_"):
+            pragmas[key.removeprefix("SQLITE_PRAGMA_").lower()] = value
+    return pragmas
+
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: dict) -> None:
+    """Run the given PRAGMAs on every new connection made by ``engine``."""
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def read_only_url(url: str) -> Optional[str]:
+    """Return a ``mode=ro`` URI form of a file SQLite URL, else ``None``."""
+    parsed = make_url(url)
+    database = parsed.database
+    if parsed.get_backend_name() != "sqlite" or not database:
+        return None
+    if database == ":memory:" or database.startswith("file:"):
+        return None
+    return str(
+        parsed.set(database=f"file:{database}").update_query_dict(
+            {"mode": "ro", "uri": "true"}
+        )
+    )
+
+
+# Engines are built on first use rather than at import, so importing the
+# app opens no database and (in sync mode) never loads the asyncio stack.
+_engine = None
+_read_engine = None
+_async_engine = None
+_async_sessionmaker = None
+_engine_lock = threading.Lock()
+
+
+def _read_pool_enabled() -> bool:
+    return READ_POOL_SIZE > 0 and read_only_url(DATABASE_URL) is not None
+
+
+def get_engine() -> Engine:
+    """Return the application (writer) engine, creating it on first use."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                # With a separate read pool, writes share a single connection
+                pool = (
+                    {"pool_size": 1, "max_overflow": 0, "pool_timeout": POOL_TIMEOUT}
+                    if _read_pool_enabled()
+                    else {}
+                )
+                engine = create_engine(
+                    DATABASE_URL,
+                    connect_args={"check_same_thread": False},  # Required for SQLite
+                    echo=False,
+                    **pool,
+                )
+                apply_sqlite_pragmas(engine, sqlite_pragmas())
+                if METRICS_ENABLED:
+                    instrument_engine(engine)
+                _engine = engine
+    return _engine
+
+
+def get_read_engine() -> Engine:
+    """Return the read-only engine, or the writer engine if the split is off."""
+    global _read_engine
+    if not _read_pool_enabled():
+        return get_engine()
+    if _read_engine is None:
+        with _engine_lock:
+            if _read_engine is None:
+                engine = create_engine(
+                    read_only_url(DATABASE_URL),
+                    connect_args={"check_same_thread": False},
+                    echo=False,
+                    pool_size=READ_POOL_SIZE,
+                    max_overflow=0,
+                    pool_timeout=POOL_TIMEOUT,
+                )
+                # journal_mode is persistent and set by the writer; a
+                # read-only connection cannot change it
+                pragmas = sqlite_pragmas()
+                pragmas.pop("journal_mode", None)
+                apply_sqlite_pragmas(engine, pragmas)
+                if METRICS_ENABLED:
+                    instrument_engine(engine)
+                _read_engine = engine
+    return _read_engine
+
+
+def pool_status() -> dict[str, dict[str, int]]:
+    """Size and checked-out connections of each sync pool created so far."""
+    engines = {"write": _engine, "read": _read_engine}
+    return {
+        name: {"size": engine.pool.size(), "checked_out": engine.pool.checkedout()}
+        for name, engine in engines.items()
+        if engine is not None and hasattr(engine.pool, "checkedout")
+    }
+
+
+def get_async_engine():
+    """Return the aiosqlite engine for async mode, creating it on first use."""
+    global _async_engine, _async_sessionmaker
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        with _engine_lock:
+            if _async_engine is None:
+                engine = create_async_engine(ASYNC_DATABASE_URL, echo=False)
+                apply_sqlite_pragmas(engine.sync_engine, sqlite_pragmas())
+                if METRICS_ENABLED:
+                    instrument_engine(engine.sync_engine)
+                _async_sessionmaker = async_sessionmaker(
+                    autocommit=False, autoflush=False, bind=engine
+                )
+                _async_engine = engine
+    return _async_engine
+
+
+def get_async_sessionmaker():
+    """Return the session factory bound to the async engine."""
+    get_async_engine()
+    return _async_sessionmaker
+
+
+async def dispose_engines() -> None:
+    """Close the pooled connections of whichever engines were created."""
+    if _engine is not None:
+        _engine.dispose()
+    if _read_engine is not None:
+        _read_engine.dispose()
+    if _async_engine is not None:
+        await _async_engine.dispose()
+
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
 
 Base = declarative_base()
 
 
-def get_db():
-    """Dependency that provides a database session per request."""
-    db = SessionLocal()
+if METRICS_ENABLED:
+    instrument_sessions()
+
+
+def _session(engine: Engine, pool: str):
+    # Sessions check out a connection on first use, so a handler that never
+    # queries holds none; ``info["pool"]`` labels its checkout wait metric
+    db = SessionLocal(bind=engine, info={"pool": pool})
     try:
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """Dependency that provides a read-only database session per request."""
+    engine = get_read_engine()
+    yield from _session(engine, "read" if engine is not get_engine() else "write")
+
+
+def get_write_db():
+    """Dependency that provides a session on the writer connection."""
+    yield from _session(get_engine(), "write")
+
+
+# Kept for callers that do not care which side they get
+get_db = get_write_db
+
+
+async def get_async_db():
+    """Dependency that provides an async database session per request."""
+    async with get_async_sessionmaker()(info={"pool": "async"}) as db:
+        yield db
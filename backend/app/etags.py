@@ -0,0 +1,61 @@
+"""ETag helpers for conditional GET requests.
+
+ETags are derived from the data version maintained in ``data_version``,
+so checking ``If-None-Match`` costs a single primary-key lookup and never
+runs the underlying query. A compressed body gets its own strong ETag with
+the content-coding appended (``"12-ab34-gzip"``); ``not_modified`` accepts
+either form.
+"""
+
+import hashlib
+from typing import Optional, Union
+
+from fastapi import Request, Response, status
+
+# Content-codings the compression middleware may append to an ETag
+CONTENT_CODINGS = ("zstd", "br", "gzip")
+
+
+def make_etag(version: Union[int, str], request: Request) -> str:
+    """Build a strong ETag for this request's path and query at ``version``."""
+    query = sorted(request.query_params.multi_items())
+    digest = hashlib.blake2b(
+        f"{request.url.path}?{query}".encode(), digest_size=8
+    ).hexdigest()
+    return f'"{version}-{digest}"'
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """Return the ETag of the ``encoding``-compressed variant of a response."""
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def _identity_etag(tag: str) -> str:
+    """Strip the weak prefix and any content-coding suffix from ``tag``."""
+    tag = tag.strip().removeprefix("W/")
+    for coding in CONTENT_CODINGS:
+        suffix = f'-{coding}"'
+        if tag.endswith(suffix):
+            return f'{tag[: -len(suffix)]}"'
+    return tag
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Return a 304 response if the client's ``If-None-Match`` matches.
+
+    Tags sent back from a compressed response match their identity ETag.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    candidates = {_identity_etag(tag) for tag in header.split(",")}
+    if etag in candidates or "*" in candidates:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag)
+        )
+    return None
+
+
+def cache_headers(etag: str) -> dict[str, str]:
+    """Headers telling clients to revalidate the cached copy on every use."""
+    return {"ETag": etag, "Cache-Control": "no-cache"}
@@ -1,13 +1,33 @@
 """FastAPI application entry point for the HMCTS Task Management API."""
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
-from app.database import Base, engine
+from app import querylog
+from app.compression import COMPRESSION_ENABLED, CompressionMiddleware
+from app.database import DATABASE_MODE, dispose_engines, get_engine
+from app.maintenance import start_maintenance, stop_maintenance
+from app.metrics import METRICS_ENABLED, MetricsMiddleware, render_metrics
+from app.models import init_schema
+from app.querylog import query_log
 from app.routes import router
+from app.schemas import QueryLogSettings
+from app.writer import close_writers
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Check (and if needed upgrade) the schema before serving requests."""
+    init_schema(get_engine())
+    jobs = start_maintenance(get_engine())
+    yield
+    stop_maintenance(jobs)
+    close_writers()
+    await dispose_engines()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="HMCTS Task Management API",
@@ -18,6 +38,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # CORS configuration — allow the Next.js frontend
@@ -32,6 +53,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Outermost, so request latency includes the other middleware
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# In async mode the async task handlers are registered first so they take
+# precedence; the sync router still serves any path they don't cover.
+if DATABASE_MODE == "async":
+    from app.async_routes import router as async_router
+    from app.async_routes import without_replaced
+
+    app.include_router(async_router, prefix="/api")
+    router = without_replaced(router)
 app.include_router(router, prefix="/api")
 
 
@@ -39,3 +75,37 @@ app.include_router(router, prefix="/api")
 def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+if METRICS_ENABLED:
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheus metrics in the text exposition format."""
+        return PlainTextResponse(
+            render_metrics(), media_type="text/plain; version=0.0.4"
+        )
+
+    def require_debug_endpoints() -> None:
+        """Hide the query-log endpoints unless explicitly enabled."""
+        if not querylog.QUERY_LOG_DEBUG_ENDPOINTS:
+            raise HTTPException(status_code=404, detail="Not Found")
+
+    @app.get(
+        "/debug/query-log",
+        include_in_schema=False,
+        dependencies=[Depends(require_debug_endpoints)],
+    )
+    def get_query_log():
+        """Slow-query log settings and the most recent entries."""
+        return {**query_log.settings(), "recent": list(query_log.recent)}
+
+    @app.put(
+        "/debug/query-log",
+        include_in_schema=False,
+        dependencies=[Depends(require_debug_endpoints)],
+    )
+    def configure_query_log(settings: QueryLogSettings):
+        """Change slow-query log settings at runtime (this process only)."""
+        query_log.configure(**settings.model_dump())
+        return query_log.settings()
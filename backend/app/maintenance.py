@@ -0,0 +1,107 @@
+"""Periodic maintenance jobs run on background threads alongside the app.
+
+- Archiving: with ``ARCHIVE_AFTER_DAYS`` set (0, the default, leaves it
+  off), every ``ARCHIVE_INTERVAL`` seconds tasks that have been
+  ``COMPLETED`` for longer move into ``archived_tasks``,
+  ``ARCHIVE_CHUNK_SIZE`` at a time, one short transaction per chunk, so the
+  hot ``tasks`` table and its indexes stay small without holding the write
+  lock for long. Listings pass ``include_archived=true`` to see them again.
+- Change log compaction: every ``CHANGE_COMPACT_INTERVAL`` seconds (0 turns
+  it off) superseded ``task_changes`` entries are dropped, along with
+  tombstones older than ``CHANGE_TOMBSTONE_DAYS``, so the log stays about
+  one row per task instead of one per write.
+
+Each job first runs one interval after startup. Both can be run by hand
+with ``python -m app.cli archive`` and ``python -m app.cli compact-changes``.
+"""
+
+import logging
+import os
+import threading
+from datetime import timedelta
+from typing import Callable
+
+from sqlalchemy.engine import Engine
+
+from app import crud
+from app.database import SessionLocal
+
+ARCHIVE_AFTER_DAYS = float(os.getenv("ARCHIVE_AFTER_DAYS", "0"))
+ARCHIVE_INTERVAL = float(os.getenv("ARCHIVE_INTERVAL", "3600"))
+ARCHIVE_CHUNK_SIZE = int(os.getenv("ARCHIVE_CHUNK_SIZE", "500"))
+CHANGE_COMPACT_INTERVAL = float(os.getenv("CHANGE_COMPACT_INTERVAL", "3600"))
+CHANGE_TOMBSTONE_DAYS = float(os.getenv("CHANGE_TOMBSTONE_DAYS", "7"))
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob:
+    """Calls ``fn()`` every ``interval`` seconds on its own thread."""
+
+    def __init__(self, name: str, interval: float, fn: Callable[[], int]) -> None:
+        self.name = name
+        self.interval = interval
+        self.fn = fn
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                done = self.fn()
+            except Exception:
+                # Try again next interval rather than stopping for good
+                logger.exception("Maintenance job %s failed", self.name)
+            else:
+                if done:
+                    logger.info("Maintenance job %s: %d row(s)", self.name, done)
+
+    def close(self) -> None:
+        """Stop after any run in progress and wait for the thread to exit."""
+        self._stop.set()
+        self._thread.join()
+
+
+def archive_completed(
+    engine: Engine, after: timedelta, chunk_size: int = ARCHIVE_CHUNK_SIZE
+) -> int:
+    """Archive everything currently due; returns the number of tasks moved."""
+    with SessionLocal(bind=engine) as db:
+        return crud.archive_completed_tasks(db, after, chunk_size)
+
+
+def compact_changes(engine: Engine, tombstone_ttl: timedelta) -> int:
+    """Compact the change log; returns the number of entries removed."""
+    with SessionLocal(bind=engine) as db:
+        return crud.compact_task_changes(db, tombstone_ttl)
+
+
+def start_maintenance(engine: Engine) -> list[PeriodicJob]:
+    """Start whichever maintenance jobs are configured."""
+    jobs = []
+    if ARCHIVE_AFTER_DAYS > 0:
+        after = timedelta(days=ARCHIVE_AFTER_DAYS)
+        jobs.append(
+            PeriodicJob(
+                "task-archiver",
+                ARCHIVE_INTERVAL,
+                lambda: archive_completed(engine, after),
+            )
+        )
+    if CHANGE_COMPACT_INTERVAL > 0:
+        ttl = timedelta(days=CHANGE_TOMBSTONE_DAYS)
+        jobs.append(
+            PeriodicJob(
+                "change-compactor",
+                CHANGE_COMPACT_INTERVAL,
+                lambda: compact_changes(engine, ttl),
+            )
+        )
+    return jobs
+
+
+def stop_maintenance(jobs: list[PeriodicJob]) -> None:
+    """Stop the jobs returned by ``start_maintenance``."""
+    for job in jobs:
+        job.close()
@@ -0,0 +1,360 @@
+"""Request, SQL and pool instrumentation exposed in Prometheus text format.
+
+``MetricsMiddleware`` times every request and tags it with its route
+template; SQLAlchemy cursor hooks (``instrument_engine``) add each
+statement's count and duration to the request that issued it, and
+``instrument_sessions`` records how long a session waited for a pooled
+connection. Recording is a few in-memory increments per request and
+statement; the text exposition is only built when ``/metrics`` is scraped.
+The same hooks feed the slow-query log in ``app.querylog``. Set
+``METRICS_ENABLED=false`` to install none of it.
+"""
+
+import bisect
+import collections
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+import anyio.to_thread
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.cache import task_cache
+from app.compression import compressed_cache
+from app.querylog import query_log
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """A monotonically increasing count per label set."""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()) -> None:
+        self.name, self.help, self.labels = name, help, labels
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            lines.append(f"{self.name}{_format_labels(self.labels, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count per label set."""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        buckets: tuple[float, ...],
+        labels: tuple[str, ...] = (),
+    ) -> None:
+        self.name, self.help, self.labels = name, help, labels
+        self.buckets = buckets
+        # labels -> [count per bucket (+Inf last), sum]
+        self._values: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            values = [
+                (labels, list(counts), total)
+                for labels, (counts, total) in self._values.items()
+            ]
+        for labels, counts, total in values:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                le = _format_labels(self.labels, labels, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            label_text = _format_labels(self.labels, labels)
+            lines.append(f"{self.name}_sum{label_text} {total}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+def _gauge(name: str, help: str, value: float) -> list[str]:
+    return [f"# HELP {name} {help}", f"# TYPE {name} gauge", f"{name} {value}"]
+
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests served.", ("method", "route", "status")
+)
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last body chunk.",
+    LATENCY_BUCKETS,
+    ("method", "route"),
+)
+REQUEST_SQL_STATEMENTS = Histogram(
+    "http_request_sql_statements",
+    "SQL statements executed per request.",
+    STATEMENT_BUCKETS,
+    ("method", "route"),
+)
+REQUEST_SQL_DURATION = Histogram(
+    "http_request_sql_duration_seconds",
+    "Time spent executing SQL per request.",
+    LATENCY_BUCKETS,
+    ("method", "route"),
+)
+SQL_STATEMENTS = Counter("sql_statements_total", "SQL statements executed.")
+SQL_DURATION = Histogram(
+    "sql_statement_duration_seconds",
+    "Execution time of SQL statements.",
+    LATENCY_BUCKETS,
+)
+CHECKOUT_WAIT = Histogram(
+    "db_connection_checkout_wait_seconds",
+    "Time a request waited for a pooled database connection.",
+    LATENCY_BUCKETS,
+    ("pool",),
+)
+WRITE_BATCH_SIZE = Histogram(
+    "write_batch_size",
+    "Mutations committed together by the group-commit writer.",
+    BATCH_BUCKETS,
+)
+
+
+class RequestStats:
+    """SQL work attributed to the request being served."""
+
+    __slots__ = ("scope", "statements", "sql_seconds", "statement_texts")
+
+    def __init__(self, scope) -> None:
+        self.scope = scope
+        self.statements = 0
+        self.sql_seconds = 0.0
+        # Per-statement counts for N+1 detection, kept only while the query
+        # log is on
+        self.statement_texts: Optional[collections.Counter] = (
+            collections.Counter() if query_log.enabled else None
+        )
+
+    def route(self) -> str:
+        """The request's method and route template (set once routing ran)."""
+        route = self.scope.get("route")
+        # Route templates, not raw paths, keep label cardinality bounded
+        return f"{self.scope['method']} {getattr(route, 'path', 'unmatched')}"
+
+
+# Threadpool workers run with a copy of the request's context, so they
+# update the same RequestStats object as the middleware reads afterwards
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "request_stats", default=None
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    SQL_STATEMENTS.inc()
+    SQL_DURATION.observe(elapsed)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.sql_seconds += elapsed
+        if stats.statement_texts is not None:
+            stats.statement_texts[statement] += 1
+    if query_log.enabled and elapsed * 1000 >= query_log.slow_ms:
+        query_log.slow_statement(
+            cursor,
+            statement,
+            parameters,
+            executemany,
+            elapsed,
+            stats.route() if stats is not None else None,
+        )
+
+
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute
+    if context.connection is not None:
+        started = context.connection.info.get("query_started")
+        if started:
+            started.pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every statement executed on ``engine`` (a sync ``Engine``)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+def _session_transaction_created(session, transaction) -> None:
+    if transaction.parent is None and "pool" in session.info:
+        session.info["checkout_started"] = time.perf_counter()
+
+
+def _session_connected(session, transaction, connection) -> None:
+    started = session.info.pop("checkout_started", None)
+    if started is not None:
+        CHECKOUT_WAIT.observe(time.perf_counter() - started, session.info["pool"])
+
+
+def instrument_sessions() -> None:
+    """Record checkout wait for sessions created with ``info={"pool": ...}``.
+
+    A session begins its transaction when it first needs the database and
+    checks out a connection straight after, so the gap between the two is
+    the wait for the pool. Nothing is checked out early to measure it.
+    """
+    if not event.contains(
+        Session, "after_transaction_create", _session_transaction_created
+    ):
+        event.listen(Session, "after_transaction_create", _session_transaction_created)
+        event.listen(Session, "after_begin", _session_connected)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency and SQL work per route."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = RequestStats(scope)
+        token = _request_stats.set(stats)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def _send(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            elapsed = time.perf_counter() - started
+            _request_stats.reset(token)
+            method, path = stats.route().split(" ", 1)
+            REQUESTS.inc(method, path, status_code)
+            REQUEST_DURATION.observe(elapsed, method, path)
+            REQUEST_SQL_STATEMENTS.observe(stats.statements, method, path)
+            REQUEST_SQL_DURATION.observe(stats.sql_seconds, method, path)
+            if (
+                stats.statement_texts is not None
+                and stats.statements > query_log.max_statements
+            ):
+                query_log.statement_count(stats.route(), stats.statement_texts)
+
+
+def render_metrics() -> str:
+    """Render every metric in the Prometheus text exposition format.
+
+    Must be called from the event loop (it reads the threadpool limiter).
+    """
+    lines: list[str] = []
+    for metric in (
+        REQUESTS,
+        REQUEST_DURATION,
+        REQUEST_SQL_STATEMENTS,
+        REQUEST_SQL_DURATION,
+        SQL_STATEMENTS,
+        SQL_DURATION,
+        CHECKOUT_WAIT,
+        WRITE_BATCH_SIZE,
+    ):
+        lines.extend(metric.render())
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    lines += _gauge(
+        "threadpool_threads_limit", "Threadpool size.", limiter.total_tokens
+    )
+    lines += _gauge(
+        "threadpool_threads_busy",
+        "Threadpool workers running sync handlers or dependencies.",
+        limiter.borrowed_tokens,
+    )
+    lines += _gauge(
+        "threadpool_queue_depth",
+        "Tasks waiting for a free threadpool worker.",
+        limiter.statistics().tasks_waiting,
+    )
+    # Imported here: app.database itself imports this module
+    from app.database import pool_status
+
+    pools = pool_status()
+    for key, name, help in (
+        ("size", "db_pool_size", "Connections the pool keeps."),
+        ("checked_out", "db_pool_checked_out", "Connections checked out of the pool."),
+    ):
+        lines += [f"# HELP {name} {help}", f"# TYPE {name} gauge"]
+        for pool, values in pools.items():
+            lines.append(f'{name}{{pool="{pool}"}} {values[key]}')
+    cache = task_cache.stats()
+    for key in ("hits", "misses", "evictions"):
+        name = f"task_cache_{key}_total"
+        lines += [f"# HELP {name} Task cache {key}.", f"# TYPE {name} counter"]
+        lines.append(f"{name} {cache[key]}")
+    lines += _gauge("task_cache_entries", "Entries in the task cache.", cache["size"])
+    compressed = compressed_cache.stats()
+    for key in ("hits", "misses"):
+        name = f"compressed_cache_{key}_total"
+        lines += [
+            f"# HELP {name} Compressed response cache {key}.",
+            f"# TYPE {name} counter",
+            f"{name} {compressed[key]}",
+        ]
+    lines += _gauge(
+        "compressed_cache_entries",
+        "Entries in the compressed response cache.",
+        compressed["size"],
+    )
+    lines += _gauge(
+        "task_cache_capacity", "Capacity of the task cache.", cache["capacity"]
+    )
+    return "\n".join(lines) + "\n"
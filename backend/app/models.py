@@ -3,7 +3,21 @@
 import enum
 from datetime import datetime, timezone
 
-from sqlalchemy import Column, DateTime, Enum, Integer, String, Text
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Enum,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Text,
+    column,
+    event,
+    table,
+    text,
+)
+from sqlalchemy.schema import CreateTable
 
 from app.database import Base
 
@@ -20,6 +34,16 @@ class Task(Base):
     """Task model representing a caseworker task."""
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Keyset pagination seeks on (created_at, id), optionally per status
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        Index("ix_tasks_status_created_at_id", "status", "created_at", "id"),
+        # Due-date ranges per status ("open and due before now") are range scans
+        Index("ix_tasks_status_due_date", "status", "due_date"),
+        # Never reuse an id, even the newest one's after it is deleted:
+        # archived tasks keep theirs and are listed alongside live ones
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     title = Column(String(255), nullable=False)
@@ -37,3 +61,376 @@ class Task(Base):
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc),
     )
+
+
+class ArchivedTask(Base):
+    """A completed task moved out of ``tasks`` by the archive job.
+
+    Keeps the task's id and columns, so archived tasks can be listed
+    alongside live ones (``include_archived``) in the same order.
+    """
+
+    __tablename__ = "archived_tasks"
+    __table_args__ = (
+        Index("ix_archived_tasks_created_at_id", "created_at", "id"),
+        Index("ix_archived_tasks_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_archived_tasks_status_due_date", "status", "due_date"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String(255), nullable=False)
+    description = Column(Text, nullable=True)
+    status = Column(Enum(TaskStatus), nullable=False)
+    due_date = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+    archived_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class ArchivedTaskCounter(Base):
+    """Maintained number of archived tasks per status, like ``TaskCounter``."""
+
+    __tablename__ = "archived_task_counters"
+
+    status = Column(Enum(TaskStatus), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+ARCHIVED_TASK_COUNTER_DDL = (
+    """
+    CREATE TRIGGER IF NOT EXISTS archived_tasks_count_insert
+    AFTER INSERT ON archived_tasks
+    BEGIN
+        INSERT INTO archived_task_counters (status, count) VALUES (NEW.status, 1)
+        ON CONFLICT (status) DO UPDATE SET count = count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS archived_tasks_count_delete
+    AFTER DELETE ON archived_tasks
+    BEGIN
+        UPDATE archived_task_counters SET count = count - 1
+        WHERE status = OLD.status;
+    END
+    """,
+    # Seed counters for databases that already held archived tasks
+    """
+    INSERT OR IGNORE INTO archived_task_counters (status, count)
+    SELECT status, COUNT(*) FROM archived_tasks GROUP BY status
+    """,
+)
+
+
+class TaskCounter(Base):
+    """Maintained number of tasks per status, so totals never need COUNT(*)."""
+
+    __tablename__ = "task_counters"
+
+    status = Column(Enum(TaskStatus), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+# Triggers keep task_counters current in the same transaction as every
+# insert, delete and status change on tasks, whichever code path issues it.
+TASK_COUNTER_DDL = (
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_count_insert AFTER INSERT ON tasks
+    BEGIN
+        INSERT INTO task_counters (status, count) VALUES (NEW.status, 1)
+        ON CONFLICT (status) DO UPDATE SET count = count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_count_delete AFTER DELETE ON tasks
+    BEGIN
+        UPDATE task_counters SET count = count - 1 WHERE status = OLD.status;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_count_update AFTER UPDATE OF status ON tasks
+    WHEN OLD.status IS NOT NEW.status
+    BEGIN
+        UPDATE task_counters SET count = count - 1 WHERE status = OLD.status;
+        INSERT INTO task_counters (status, count) VALUES (NEW.status, 1)
+        ON CONFLICT (status) DO UPDATE SET count = count + 1;
+    END
+    """,
+    # Seed counters for databases that already held tasks
+    """
+    INSERT OR IGNORE INTO task_counters (status, count)
+    SELECT status, COUNT(*) FROM tasks GROUP BY status
+    """,
+)
+
+
+class TaskDueStat(Base):
+    """Maintained number of tasks per status and due day, for dashboard stats."""
+
+    __tablename__ = "task_due_stats"
+
+    status = Column(Enum(TaskStatus), primary_key=True)
+    due_day = Column(String(10), primary_key=True)  # YYYY-MM-DD, UTC
+    count = Column(Integer, nullable=False, default=0)
+
+
+# Triggers apply each insert, delete, status change and due-date change on
+# tasks to task_due_stats as a delta: a transition moves one count from the
+# old (status, due_day) bucket to the new one. Emptied buckets are removed.
+TASK_DUE_STAT_DDL = (
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_due_stat_insert AFTER INSERT ON tasks
+    BEGIN
+        INSERT INTO task_due_stats (status, due_day, count)
+        VALUES (NEW.status, date(NEW.due_date), 1)
+        ON CONFLICT (status, due_day) DO UPDATE SET count = count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_due_stat_delete AFTER DELETE ON tasks
+    BEGIN
+        UPDATE task_due_stats SET count = count - 1
+        WHERE status = OLD.status AND due_day = date(OLD.due_date);
+        DELETE FROM task_due_stats
+        WHERE status = OLD.status AND due_day = date(OLD.due_date) AND count <= 0;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_due_stat_update
+    AFTER UPDATE OF status, due_date ON tasks
+    WHEN OLD.status IS NOT NEW.status
+        OR date(OLD.due_date) IS NOT date(NEW.due_date)
+    BEGIN
+        UPDATE task_due_stats SET count = count - 1
+        WHERE status = OLD.status AND due_day = date(OLD.due_date);
+        DELETE FROM task_due_stats
+        WHERE status = OLD.status AND due_day = date(OLD.due_date) AND count <= 0;
+        INSERT INTO task_due_stats (status, due_day, count)
+        VALUES (NEW.status, date(NEW.due_date), 1)
+        ON CONFLICT (status, due_day) DO UPDATE SET count = count + 1;
+    END
+    """,
+    # Seed the summary for databases that already held tasks
+    """
+    INSERT OR IGNORE INTO task_due_stats (status, due_day, count)
+    SELECT status, date(due_date), COUNT(*) FROM tasks
+    GROUP BY status, date(due_date)
+    """,
+)
+
+
+class DataVersion(Base):
+    """Single-row counter bumped by every write to tasks.
+
+    Backs ETags: a response computed at version N is still current for as
+    long as the version stays at N.
+    """
+
+    __tablename__ = "data_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+DATA_VERSION_DDL = tuple(
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tasks_version_{op.lower()} AFTER {op} ON tasks
+    BEGIN
+        UPDATE data_version SET version = version + 1 WHERE id = 1;
+    END
+    """
+    for op in ("INSERT", "UPDATE", "DELETE")
+) + ("INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0)",)
+
+
+class TaskChangeOp(str, enum.Enum):
+    """Kinds of entry in the task change log."""
+
+    UPSERT = "upsert"
+    DELETE = "delete"
+
+
+class TaskChange(Base):
+    """Append-only log of task writes, read by the change feed.
+
+    ``seq`` is never reused, so clients can resume from the last sequence
+    number they saw.
+    """
+
+    __tablename__ = "task_changes"
+    __table_args__ = (
+        Index("ix_task_changes_task_id_seq", "task_id", "seq"),
+        {"sqlite_autoincrement": True},
+    )
+
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    task_id = Column(Integer, nullable=False)
+    op = Column(Enum(TaskChangeOp), nullable=False)
+    changed_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class TaskChangeHorizon(Base):
+    """Highest sequence number whose tombstone compaction has discarded.
+
+    Clients resuming from before the horizon may have missed deletions and
+    must resync from a full list.
+    """
+
+    __tablename__ = "task_change_horizon"
+
+    id = Column(Integer, primary_key=True)
+    seq = Column(Integer, nullable=False, default=0)
+
+
+TASK_CHANGE_DDL = (
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_change_insert AFTER INSERT ON tasks
+    BEGIN
+        INSERT INTO task_changes (task_id, op, changed_at)
+        VALUES (NEW.id, 'UPSERT', datetime('now'));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_change_update AFTER UPDATE ON tasks
+    BEGIN
+        INSERT INTO task_changes (task_id, op, changed_at)
+        VALUES (NEW.id, 'UPSERT', datetime('now'));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_change_delete AFTER DELETE ON tasks
+    BEGIN
+        INSERT INTO task_changes (task_id, op, changed_at)
+        VALUES (OLD.id, 'DELETE', datetime('now'));
+    END
+    """,
+    "INSERT OR IGNORE INTO task_change_horizon (id, seq) VALUES (1, 0)",
+)
+
+
+# FTS5 index over task titles and descriptions. It stores no copy of the
+# text (content='tasks'); triggers keep it in step with the tasks table.
+tasks_fts = table("tasks_fts", column("rowid"), column("rank"), column("tasks_fts"))
+
+TASK_SEARCH_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+        title, description, content='tasks', content_rowid='id', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks
+    BEGIN
+        INSERT INTO tasks_fts (rowid, title, description)
+        VALUES (NEW.id, NEW.title, NEW.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks
+    BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+        VALUES ('delete', OLD.id, OLD.title, OLD.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_update
+    AFTER UPDATE OF title, description ON tasks
+    BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+        VALUES ('delete', OLD.id, OLD.title, OLD.description);
+        INSERT INTO tasks_fts (rowid, title, description)
+        VALUES (NEW.id, NEW.title, NEW.description);
+    END
+    """,
+)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _install_task_triggers(target, connection, **kw):
+    has_search_index = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE name = 'tasks_fts'")
+    ).first()
+    for statement in (
+        TASK_COUNTER_DDL
+        + TASK_DUE_STAT_DDL
+        + DATA_VERSION_DDL
+        + TASK_CHANGE_DDL
+        + TASK_SEARCH_DDL
+        + ARCHIVED_TASK_COUNTER_DDL
+    ):
+        connection.execute(text(statement))
+    if not has_search_index:
+        # Index tasks that existed before search was added
+        connection.execute(text("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')"))
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _drop_search_index(target, connection, **kw):
+    connection.execute(text("DROP TABLE IF EXISTS tasks_fts"))
+
+
+# Bump whenever tables, indexes or triggers are added, so existing databases
+# are upgraded by init_schema on the next start.
+SCHEMA_VERSION = 3
+
+
+def _rebuild_tasks_with_autoincrement(connection) -> None:
+    """Recreate a pre-AUTOINCREMENT ``tasks`` table, keeping every row.
+
+    Without AUTOINCREMENT SQLite hands out the id after the current largest,
+    so deleting the newest tasks would let new ones take ids that archived
+    tasks still hold. The sequence starts above every id in either table.
+    """
+    rebuilt = Task.__table__.to_metadata(MetaData(), name="tasks_rebuilt")
+    connection.execute(CreateTable(rebuilt))
+    # Dropping the old table drops its indexes and triggers without firing
+    # them, so the counters, stats and search index are left as they are
+    columns = ", ".join(column.name for column in Task.__table__.columns)
+    connection.exec_driver_sql(
+        f"INSERT INTO tasks_rebuilt ({columns}) SELECT {columns} FROM tasks"
+    )
+    connection.exec_driver_sql("DROP TABLE tasks")
+    connection.exec_driver_sql("ALTER TABLE tasks_rebuilt RENAME TO tasks")
+    connection.exec_driver_sql("DELETE FROM sqlite_sequence WHERE name = 'tasks'")
+    connection.exec_driver_sql(
+        "INSERT INTO sqlite_sequence (name, seq) SELECT 'tasks', max("
+        "(SELECT coalesce(max(id), 0) FROM tasks), "
+        "(SELECT coalesce(max(id), 0) FROM archived_tasks))"
+    )
+    for index in Task.__table__.indexes:
+        index.create(bind=connection)
+    _install_task_triggers(Base.metadata, connection)
+
+
+def init_schema(engine) -> bool:
+    """Bring the database schema up to ``SCHEMA_VERSION``.
+
+    A database already at that version (``PRAGMA user_version``) costs one
+    PRAGMA and is not touched, so a read-only database file works. Older
+    databases get any missing tables, indexes and triggers. Returns whether
+    the schema had to be changed.
+    """
+    if engine.dialect.name == "sqlite":
+        with engine.connect() as connection:
+            version = connection.exec_driver_sql("PRAGMA user_version").scalar()
+        if version == SCHEMA_VERSION:
+            return False
+        if version > SCHEMA_VERSION:
+            raise RuntimeError(
+                f"Database schema version {version} is newer than this "
+                f"application's ({SCHEMA_VERSION})"
+            )
+    with engine.begin() as connection:
+        Base.metadata.create_all(bind=connection)
+        if engine.dialect.name == "sqlite":
+            tasks_sql = connection.exec_driver_sql(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'tasks'"
+            ).scalar()
+            if "AUTOINCREMENT" not in tasks_sql:
+                _rebuild_tasks_with_autoincrement(connection)
+        # create_all skips tables that exist, including their new indexes
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=connection, checkfirst=True)
+        if engine.dialect.name == "sqlite":
+            connection.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return True
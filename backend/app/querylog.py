@@ -0,0 +1,178 @@
+"""Slow-query and N+1 detection on top of the SQL instrumentation.
+
+The cursor hooks in ``app.metrics`` hand every statement slower than the
+threshold to ``query_log``, which logs it with its bound parameters, its
+``EXPLAIN QUERY PLAN`` and the route that issued it. At the end of each
+request the middleware reports requests that ran more statements than
+allowed, naming the statement repeated most often (the usual N+1 shape).
+Bound parameters can hold task contents, so they are left out unless
+``QUERY_LOG_PARAMETERS`` is set. ``GET``/``PUT /debug/query-log`` show and
+change the settings at runtime; they are only served when
+``QUERY_LOG_DEBUG_ENDPOINTS`` is set, and should stay behind an internal
+listener or proxy even then.
+"""
+
+import logging
+import os
+import threading
+from collections import Counter, deque
+from datetime import datetime, timezone
+from typing import Optional
+
+logger = logging.getLogger("app.querylog")
+
+QUERY_LOG_ENABLED = os.getenv("QUERY_LOG_ENABLED", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+QUERY_LOG_MAX_STATEMENTS = int(os.getenv("QUERY_LOG_MAX_STATEMENTS", "20"))
+QUERY_LOG_EXPLAIN = os.getenv("QUERY_LOG_EXPLAIN", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+QUERY_LOG_PARAMETERS = os.getenv("QUERY_LOG_PARAMETERS", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+QUERY_LOG_DEBUG_ENDPOINTS = os.getenv(
+    "QUERY_LOG_DEBUG_ENDPOINTS", "false"
+).lower() in ("1", "true", "yes")
+
+# Statements that EXPLAIN QUERY PLAN can describe
+_EXPLAINABLE = ("SELECT", "UPDATE", "DELETE", "INSERT", "WITH")
+
+
+def _short(value, limit: int = 200) -> str:
+    text = repr(value)
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+def explain(dbapi_cursor, statement: str, parameters) -> list[str]:
+    """Return SQLite's query plan for ``statement`` as indented lines.
+
+    Runs on a fresh cursor of the same DBAPI connection, so it sees the
+    same transaction and does not pass through the SQLAlchemy hooks again.
+    """
+    if not statement.lstrip().upper().startswith(_EXPLAINABLE):
+        return []
+    try:
+        cursor = dbapi_cursor.connection.cursor()
+        try:
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ())
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+    except Exception as exc:  # the plan is diagnostic only
+        return [f"(no plan: {exc})"]
+    depth = {0: 0}
+    lines = []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, 0) + 1
+        lines.append("  " * (depth[node_id] - 1) + detail)
+    return lines
+
+
+class QueryLog:
+    """Runtime-adjustable slow-query and statement-count detector."""
+
+    def __init__(
+        self,
+        enabled: bool,
+        slow_ms: float,
+        max_statements: int,
+        explain: bool,
+        parameters: bool = False,
+        keep: int = 100,
+    ) -> None:
+        self.enabled = enabled
+        self.slow_ms = slow_ms
+        self.max_statements = max_statements
+        self.explain = explain
+        self.parameters = parameters
+        self.recent: deque = deque(maxlen=keep)
+        self._lock = threading.Lock()
+
+    def settings(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "slow_ms": self.slow_ms,
+            "max_statements": self.max_statements,
+            "explain": self.explain,
+            "parameters": self.parameters,
+        }
+
+    def configure(self, **settings) -> None:
+        for name, value in settings.items():
+            if value is not None:
+                setattr(self, name, value)
+
+    def _record(self, entry: dict) -> None:
+        with self._lock:
+            self.recent.append(entry)
+
+    def slow_statement(
+        self,
+        dbapi_cursor,
+        statement: str,
+        parameters,
+        executemany: bool,
+        elapsed: float,
+        route: Optional[str],
+    ) -> None:
+        """Log a statement that took at least ``slow_ms``."""
+        if executemany:
+            parameters = parameters[0] if parameters else ()
+        plan = explain(dbapi_cursor, statement, parameters) if self.explain else []
+        entry = {
+            "kind": "slow_query",
+            "at": datetime.now(timezone.utc).isoformat(),
+            "route": route,
+            "duration_ms": round(elapsed * 1000, 3),
+            "statement": statement,
+            "parameters": _short(parameters) if self.parameters else "(redacted)",
+            "plan": plan,
+        }
+        self._record(entry)
+        logger.warning(
+            "Slow query (%.1f ms) on %s: %s\n  parameters: %s%s",
+            entry["duration_ms"],
+            route or "(no request)",
+            " ".join(statement.split()),
+            entry["parameters"],
+            "".join(f"\n  plan: {line}" for line in plan),
+        )
+
+    def statement_count(self, route: str, statements: Counter) -> None:
+        """Log a request that ran more than ``max_statements`` statements."""
+        total = sum(statements.values())
+        statement, repeats = statements.most_common(1)[0]
+        entry = {
+            "kind": "too_many_statements",
+            "at": datetime.now(timezone.utc).isoformat(),
+            "route": route,
+            "statements": total,
+            "most_repeated": statement,
+            "repeats": repeats,
+        }
+        self._record(entry)
+        logger.warning(
+            "%s ran %d SQL statements (limit %d); possible N+1: %dx %s",
+            route,
+            total,
+            self.max_statements,
+            repeats,
+            " ".join(statement.split()),
+        )
+
+
+query_log = QueryLog(
+    QUERY_LOG_ENABLED,
+    SLOW_QUERY_MS,
+    QUERY_LOG_MAX_STATEMENTS,
+    QUERY_LOG_EXPLAIN,
+    QUERY_LOG_PARAMETERS,
+)
@@ -1,23 +1,52 @@
 """API route handlers for task management."""
 
-from typing import Optional
+import asyncio
+import csv
+import io
+import json
+import time
+from datetime import datetime, timezone
+from typing import Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
 from app import crud
-from app.database import get_db
+from app.cache import task_cache
+from app.database import get_read_db, get_read_engine, get_write_db
+from app.etags import cache_headers, make_etag, not_modified
 from app.models import TaskStatus
 from app.schemas import (
+    BulkTaskCreateResponse,
+    BulkTaskResult,
+    TaskBulkStatusResponse,
+    TaskBulkStatusUpdate,
+    TaskChangeEntry,
+    TaskChangeFeed,
     TaskCreate,
     TaskListResponse,
     TaskResponse,
+    TaskStats,
     TaskUpdate,
     TaskUpdateStatus,
+    task_list_response_model,
+    task_response_model,
 )
+from app.writer import write
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
+BULK_MAX_ITEMS = 10_000
+CHANGE_POLL_INTERVAL = 0.5
+
+_task_adapter = TypeAdapter(TaskResponse)
+_task_list_adapter = TypeAdapter(list[TaskResponse])
+_task_create_list_adapter = TypeAdapter(list[TaskCreate])
+
 
 @router.post(
     "",
@@ -26,31 +55,466 @@ router = APIRouter(prefix="/tasks", tags=["Tasks"])
     summary="Create a new task",
     description="Create a new task with a title, optional description, status, and due date.",
 )
-def create_task(task_data: TaskCreate, db: Session = Depends(get_db)):
+def create_task(task_data: TaskCreate, db: Session = Depends(get_write_db)):
     """Create a new caseworker task."""
-    return crud.create_task(db, task_data)
+    return write(db, crud.create_task, task_data)
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkTaskCreateResponse,
+    summary="Create many tasks",
+    description=(
+        "Create up to 10,000 tasks from a JSON array or an NDJSON stream "
+        "(Content-Type: application/x-ndjson). Items are validated "
+        "together, invalid ones are skipped, and the rest are inserted in "
+        "chunked transactions; the response reports the outcome of every item."
+    ),
+)
+async def bulk_create_tasks(request: Request, db: Session = Depends(get_write_db)):
+    """Create many caseworker tasks in one request."""
+    body = await request.body()
+    try:
+        if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+            items = [json.loads(line) for line in body.splitlines() if line.strip()]
+        else:
+            items = json.loads(body)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Malformed JSON body"
+        )
+    if not isinstance(items, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Expected a JSON array or NDJSON stream of tasks",
+        )
+    if len(items) > BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {BULK_MAX_ITEMS} tasks can be created per request",
+        )
+
+    results = [BulkTaskResult(index=i) for i in range(len(items))]
+    indexes = range(len(items))
+    try:
+        tasks = _task_create_list_adapter.validate_python(items)
+    except ValidationError as exc:
+        # Errors are located as (item index, field...); report each item's
+        # own errors, then validate the remaining items in one more pass
+        for error in exc.errors(include_url=False, include_context=False):
+            index, *loc = error["loc"]
+            errors = results[index].errors = results[index].errors or []
+            errors.append({**error, "loc": tuple(loc)})
+        indexes = [i for i in indexes if results[i].errors is None]
+        tasks = _task_create_list_adapter.validate_python([items[i] for i in indexes])
+
+    outcomes = await run_in_threadpool(crud.bulk_create_tasks, db, tasks)
+    for index, outcome in zip(indexes, outcomes):
+        if isinstance(outcome, int):
+            results[index].id = outcome
+        else:
+            results[index].errors = [{"type": "database_error", "msg": outcome}]
+
+    created = sum(1 for result in results if result.id is not None)
+    response = BulkTaskCreateResponse(
+        created=created, failed=len(results) - created, results=results
+    )
+    # Already validated; skip FastAPI's second validation pass over every item
+    return Response(response.model_dump_json(), media_type="application/json")
+
+
+@router.patch(
+    "/bulk/status",
+    response_model=TaskBulkStatusResponse,
+    summary="Update the status of many tasks",
+    description=(
+        "Move tasks selected by an id list or by a status/due-date filter to "
+        "a new status in a single statement. Tasks already in that status "
+        "are left unchanged."
+    ),
+)
+def bulk_update_task_status(
+    update_data: TaskBulkStatusUpdate, db: Session = Depends(get_write_db)
+):
+    """Update the status of many tasks at once."""
+    criteria = update_data.filter.model_dump() if update_data.filter else {}
+    ids = crud.bulk_update_task_status(
+        db, update_data.status, ids=update_data.ids, **criteria
+    )
+    return TaskBulkStatusResponse(updated=len(ids), ids=ids)
+
+
+def _poll_changes(bind, since: Optional[int], limit: int) -> TaskChangeFeed:
+    """Read one page of the change feed through a short-lived session.
+
+    The session is closed before returning so long-polls and event streams
+    don't hold a pooled connection while they wait.
+    """
+    with Session(bind=bind) as db:
+        if since is None:
+            return TaskChangeFeed(
+                changes=[], last_seq=crud.get_last_change_seq(db), has_more=False
+            )
+        if since < crud.get_change_horizon(db):
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail=(
+                    "Changes before this sequence number were compacted; "
+                    "reload the task list and resume from the current last_seq"
+                ),
+            )
+        entries = crud.get_task_changes(db, since, limit + 1)
+        changes = [
+            TaskChangeEntry(
+                seq=change.seq,
+                op=change.op,
+                task_id=change.task_id,
+                task=TaskResponse.model_validate(task) if task else None,
+            )
+            for change, task in entries[:limit]
+        ]
+        return TaskChangeFeed(
+            changes=changes,
+            last_seq=changes[-1].seq if changes else since,
+            has_more=len(entries) > limit,
+        )
+
+
+async def _change_events(request: Request, bind, since, wait: float, limit: int):
+    """Yield the change feed as Server-Sent Events for ``wait`` seconds."""
+    yield "retry: 1000\n\n"
+    if since is None:
+        since = (await run_in_threadpool(_poll_changes, bind, None, limit)).last_seq
+    deadline = time.monotonic() + wait
+    while True:
+        try:
+            feed = await run_in_threadpool(_poll_changes, bind, since, limit)
+        except HTTPException as exc:
+            yield f"event: resync\ndata: {json.dumps(exc.detail)}\n\n"
+            return
+        for change in feed.changes:
+            yield (
+                f"id: {change.seq}\nevent: {change.op.value}\n"
+                f"data: {change.model_dump_json()}\n\n"
+            )
+        since = feed.last_seq
+        if feed.has_more:
+            continue
+        if time.monotonic() >= deadline or await request.is_disconnected():
+            return
+        await asyncio.sleep(CHANGE_POLL_INTERVAL)
+
+
+def serialize_task(task, fields: Optional[tuple[str, ...]] = None) -> bytes:
+    """Serialize a task to its ``TaskResponse`` JSON payload.
+
+    ``fields`` limits the payload to those keys.
+    """
+    if fields:
+        return task_response_model(fields).model_validate(task).model_dump_json()
+    return _task_adapter.dump_json(TaskResponse.model_validate(task))
+
+
+def _export_ndjson(batches):
+    for rows in batches:
+        tasks = _task_list_adapter.validate_python(rows)
+        yield b"".join(_task_adapter.dump_json(task) + b"\n" for task in tasks)
+
+
+def _export_csv(batches):
+    columns = list(TaskResponse.model_fields)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for rows in batches:
+        for task in _task_list_adapter.validate_python(rows):
+            writer.writerow(task.model_dump(mode="json").values())
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+@router.get(
+    "/changes",
+    response_model=TaskChangeFeed,
+    summary="Follow task changes",
+    description=(
+        "Return tasks created, updated or deleted after the sequence number "
+        "'since'. Without 'since', returns the current last_seq to start from. "
+        "Set 'wait' to long-poll until a change arrives, or send "
+        "'Accept: text/event-stream' to receive changes as Server-Sent Events "
+        "for 'wait' seconds (resuming from Last-Event-ID). Returns 410 if the "
+        "log was compacted past 'since'."
+    ),
+    responses={410: {"description": "Client must resync from a full list"}},
+)
+async def get_task_changes(
+    request: Request,
+    since: Optional[int] = Query(
+        None, ge=0, description="Last sequence number the client has seen"
+    ),
+    wait: float = Query(
+        0, ge=0, le=60, description="Seconds to wait for changes before returning"
+    ),
+    limit: int = Query(500, ge=1, le=1000, description="Max changes to return"),
+    bind: Engine = Depends(get_read_engine),
+):
+    """Return or stream task changes after a sequence number."""
+    # Each poll opens its own short session, so a long wait holds no
+    # pooled connection between polls
+    last_event_id = request.headers.get("last-event-id", "")
+    if since is None and last_event_id.isdigit():
+        since = int(last_event_id)
+    if "text/event-stream" in request.headers.get("accept", ""):
+        return StreamingResponse(
+            _change_events(request, bind, since, wait, limit),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"},
+        )
+    deadline = time.monotonic() + wait
+    while True:
+        feed = await run_in_threadpool(_poll_changes, bind, since, limit)
+        remaining = deadline - time.monotonic()
+        if feed.changes or since is None or remaining <= 0:
+            return feed
+        await asyncio.sleep(min(CHANGE_POLL_INTERVAL, remaining))
+
+
+@router.get(
+    "/export",
+    summary="Export tasks",
+    description=(
+        "Stream every matching task as NDJSON or CSV. Rows are read from the "
+        "database incrementally, so memory use is flat for any table size."
+    ),
+    responses={200: {"content": {"application/x-ndjson": {}, "text/csv": {}}}},
+)
+def export_tasks(
+    export_format: Literal["ndjson", "csv"] = Query(
+        "ndjson", alias="format", description="Output format"
+    ),
+    status_filter: Optional[TaskStatus] = Query(
+        None, alias="status", description="Filter by task status"
+    ),
+    due_before: Optional[datetime] = Query(
+        None, description="Only tasks due strictly before this time"
+    ),
+    due_after: Optional[datetime] = Query(
+        None, description="Only tasks due at or after this time"
+    ),
+    bind: Engine = Depends(get_read_engine),
+):
+    """Stream all tasks matching the filters."""
+    # The body is streamed after the handler returns, so the generator reads
+    # through its own session, holding a connection only while it streams
+
+    def _batches():
+        with Session(bind=bind) as stream_db:
+            yield from crud.iter_task_rows(
+                stream_db,
+                status=status_filter,
+                due_before=due_before,
+                due_after=due_after,
+            )
+
+    if export_format == "csv":
+        return StreamingResponse(
+            _export_csv(_batches()),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="tasks.csv"'},
+        )
+    return StreamingResponse(
+        _export_ndjson(_batches()),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="tasks.ndjson"'},
+    )
+
+
+@router.get(
+    "/stats",
+    response_model=TaskStats,
+    summary="Task statistics",
+    description=(
+        "Counts per status, the number of overdue tasks and the number of "
+        "open tasks due on each of the next days, read from a summary that "
+        "every write keeps up to date."
+    ),
+)
+def get_task_stats(
+    request: Request,
+    days: int = Query(14, ge=1, le=90, description="Number of upcoming days"),
+    db: Session = Depends(get_read_db),
+):
+    """Retrieve dashboard statistics."""
+    # Besides writes, the stats change at midnight and whenever an open
+    # task falls due
+    version = (
+        f"{crud.get_data_version(db)}.{datetime.now(timezone.utc).date()}"
+        f".{crud.next_overdue_at(db)}"
+    )
+    etag = make_etag(version, request)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    stats = TaskStats.model_validate(crud.get_task_stats(db, days=days))
+    return Response(
+        stats.model_dump_json(),
+        media_type="application/json",
+        headers=cache_headers(etag),
+    )
+
+
+def task_list_response(
+    rows,
+    total: Optional[int],
+    limit: int,
+    etag: str,
+    keyset: bool = True,
+    fields: Optional[tuple[str, ...]] = None,
+) -> Response:
+    """Validate plain task rows once and serialize them straight to JSON.
+
+    Returning a ``Response`` skips FastAPI's second validation against
+    ``response_model`` and its ``jsonable_encoder`` pass. ``keyset`` is off
+    for orderings a cursor cannot resume, which then get no ``next_cursor``.
+    ``fields`` limits each task to those keys.
+    """
+    model = task_list_response_model(fields) if fields else TaskListResponse
+    page = model.model_validate(
+        {
+            "tasks": rows,
+            "total": total,
+            "next_cursor": (
+                crud.encode_cursor(rows[-1])
+                if keyset and len(rows) == limit
+                else None
+            ),
+        },
+        from_attributes=True,
+    )
+    return Response(
+        page.model_dump_json(),
+        media_type="application/json",
+        headers=cache_headers(etag),
+    )
+
+
+def selected_fields(
+    fields: Optional[str] = Query(
+        None,
+        description=(
+            "Comma-separated fields to return, e.g. title,status,due_date "
+            "(id is always included); only these columns are read"
+        ),
+    ),
+) -> Optional[tuple[str, ...]]:
+    """Dependency parsing ``fields=`` into the columns to select."""
+    try:
+        return crud.parse_fields(fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+
+LIST_TASKS_DESCRIPTION = (
+    "Retrieve all tasks with optional status and due-date filtering "
+    "(due_before, due_after, overdue) and full-text search (q). Pages can "
+    "be fetched by offset (skip) or by cursor (next_cursor from the "
+    "previous page); search results are ranked by relevance and paged by "
+    "offset only. include_archived adds completed tasks moved to the "
+    "archive."
+)
+
+
+class TaskListParams:
+    """Query parameters of ``GET /api/tasks``, shared with the async route."""
+
+    def __init__(
+        self,
+        status_filter: Optional[TaskStatus] = Query(
+            None, alias="status", description="Filter by task status"
+        ),
+        skip: int = Query(0, ge=0, description="Number of records to skip"),
+        limit: int = Query(100, ge=1, le=500, description="Max records to return"),
+        cursor: Optional[str] = Query(
+            None,
+            description="Cursor from a previous page's next_cursor (overrides skip)",
+        ),
+        include_total: bool = Query(
+            True, description="Include the total number of matching tasks"
+        ),
+        q: Optional[str] = Query(
+            None,
+            min_length=1,
+            max_length=200,
+            description=(
+                "Search title and description; end a word with * to match a prefix"
+            ),
+        ),
+        due_before: Optional[datetime] = Query(
+            None, description="Only tasks due strictly before this time"
+        ),
+        due_after: Optional[datetime] = Query(
+            None, description="Only tasks due at or after this time"
+        ),
+        overdue: bool = Query(
+            False,
+            description="Only tasks that are not completed and past their due date",
+        ),
+        include_archived: bool = Query(
+            False,
+            description="Also return completed tasks moved to the archive (not with q)",
+        ),
+        fields: Optional[tuple[str, ...]] = Depends(selected_fields),
+    ) -> None:
+        self.status = status_filter
+        self.skip = skip
+        self.limit = limit
+        self.cursor = cursor
+        self.include_total = include_total
+        self.q = q
+        self.due_before = due_before
+        self.due_after = due_after
+        self.overdue = overdue
+        self.include_archived = include_archived
+        self.fields = fields
+
+    def crud_kwargs(self) -> dict:
+        """Keyword arguments for ``crud.get_task_rows``."""
+        return vars(self).copy()
+
+    def response(self, rows, total: Optional[int], etag: str) -> Response:
+        """Serialize a page of rows fetched with these parameters."""
+        return task_list_response(
+            rows, total, self.limit, etag, keyset=not self.q, fields=self.fields
+        )
 
 
 @router.get(
     "",
     response_model=TaskListResponse,
     summary="Retrieve all tasks",
-    description="Retrieve all tasks with optional status filtering and pagination.",
+    description=LIST_TASKS_DESCRIPTION,
 )
 def get_all_tasks(
-    status_filter: Optional[TaskStatus] = Query(
-        None, alias="status", description="Filter by task status"
-    ),
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
-    limit: int = Query(100, ge=1, le=500, description="Max records to return"),
-    db: Session = Depends(get_db),
+    request: Request,
+    params: TaskListParams = Depends(),
+    db: Session = Depends(get_read_db),
 ):
     """Retrieve all tasks, optionally filtered by status."""
-    tasks, total = crud.get_all_tasks(db, status=status_filter, skip=skip, limit=limit)
-    return TaskListResponse(
-        tasks=[TaskResponse.model_validate(t) for t in tasks],
-        total=total,
-    )
+    version = crud.get_data_version(db)
+    if params.overdue:
+        # The overdue set also changes when the next open task falls due
+        version = f"{version}.{crud.next_overdue_at(db)}"
+    etag = make_etag(version, request)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    try:
+        rows, total = crud.get_task_rows(db, **params.crud_kwargs())
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    return params.response(rows, total, etag)
 
 
 @router.get(
@@ -59,15 +523,44 @@ def get_all_tasks(
     summary="Retrieve a task by ID",
     description="Retrieve a single task by its unique identifier.",
 )
-def get_task(task_id: int, db: Session = Depends(get_db)):
+def get_task(
+    task_id: int,
+    request: Request,
+    selected: Optional[tuple[str, ...]] = Depends(selected_fields),
+    db: Session = Depends(get_read_db),
+):
     """Retrieve a task by ID."""
-    task = crud.get_task(db, task_id)
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Task with id {task_id} not found",
+    version = crud.get_data_version(db)
+    etag = make_etag(version, request)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    if selected:
+        # Projections skip the cache, which holds full payloads
+        task = crud.get_task_row(db, task_id, selected)
+        if not task:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Task with id {task_id} not found",
+            )
+        body = serialize_task(task, selected)
+        return Response(
+            body, media_type="application/json", headers=cache_headers(etag)
         )
-    return task
+    stamp = None
+    if task_cache.needs_stamp(task_id):
+        stamp = crud.get_task_stamp(db, task_id)
+    body = task_cache.get(task_id, stamp)
+    if body is None:
+        task = crud.get_task(db, task_id)
+        if not task:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Task with id {task_id} not found",
+            )
+        body = serialize_task(task)
+        task_cache.put(task_id, task.updated_at, body)
+    return Response(body, media_type="application/json", headers=cache_headers(etag))
 
 
 @router.patch(
@@ -77,16 +570,16 @@ def get_task(task_id: int, db: Session = Depends(get_db)):
     description="Update only the status field of an existing task.",
 )
 def update_task_status(
-    task_id: int, status_data: TaskUpdateStatus, db: Session = Depends(get_db)
+    task_id: int, status_data: TaskUpdateStatus, db: Session = Depends(get_write_db)
 ):
     """Update the status of an existing task."""
-    task = crud.get_task(db, task_id)
+    task = write(db, crud.update_task_status, task_id, status_data)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Task with id {task_id} not found",
         )
-    return crud.update_task_status(db, task, status_data)
+    return task
 
 
 @router.put(
@@ -96,16 +589,16 @@ def update_task_status(
     description="Update any fields of an existing task.",
 )
 def update_task(
-    task_id: int, task_data: TaskUpdate, db: Session = Depends(get_db)
+    task_id: int, task_data: TaskUpdate, db: Session = Depends(get_write_db)
 ):
     """Update an existing task."""
-    task = crud.get_task(db, task_id)
+    task = write(db, crud.update_task, task_id, task_data)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Task with id {task_id} not found",
         )
-    return crud.update_task(db, task, task_data)
+    return task
 
 
 @router.delete(
@@ -114,12 +607,10 @@ def update_task(
     summary="Delete a task",
     description="Delete a task by its unique identifier.",
 )
-def delete_task(task_id: int, db: Session = Depends(get_db)):
+def delete_task(task_id: int, db: Session = Depends(get_write_db)):
     """Delete a task."""
-    task = crud.get_task(db, task_id)
-    if not task:
+    if not write(db, crud.delete_task, task_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Task with id {task_id} not found",
         )
-    crud.delete_task(db, task)
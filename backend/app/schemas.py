@@ -1,11 +1,30 @@
 """Pydantic schemas for request/response validation."""
 
-from datetime import datetime, timezone
-from typing import Optional
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import Any, Optional
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    create_model,
+    field_validator,
+    model_validator,
+)
 
-from app.models import TaskStatus
+from app.models import TaskChangeOp, TaskStatus
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Convert a due date to UTC, taking naive values to be UTC already.
+
+    Due dates are stored as UTC wall-clock time (SQLite keeps no offset),
+    which the due-date filters and per-day stats rely on.
+    """
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
 
 
 class TaskCreate(BaseModel):
@@ -20,17 +39,19 @@ class TaskCreate(BaseModel):
     status: TaskStatus = Field(
         default=TaskStatus.TODO, description="Current status of the task"
     )
-    due_date: datetime = Field(..., description="Due date and time for the task")
+    due_date: datetime = Field(
+        ...,
+        description="Due date and time for the task; stored in UTC, naive "
+        "values are taken as UTC",
+    )
 
     @field_validator("due_date")
     @classmethod
     def due_date_must_not_be_in_past(cls, v: datetime) -> datetime:
-        now = datetime.now(timezone.utc)
-        # Make naive datetimes UTC-aware for comparison
-        check = v if v.tzinfo else v.replace(tzinfo=timezone.utc)
-        if check < now:
+        due = _as_utc(v)
+        if due < datetime.now(timezone.utc):
             raise ValueError("Due date cannot be in the past")
-        return v
+        return due
 
 
 class TaskUpdateStatus(BaseModel):
@@ -39,6 +60,42 @@ class TaskUpdateStatus(BaseModel):
     status: TaskStatus = Field(..., description="New status for the task")
 
 
+class TaskFilter(BaseModel):
+    """Criteria selecting the tasks a bulk operation applies to."""
+
+    status: Optional[TaskStatus] = Field(None, description="Current status")
+    due_before: Optional[datetime] = Field(
+        None, description="Only tasks due strictly before this time"
+    )
+    due_after: Optional[datetime] = Field(
+        None, description="Only tasks due at or after this time"
+    )
+
+    @model_validator(mode="after")
+    def at_least_one_criterion(self) -> "TaskFilter":
+        if all(getattr(self, name) is None for name in self.model_fields):
+            raise ValueError("Filter must set at least one criterion")
+        return self
+
+
+class TaskBulkStatusUpdate(BaseModel):
+    """Schema for moving many tasks to a new status."""
+
+    status: TaskStatus = Field(..., description="New status for the tasks")
+    ids: Optional[list[int]] = Field(
+        None, min_length=1, max_length=10_000, description="IDs of the tasks"
+    )
+    filter: Optional[TaskFilter] = Field(
+        None, description="Select the tasks by status and due date instead of IDs"
+    )
+
+    @model_validator(mode="after")
+    def ids_or_filter(self) -> "TaskBulkStatusUpdate":
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Provide exactly one of 'ids' or 'filter'")
+        return self
+
+
 class TaskUpdate(BaseModel):
     """Schema for updating any fields of a task."""
 
@@ -49,18 +106,19 @@ class TaskUpdate(BaseModel):
         None, max_length=2000, description="Updated description"
     )
     status: Optional[TaskStatus] = Field(None, description="Updated status")
-    due_date: Optional[datetime] = Field(None, description="Updated due date")
+    due_date: Optional[datetime] = Field(
+        None, description="Updated due date; stored in UTC like on create"
+    )
 
     @field_validator("due_date")
     @classmethod
     def due_date_must_not_be_in_past(cls, v: Optional[datetime]) -> Optional[datetime]:
         if v is None:
             return v
-        now = datetime.now(timezone.utc)
-        check = v if v.tzinfo else v.replace(tzinfo=timezone.utc)
-        if check < now:
+        due = _as_utc(v)
+        if due < datetime.now(timezone.utc):
             raise ValueError("Due date cannot be in the past")
-        return v
+        return due
 
 
 class TaskResponse(BaseModel):
@@ -81,4 +139,102 @@ class TaskListResponse(BaseModel):
     """Schema for a list of tasks response."""
 
     tasks: list[TaskResponse]
+    total: Optional[int] = Field(
+        None, description="Number of matching tasks, or null if not requested"
+    )
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page, or null on the last page"
+    )
+
+
+@lru_cache(maxsize=None)
+def task_response_model(fields: tuple[str, ...]) -> type[BaseModel]:
+    """A ``TaskResponse`` limited to ``fields`` (for sparse field selection)."""
+    return create_model(
+        "TaskFieldsResponse",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (TaskResponse.model_fields[name].annotation, ...) for name in fields},
+    )
+
+
+@lru_cache(maxsize=None)
+def task_list_response_model(fields: tuple[str, ...]) -> type[BaseModel]:
+    """A ``TaskListResponse`` whose tasks are limited to ``fields``."""
+    return create_model(
+        "TaskFieldsListResponse",
+        __base__=TaskListResponse,
+        tasks=(list[task_response_model(fields)], ...),
+    )
+
+
+class BulkTaskResult(BaseModel):
+    """Outcome of one item in a bulk create request."""
+
+    index: int = Field(..., description="Position of the item in the request")
+    id: Optional[int] = Field(None, description="ID of the created task")
+    errors: Optional[list[dict[str, Any]]] = Field(
+        None, description="Why the item was not created"
+    )
+
+
+class BulkTaskCreateResponse(BaseModel):
+    """Schema for a bulk create response."""
+
+    created: int
+    failed: int
+    results: list[BulkTaskResult]
+
+
+class TaskBulkStatusResponse(BaseModel):
+    """Schema for a bulk status update response."""
+
+    updated: int
+    ids: list[int]
+
+
+class TaskChangeEntry(BaseModel):
+    """One entry of the task change feed."""
+
+    seq: int = Field(..., description="Sequence number of the change")
+    op: TaskChangeOp = Field(..., description="upsert or delete")
+    task_id: int
+    task: Optional[TaskResponse] = Field(
+        None, description="Current state of the task (null once deleted)"
+    )
+
+
+class TaskChangeFeed(BaseModel):
+    """Schema for a page of the task change feed."""
+
+    changes: list[TaskChangeEntry]
+    last_seq: int = Field(..., description="Pass as 'since' to get later changes")
+    has_more: bool = Field(..., description="More changes are available now")
+
+
+class DueDayCount(BaseModel):
+    """Number of open tasks due on one day."""
+
+    day: date
+    count: int
+
+
+class TaskStats(BaseModel):
+    """Dashboard statistics for GET /api/tasks/stats."""
+
     total: int
+    by_status: dict[TaskStatus, int]
+    overdue: int = Field(..., description="Open tasks past their due date")
+    due_by_day: list[DueDayCount] = Field(
+        ..., description="Open tasks due on each upcoming day (UTC), from today"
+    )
+
+
+class QueryLogSettings(BaseModel):
+    """Runtime settings of the slow-query log; omitted fields are unchanged."""
+
+    enabled: Optional[bool] = None
+    slow_ms: Optional[float] = Field(None, ge=0, description="Slow-query threshold")
+    max_statements: Optional[int] = Field(
+        None, ge=1, description="Statements per request before it is flagged"
+    )
+    explain: Optional[bool] = Field(None, description="Capture EXPLAIN QUERY PLAN")
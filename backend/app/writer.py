@@ -0,0 +1,205 @@
+"""Optional group-commit writer for task mutations.
+
+SQLite has a single writer, and each ``crud`` mutation normally commits
+(and syncs to disk) on its own, so bursts of writes queue on the write lock.
+With ``WRITE_BATCHING=true`` the routes hand ``create_task``,
+``update_task``, ``update_task_status`` and ``delete_task`` calls to one
+writer thread instead. It folds everything that arrives within
+``WRITE_BATCH_WINDOW_MS`` (or up to ``WRITE_BATCH_MAX_OPS`` calls) into a
+single transaction: each call runs in its own SAVEPOINT, so one failing call
+is rolled back on its own and its caller gets the error, while the others
+share one commit.
+"""
+
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Callable
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.cache import task_cache
+from app.database import get_engine
+from app.metrics import WRITE_BATCH_SIZE
+
+if TYPE_CHECKING:  # keep the async extension out of sync-mode imports
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+WRITE_BATCHING = os.getenv("WRITE_BATCHING", "false").lower() in ("1", "true", "yes")
+WRITE_BATCH_WINDOW_MS = float(os.getenv("WRITE_BATCH_WINDOW_MS", "2"))
+WRITE_BATCH_MAX_OPS = int(os.getenv("WRITE_BATCH_MAX_OPS", "256"))
+
+logger = logging.getLogger(__name__)
+
+
+class GroupCommitWriter:
+    """Runs submitted mutations on one thread, one transaction per batch."""
+
+    def __init__(
+        self,
+        engine: Engine,
+        window: float = WRITE_BATCH_WINDOW_MS / 1000,
+        max_ops: int = WRITE_BATCH_MAX_OPS,
+    ) -> None:
+        self.engine = engine
+        self.window = window
+        self.max_ops = max_ops
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._run, name="group-commit-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """Queue ``fn(session, *args)``; the future resolves after the commit."""
+        future: Future = Future()
+        self._queue.put((fn, args, future))
+        return future
+
+    def run(self, fn: Callable, *args):
+        """Run ``fn(session, *args)`` in the next batch and return its result."""
+        return self.submit(fn, *args).result()
+
+    async def arun(self, fn: Callable, *args):
+        """Like ``run`` but awaits the result without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def close(self) -> None:
+        """Finish the queued work and stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self, first) -> tuple[list, bool]:
+        batch = [first]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_ops:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=max(remaining, 0))
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch, stopping = self._collect(first)
+            # Callers that gave up (a cancelled ``arun``) are dropped; the
+            # rest can no longer be cancelled, so resolving them is safe
+            batch = [item for item in batch if item[2].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                self._commit_batch(batch)
+            except Exception as exc:
+                # Never let one batch end the thread, or every later call
+                # would wait forever
+                logger.exception("Group-commit writer batch failed")
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+
+    def _commit_batch(self, batch: list) -> None:
+        outcomes = []
+        try:
+            with self.engine.connect() as connection:
+                transaction = connection.begin()
+                # pysqlite defers BEGIN; take the write lock up front so the
+                # per-call savepoints nest inside this transaction
+                connection.exec_driver_sql("BEGIN IMMEDIATE")
+                for fn, args, future in batch:
+                    savepoint = connection.begin_nested()
+                    try:
+                        # crud commits release the session's own savepoints;
+                        # close it (ending any read it began since) before
+                        # releasing the call's savepoint
+                        with Session(
+                            bind=connection,
+                            join_transaction_mode="create_savepoint",
+                            expire_on_commit=False,
+                        ) as session:
+                            result = fn(session, *args)
+                        savepoint.commit()
+                    except Exception as exc:
+                        savepoint.rollback()
+                        outcomes.append((future, None, exc))
+                    else:
+                        outcomes.append((future, result, None))
+                try:
+                    transaction.commit()
+                except Exception:
+                    # Make sure the connection goes back to the pool outside
+                    # the failed transaction
+                    transaction.rollback()
+                    raise
+        except Exception as exc:
+            # The shared commit failed, so no call in the batch took effect
+            for fn, args, future in batch:
+                future.set_exception(exc)
+            return
+        WRITE_BATCH_SIZE.observe(len(batch))
+        for (_, args, _), (future, result, exc) in zip(batch, outcomes):
+            if args and isinstance(args[0], int):
+                # crud invalidated the task before the batch committed, so a
+                # reader may have cached the old row in between
+                task_cache.invalidate(args[0])
+            if exc is None:
+                future.set_result(result)
+            else:
+                future.set_exception(exc)
+
+
+_writers: dict[Engine, GroupCommitWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(engine: Engine) -> GroupCommitWriter:
+    """Return the writer for ``engine``, starting it on first use."""
+    writer = _writers.get(engine)
+    if writer is None:
+        with _writers_lock:
+            writer = _writers.get(engine)
+            if writer is None:
+                writer = _writers[engine] = GroupCommitWriter(engine)
+    return writer
+
+
+def close_writers() -> None:
+    """Drain and stop every writer that was started."""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
+
+
+def write(db: Session, fn: Callable, *args):
+    """Run the ``crud`` mutation ``fn(db, *args)``, batched if enabled."""
+    if WRITE_BATCHING:
+        # Hand the request's connection back first: with a read pool the
+        # writer engine has a single connection, which the writer needs
+        db.close()
+        return get_writer(db.get_bind()).run(fn, *args)
+    return fn(db, *args)
+
+
+async def awrite(db: "AsyncSession", fn: Callable, *args):
+    """Async counterpart of ``write`` for ``AsyncSession`` callers.
+
+    The writer needs a sync engine, so batched calls go through the sync
+    engine for the same database rather than the session's aiosqlite one.
+    """
+    if WRITE_BATCHING:
+        return await get_writer(get_engine()).arun(fn, *args)
+    return await db.run_sync(fn, *args)
@@ -0,0 +1,89 @@
+"""Measure the archive move and list queries before and after it.
+
+Seeds ``--rows`` tasks (about a third completed), marks the completed ones
+as finished long ago, and times the open-task and due-range list queries
+on the full table. Then archives in chunks of ``--chunk-size``, reporting
+the longest single chunk (how long the write lock is held), and repeats
+the queries on the smaller hot table and with ``include_archived``.
+
+Usage (from the ``backend`` directory)::
+
+    python -m benchmarks.bench_archive --rows 200000 --chunk-size 500
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.models import Task, TaskStatus
+from benchmarks.common import SEED_EPOCH, make_engine, measure, seed_tasks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--url", default="sqlite:///./bench.db")
+    args = parser.parse_args()
+
+    engine = make_engine(args.url)
+    seed_tasks(engine, args.rows)
+    with engine.begin() as conn:
+        conn.execute(
+            update(Task)
+            .where(Task.status == TaskStatus.COMPLETED)
+            .values(updated_at=datetime(2020, 1, 1, tzinfo=timezone.utc))
+        )
+
+    due_after = SEED_EPOCH + timedelta(days=30)
+    queries = {
+        "open, first page": dict(status=TaskStatus.TODO, include_total=False),
+        "due range, total": dict(
+            due_after=due_after, due_before=due_after + timedelta(days=1)
+        ),
+    }
+
+    def run_queries(label: str, **extra) -> None:
+        with Session(engine) as db:
+            for name, kwargs in queries.items():
+                median = measure(
+                    lambda: crud.get_task_rows(db, **kwargs, **extra), args.repeat
+                )
+                print(f"  {label:<22} {name:<18} {median:8.2f} ms")
+
+    run_queries("before archiving")
+
+    chunk_times, started = [], None
+
+    def _begin(conn):
+        nonlocal started
+        started = time.perf_counter()
+
+    def _commit(conn):
+        if started is not None:
+            chunk_times.append((time.perf_counter() - started) * 1000)
+
+    event.listen(engine, "begin", _begin)
+    event.listen(engine, "commit", _commit)
+    with Session(engine) as db:
+        total_started = time.perf_counter()
+        moved = crud.archive_completed_tasks(db, timedelta(days=30), args.chunk_size)
+        elapsed = time.perf_counter() - total_started
+    event.remove(engine, "begin", _begin)
+    event.remove(engine, "commit", _commit)
+    print(
+        f"  archived {moved} tasks in {elapsed:.2f} s, {len(chunk_times)} chunks, "
+        f"longest transaction {max(chunk_times):.2f} ms"
+    )
+
+    run_queries("hot table only")
+    run_queries("include_archived", include_archived=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Compare per-row throughput of POST /api/tasks vs POST /api/tasks/bulk.
+
+Usage (from the ``backend`` directory)::
+
+    python -m benchmarks.bench_bulk_create --single 500 --bulk 10000
+"""
+
+import argparse
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.database import get_read_db, get_write_db
+from app.main import app
+from benchmarks.common import make_engine
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--single", type=int, default=500)
+    parser.add_argument("--bulk", type=int, default=10_000)
+    parser.add_argument("--url", default="sqlite:///./bench.db")
+    args = parser.parse_args()
+
+    engine = make_engine(args.url)
+    make_session = sessionmaker(bind=engine)
+
+    def _override_get_db():
+        with make_session() as db:
+            yield db
+
+    payload = {"title": "Imported task", "due_date": "2030-01-01T09:00:00Z"}
+    app.dependency_overrides[get_read_db] = _override_get_db
+    app.dependency_overrides[get_write_db] = _override_get_db
+    try:
+        with TestClient(app) as client:
+            started = time.perf_counter()
+            for _ in range(args.single):
+                client.post("/api/tasks", json=payload)
+            single_rate = args.single / (time.perf_counter() - started)
+
+            started = time.perf_counter()
+            response = client.post("/api/tasks/bulk", json=[payload] * args.bulk)
+            bulk_rate = args.bulk / (time.perf_counter() - started)
+            assert response.json()["created"] == args.bulk
+    finally:
+        app.dependency_overrides.clear()
+    engine.dispose()
+
+    print(f"POST /api/tasks       {single_rate:10.1f} rows/s")
+    print(f"POST /api/tasks/bulk  {bulk_rate:10.1f} rows/s")
+    print(f"speed-up              {bulk_rate / single_rate:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Track the cold-start budget: import the app and serve the first request.
+
+Each sample is a fresh Python process that imports ``app.main``, runs the
+lifespan startup and serves ``GET /api/tasks`` once, timing each phase.
+Samples run both against a new database file (schema created on startup)
+and against one already at the current schema version (the normal restart
+case). Exits with status 1 if the median total of the existing-database
+case exceeds ``--budget-ms``.
+
+Usage (from the ``backend`` directory)::
+
+    python -m benchmarks.bench_cold_start --samples 10 --budget-ms 1500
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PROBE = """
+import json, time
+started = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app) as client:
+    ready = time.perf_counter()
+    client.get("/api/tasks").raise_for_status()
+    served = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "startup_ms": (ready - imported) * 1000,
+    "first_request_ms": (served - ready) * 1000,
+    "total_ms": (served - started) * 1000,
+}))
+"""
+
+
+def sample(db_path: str) -> dict:
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{db_path}"}
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], env=env, check=True, capture_output=True
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    existing = os.path.join(directory, "existing.db")
+    sample(existing)  # create the schema once
+    results = {"new database": [], "existing database": []}
+    for i in range(args.samples):
+        results["new database"].append(sample(os.path.join(directory, f"new{i}.db")))
+        results["existing database"].append(sample(existing))
+
+    print(f"{'median of ' + str(args.samples):<20} {'import':>8} {'startup':>8} "
+          f"{'first req':>10} {'total':>8}")
+    for case, samples in results.items():
+        medians = {
+            key: statistics.median(s[key] for s in samples) for key in samples[0]
+        }
+        print(
+            f"{case:<20} {medians['import_ms']:8.1f} {medians['startup_ms']:8.1f} "
+            f"{medians['first_request_ms']:10.1f} {medians['total_ms']:8.1f}"
+        )
+    total = statistics.median(s["total_ms"] for s in results["existing database"])
+    if total > args.budget_ms:
+        print(f"Cold start {total:.0f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        sys.exit(1)
+    print(f"Cold start {total:.0f} ms is within the {args.budget_ms:.0f} ms budget")
+
+
+if __name__ == "__main__":
+    main()
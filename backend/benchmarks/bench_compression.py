@@ -0,0 +1,72 @@
+"""Measure response size and latency of GET /api/tasks with compression.
+
+Fetches the same ``--limit`` page through the ASGI app uncompressed, with
+each available encoding compressed on every request (cache cleared), and
+with the compressed-body cache warm.
+
+Usage (from the ``backend`` directory)::
+
+    python -m benchmarks.bench_compression --limit 500
+"""
+
+import argparse
+import statistics
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.cache import task_cache
+from app.compression import CompressionMiddleware, compressed_cache
+from app.database import get_read_db, get_write_db
+from app.main import app
+from benchmarks.common import make_engine, sample, seed_tasks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5_000)
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--url", default="sqlite:///./bench.db")
+    args = parser.parse_args()
+
+    engine = make_engine(args.url)
+    seed_tasks(engine, args.rows)
+    make_session = sessionmaker(bind=engine)
+
+    def _override_get_db():
+        with make_session() as db:
+            yield db
+
+    url = f"/api/tasks?limit={args.limit}"
+    encodings = list(CompressionMiddleware(None).codecs)
+    task_cache.clear()
+    app.dependency_overrides[get_read_db] = _override_get_db
+    app.dependency_overrides[get_write_db] = _override_get_db
+    try:
+        with TestClient(app) as client:
+            cases = [("identity", "identity", False)]
+            for encoding in encodings:
+                cases += [
+                    (encoding, encoding, False),
+                    (f"{encoding} cached", encoding, True),
+                ]
+            print(f"limit={args.limit}")
+            for label, encoding, warm in cases:
+                headers = {"Accept-Encoding": encoding}
+
+                def fetch():
+                    if not warm:
+                        compressed_cache.clear()
+                    return client.get(url, headers=headers)
+
+                size = int(fetch().headers["content-length"])
+                median = statistics.median(sample(fetch, args.repeat))
+                print(f"  {label:<16} {size:>9} bytes  {median:8.2f} ms")
+    finally:
+        app.dependency_overrides.clear()
+        compressed_cache.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Measure API throughput under concurrent clients in sync and async mode.
+
+Each mode is served by a fresh ``uvicorn app.main:app`` process; every
+client loops over ``GET /api/tasks/{id}`` and ``GET /api/tasks`` for the
+configured duration.
+
+Usage (from the ``backend`` directory)::
+
+    python -m benchmarks.bench_concurrency --clients 50 200 1000 --duration 10
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.common import make_engine, seed_tasks
+
+
+async def _client_loop(client: httpx.AsyncClient, deadline: float, rows: int, stats):
+    i = 0
+    while time.perf_counter() < deadline:
+        i += 1
+        url = f"/api/tasks/{i % rows + 1}" if i % 2 else "/api/tasks?limit=20"
+        try:
+            response = await client.get(url)
+            stats["ok" if response.status_code == 200 else "errors"] += 1
+        except httpx.HTTPError:
+            stats["errors"] += 1
+
+
+async def _run_clients(base_url: str, clients: int, duration: float, rows: int):
+    stats = {"ok": 0, "errors": 0}
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(
+            *(_client_loop(client, deadline, rows, stats) for _ in range(clients))
+        )
+    return stats
+
+
+def _wait_for_server(base_url: str, timeout: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health").status_code == 200:
+                return
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise RuntimeError("uvicorn did not start in time")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    seed_tasks(make_engine(f"sqlite:///{db_path}"), args.rows)
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    for mode in ("sync", "async"):
+        env = {**os.environ, "DATABASE_URL": f"sqlite:///{db_path}", "DATABASE_MODE": mode}
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app",
+             "--port", str(args.port), "--log-level", "warning"],
+            env=env,
+        )
+        try:
+            _wait_for_server(base_url)
+            for clients in args.clients:
+                stats = asyncio.run(
+                    _run_clients(base_url, clients, args.duration, args.rows)
+                )
+                print(
+                    f"{mode:<5} clients={clients:<5} "
+                    f"{stats['ok'] / args.duration:9.1f} req/s  errors={stats['errors']}"
+                )
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Compare direct per-call commits with the group-commit writer.
+
+Each of ``--threads`` worker threads loops over a mix of create, update,
+status update and delete calls into ``app.crud`` for ``--duration``
+seconds, either committing every call itself (``direct``) or handing it to
+a ``GroupCommitWriter`` (``batched``). Reports calls/sec, commits/sec and
+per-call p50/p99 latency for each SQLite profile, since the gain depends on
+how expensive a commit is (``durable`` fsyncs on every one).
+
+Usage (from the ``backend`` directory)::
+
+    python -m benchmarks.bench_group_commit --threads 1 8 32 --duration 5
+"""
+
+import argparse
+import itertools
+import os
+import random
+import tempfile
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.database import apply_sqlite_pragmas, sqlite_pragmas
+from app.models import TaskStatus
+from app.schemas import TaskCreate, TaskUpdate, TaskUpdateStatus
+from app.writer import GroupCommitWriter
+from benchmarks.common import SEED_EPOCH, make_engine, seed_tasks, summarize
+
+
+def _operations(rows: int, rng: random.Random, doomed: list[int]):
+    statuses = list(TaskStatus)
+    return itertools.cycle(
+        [
+            (crud.create_task, lambda: (TaskCreate(title="Bench", due_date=SEED_EPOCH),)),
+            (
+                crud.update_task_status,
+                lambda: (
+                    rng.randint(1, rows),
+                    TaskUpdateStatus(status=rng.choice(statuses)),
+                ),
+            ),
+            (
+                crud.update_task,
+                lambda: (rng.randint(1, rows), TaskUpdate(title="Bench update")),
+            ),
+            (crud.delete_task, lambda: (doomed.pop(),)),
+        ]
+    )
+
+
+def run(engine, mode: str, threads: int, duration: float, rows: int, window: float):
+    writer = GroupCommitWriter(engine, window=window) if mode == "batched" else None
+    commits = [0]
+    event.listen(engine, "commit", lambda conn: commits.__setitem__(0, commits[0] + 1))
+    timings: list[float] = []
+    lock = threading.Lock()
+    doomed = list(range(1, rows + 1))
+    random.Random(0).shuffle(doomed)
+    deadline = time.perf_counter() + duration
+
+    def _worker(seed: int) -> None:
+        operations = _operations(rows, random.Random(seed), doomed)
+        local = []
+        with Session(engine) as db:
+            while time.perf_counter() < deadline:
+                fn, make_args = next(operations)
+                args = make_args()
+                started = time.perf_counter()
+                if writer is None:
+                    fn(db, *args)
+                else:
+                    writer.run(fn, *args)
+                local.append((time.perf_counter() - started) * 1000)
+        with lock:
+            timings.extend(local)
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=_worker, args=(n,)) for n in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    if writer is not None:
+        writer.close()
+    stats = summarize(timings)
+    return {
+        "calls_per_sec": len(timings) / elapsed,
+        "commits_per_sec": commits[0] / elapsed,
+        "p50_ms": stats["p50_ms"],
+        "p99_ms": stats["p99_ms"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--window-ms", type=float, default=2.0)
+    parser.add_argument(
+        "--profiles", nargs="+", default=["production", "durable"]
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'profile':<11} {'threads':>7} {'mode':<8} {'calls/s':>9} "
+        f"{'commits/s':>9} {'p50 ms':>8} {'p99 ms':>8}"
+    )
+    for profile in args.profiles:
+        for threads in args.threads:
+            for mode in ("direct", "batched"):
+                db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+                engine = make_engine(f"sqlite:///{db_path}")
+                apply_sqlite_pragmas(engine, sqlite_pragmas(profile))
+                engine.dispose()
+                seed_tasks(engine, args.rows)
+                result = run(
+                    engine, mode, threads, args.duration, args.rows,
+                    args.window_ms / 1000,
+                )
+                engine.dispose()
+                print(
+                    f"{profile:<11} {threads:>7} {mode:<8} "
+                    f"{result['calls_per_sec']:9.1f} {result['commits_per_sec']:9.1f} "
+                    f"{result['p50_ms']:8.2f} {result['p99_ms']:8.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
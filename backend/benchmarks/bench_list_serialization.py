@@ -0,0 +1,70 @@
+"""Measure per-request CPU time of building a GET /api/tasks response.
+
+Compares the original pipeline (ORM objects, ``TaskResponse.model_validate``
+per task, then FastAPI's response-model validation and ``jsonable_encoder``)
+with the fast path (plain rows validated once and dumped straight to JSON).
+
+Usage (from the ``backend`` directory)::
+
+    python -m benchmarks.bench_list_serialization --limit 500
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+from app.routes import task_list_response
+from app.schemas import TaskListResponse, TaskResponse
+from benchmarks.common import make_engine, seed_tasks
+
+
+def cpu_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.process_time()
+        fn()
+        timings.append((time.process_time() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5_000)
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--url", default="sqlite:///./bench.db")
+    args = parser.parse_args()
+
+    engine = make_engine(args.url)
+    seed_tasks(engine, args.rows)
+    db = sessionmaker(bind=engine)()
+
+    def original():
+        tasks, total = crud.get_all_tasks(db, limit=args.limit)
+        page = TaskListResponse(
+            tasks=[TaskResponse.model_validate(t) for t in tasks], total=total
+        )
+        # What FastAPI does with a returned model and a response_model
+        checked = TaskListResponse.model_validate(page.model_dump())
+        json.dumps(jsonable_encoder(checked)).encode()
+        db.expunge_all()
+
+    def fast():
+        rows, total = crud.get_task_rows(db, limit=args.limit)
+        task_list_response(rows, total, limit=args.limit, etag='"0"')
+
+    before = cpu_ms(original, args.repeat)
+    after = cpu_ms(fast, args.repeat)
+    print(f"limit={args.limit}")
+    print(f"  original pipeline  {before:8.2f} ms CPU/request")
+    print(f"  fast path          {after:8.2f} ms CPU/request")
+    print(f"  speed-up           {before / after:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
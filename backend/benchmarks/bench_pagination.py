@@ -0,0 +1,49 @@
+"""Compare offset vs cursor pagination latency for shallow and deep pages.
+
+Usage (from the ``backend`` directory)::
+
+    python -m benchmarks.bench_pagination --rows 200000 --limit 20 --page 10000
+"""
+
+import argparse
+
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+from benchmarks.common import make_engine, measure, seed_tasks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--page", type=int, default=10_000)
+    parser.add_argument("--url", default="sqlite:///./bench.db")
+    args = parser.parse_args()
+
+    engine = make_engine(args.url)
+    seed_tasks(engine, args.rows)
+    db = sessionmaker(bind=engine)()
+
+    deep_skip = (args.page - 1) * args.limit
+    # The cursor for page N points at the last row of page N - 1
+    before_deep, _ = crud.get_all_tasks(db, skip=deep_skip - 1, limit=1)
+    deep_cursor = crud.encode_cursor(before_deep[0])
+
+    results = {
+        "offset page 1": measure(lambda: crud.get_all_tasks(db, limit=args.limit)),
+        f"offset page {args.page}": measure(
+            lambda: crud.get_all_tasks(db, skip=deep_skip, limit=args.limit)
+        ),
+        "cursor page 1": measure(lambda: crud.get_all_tasks(db, limit=args.limit)),
+        f"cursor page {args.page}": measure(
+            lambda: crud.get_all_tasks(db, cursor=deep_cursor, limit=args.limit)
+        ),
+    }
+    print(f"{args.rows} rows, limit={args.limit}")
+    for name, ms in results.items():
+        print(f"  {name:<22} {ms:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Compare full-text task search against a ``LIKE '%term%'`` scan.
+
+Seeds the tasks table and times one page of results for a few queries,
+once through the FTS5 index (``crud.get_task_rows(q=...)``) and once with
+the equivalent substring scan over title and description.
+
+Usage (from the ``backend`` directory)::
+
+    python -m benchmarks.bench_search --rows 1000000
+"""
+
+import argparse
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+from app.models import Task
+from benchmarks.common import make_engine, measure, seed_tasks
+
+# (label, FTS query, substrings that must all appear)
+QUERIES = [
+    ("rare word", "bundle 1234", ["Bundle 1234 "]),
+    ("prefix", "bund* 99*", ["Bundle 99"]),
+    ("common word", "hearing", ["hearing"]),
+]
+
+
+def like_rows(db, terms: list[str], limit: int):
+    statement = select(*Task.__table__.columns)
+    for term in terms:
+        pattern = f"%{term}%"
+        statement = statement.where(
+            or_(Task.title.like(pattern), Task.description.like(pattern))
+        )
+    return db.execute(statement.order_by(Task.id.desc()).limit(limit)).all()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--url", default="sqlite:///./bench.db")
+    args = parser.parse_args()
+
+    engine = make_engine(args.url)
+    seed_tasks(engine, args.rows)
+    db = sessionmaker(bind=engine)()
+
+    print(f"{args.rows} rows, page of {args.limit}")
+    for label, q, terms in QUERIES:
+        fts_ms = measure(
+            lambda: crud.get_task_rows(
+                db, q=q, limit=args.limit, include_total=False
+            ),
+            args.repeat,
+        )
+        like_ms = measure(lambda: like_rows(db, terms, args.limit), args.repeat)
+        print(
+            f"{label:<12} fts {fts_ms:8.2f} ms   like {like_ms:8.2f} ms   "
+            f"{like_ms / fts_ms:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
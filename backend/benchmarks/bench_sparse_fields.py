@@ -0,0 +1,78 @@
+"""Compare full and sparse (``fields=``) GET /api/tasks responses.
+
+Seeds tasks whose descriptions are ``--description-chars`` long (the
+schema allows up to 2000) and fetches pages of ``--limit`` tasks through the
+ASGI app, once with every field and once with only the board's columns.
+Reports bytes per response and rows/sec.
+
+Usage (from the ``backend`` directory)::
+
+    python -m benchmarks.bench_sparse_fields --limit 500 --description-chars 1000
+"""
+
+import argparse
+import statistics
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from app.cache import task_cache
+from app.database import get_read_db, get_write_db
+from app.main import app
+from app.models import Task
+from benchmarks.common import generate_rows, make_engine, sample
+
+BOARD_FIELDS = "title,status,due_date"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--description-chars", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--url", default="sqlite:///./bench.db")
+    args = parser.parse_args()
+
+    engine = make_engine(args.url)
+    rows = list(generate_rows(args.rows))
+    for row in rows:
+        row["description"] = (row["description"] + " ") * (
+            args.description_chars // (len(row["description"]) + 1) + 1
+        )
+        row["description"] = row["description"][: args.description_chars]
+    with engine.begin() as conn:
+        conn.execute(insert(Task), rows)
+    make_session = sessionmaker(bind=engine)
+
+    def _override_get_db():
+        with make_session() as db:
+            yield db
+
+    task_cache.clear()
+    app.dependency_overrides[get_read_db] = _override_get_db
+    app.dependency_overrides[get_write_db] = _override_get_db
+    try:
+        with TestClient(app) as client:
+            print(f"limit={args.limit} description={args.description_chars} chars")
+            for label, query in (
+                ("all fields", ""),
+                (f"fields={BOARD_FIELDS}", f"&fields={BOARD_FIELDS}"),
+            ):
+                url = f"/api/tasks?limit={args.limit}&include_total=false{query}"
+                size = len(client.get(url).content)
+                median = statistics.median(
+                    sample(lambda: client.get(url), args.repeat)
+                )
+                print(
+                    f"  {label:<34} {size:>9} bytes  {median:8.2f} ms  "
+                    f"{args.limit / (median / 1000):10.0f} rows/s"
+                )
+    finally:
+        app.dependency_overrides.clear()
+        task_cache.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Compare write throughput across the SQLite PRAGMA profiles.
+
+For each profile this runs single-row ``crud.create_task`` commits from
+several writer threads while reader threads list tasks, and reports
+commits/sec plus the number of ``database is locked`` errors.
+
+Usage (from the ``backend`` directory)::
+
+    python -m benchmarks.bench_sqlite_tuning --writes 2000 --writers 4 --readers 4
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+from app.database import SQLITE_PROFILES, Base, apply_sqlite_pragmas, sqlite_pragmas
+from app.schemas import TaskCreate
+
+TASK = TaskCreate(
+    title="Benchmark task", due_date=datetime(2030, 1, 1, tzinfo=timezone.utc)
+)
+
+
+def run_profile(profile: str, writes: int, writers: int, readers: int) -> dict:
+    path = os.path.join(tempfile.mkdtemp(), f"{profile}.db")
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        pool_size=writers + readers,
+    )
+    apply_sqlite_pragmas(engine, sqlite_pragmas(profile))
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    errors = {"locked": 0}
+    done = threading.Event()
+
+    def writer(count: int) -> None:
+        with Session() as db:
+            for _ in range(count):
+                try:
+                    crud.create_task(db, TASK)
+                except OperationalError:
+                    db.rollback()
+                    errors["locked"] += 1
+
+    def reader() -> None:
+        with Session() as db:
+            while not done.is_set():
+                try:
+                    crud.get_all_tasks(db, limit=50)
+                    db.rollback()
+                except OperationalError:
+                    db.rollback()
+                    errors["locked"] += 1
+
+    read_threads = [threading.Thread(target=reader) for _ in range(readers)]
+    write_threads = [
+        threading.Thread(target=writer, args=(writes // writers,))
+        for _ in range(writers)
+    ]
+    started = time.perf_counter()
+    for thread in read_threads + write_threads:
+        thread.start()
+    for thread in write_threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    done.set()
+    for thread in read_threads:
+        thread.join()
+    engine.dispose()
+    return {"commits_per_sec": writes / elapsed, "locked_errors": errors["locked"]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writes", type=int, default=2000)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--profiles", nargs="+", default=list(SQLITE_PROFILES))
+    args = parser.parse_args()
+
+    for profile in args.profiles:
+        result = run_profile(profile, args.writes, args.writers, args.readers)
+        print(
+            f"{profile:<11} {result['commits_per_sec']:9.1f} commits/s  "
+            f"locked errors={result['locked_errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Shared helpers for the backend benchmarks."""
+
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.engine import Engine
+
+from app.database import Base
+from app.models import Task, TaskStatus
+
+SEED_EPOCH = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+
+def make_engine(url: str = "sqlite:///./bench.db") -> Engine:
+    """Create an engine for benchmarking with a fresh schema."""
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def generate_rows(count: int, seed: int = 42, start: int = 0):
+    """Yield ``count`` deterministic task rows for the given seed."""
+    rng = random.Random(seed + start)
+    statuses = list(TaskStatus)
+    for i in range(start, start + count):
+        created = SEED_EPOCH + timedelta(seconds=i)
+        yield {
+            "title": f"Review case file #{i:07d}",
+            "description": f"Bundle {rng.randrange(10_000)} for hearing {i}.",
+            "status": rng.choice(statuses),
+            "due_date": created + timedelta(days=rng.randrange(1, 90)),
+            "created_at": created,
+            "updated_at": created,
+        }
+
+
+def seed_tasks(
+    engine: Engine, count: int, seed: int = 42, batch: int = 10_000, start: int = 0
+) -> None:
+    """Insert ``count`` deterministic tasks (numbered from ``start``) in batches."""
+    for offset in range(start, start + count, batch):
+        size = min(batch, start + count - offset)
+        rows = list(generate_rows(size, seed=seed, start=offset))
+        with engine.begin() as conn:
+            conn.execute(insert(Task), rows)
+
+
+def sample(fn: Callable[[], object], repeat: int = 20) -> list[float]:
+    """Return the wall time of each of ``repeat`` calls of ``fn`` in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def measure(fn: Callable[[], object], repeat: int = 20) -> float:
+    """Return the median wall time of ``fn`` in milliseconds."""
+    return statistics.median(sample(fn, repeat))
+
+
+def summarize(timings: list[float]) -> dict[str, float]:
+    """Return p50/p95/p99 latency (ms) and throughput for a list of timings."""
+    cuts = statistics.quantiles(timings, n=100, method="inclusive")
+    return {
+        "p50_ms": round(statistics.median(timings), 4),
+        "p95_ms": round(cuts[94], 4),
+        "p99_ms": round(cuts[98], 4),
+        "ops_per_sec": round(len(timings) / (sum(timings) / 1000), 1),
+    }
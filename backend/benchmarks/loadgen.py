@@ -0,0 +1,389 @@
+"""Open-loop HTTP load generator for capacity planning.
+
+Sends a weighted mix of API operations at a target arrival rate, ramping up
+linearly at the start, against a uvicorn-served ``app.main:app``. Arrivals
+are scheduled independently of responses (open loop), and latency is
+measured from each request's scheduled start, so a saturated server shows
+up as growing latency and errors rather than a silently lower send rate.
+Several ``--rate`` values run as consecutive stages, which makes the
+saturation point of a worker/threadpool configuration easy to spot.
+
+Usage (from the ``backend`` directory)::
+
+    # Against a server you started, e.g. uvicorn app.main:app --workers 4
+    python -m benchmarks.loadgen --rate 100 200 400 --duration 30 \\
+        --mix list=70,get=20,patch_status=8,create=2
+
+    # Or let the tool start uvicorn on a freshly seeded database
+    python -m benchmarks.loadgen --spawn --rows 100000 --uvicorn-arg=--workers=4
+"""
+
+import argparse
+import asyncio
+import bisect
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import httpx
+
+from benchmarks.common import make_engine, seed_tasks
+
+# Upper bounds (ms) of the latency histogram buckets; the last is open-ended
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float("inf"))
+DEFAULT_MIX = "list=70,get=20,patch_status=8,create=2"
+STATUSES = ("todo", "in_progress", "completed")
+
+
+class RouteStats:
+    """Latencies and outcomes of the requests to one route."""
+
+    def __init__(self) -> None:
+        self.latencies: list[float] = []
+        self.errors: dict[str, int] = defaultdict(int)
+
+    def record(self, latency_ms: float, error: str = "") -> None:
+        self.latencies.append(latency_ms)
+        if error:
+            self.errors[error] += 1
+
+    def histogram(self) -> list[int]:
+        counts = [0] * len(BUCKETS_MS)
+        for latency in self.latencies:
+            counts[bisect.bisect_left(BUCKETS_MS, latency)] += 1
+        return counts
+
+    def summary(self, duration: float) -> dict:
+        count = len(self.latencies)
+        ordered = sorted(self.latencies)
+
+        def pct(p: float) -> float:
+            return round(ordered[min(count - 1, int(p * count))], 3) if count else 0.0
+
+        return {
+            "requests": count,
+            "throughput": round(count / duration, 1),
+            "error_rate": round(sum(self.errors.values()) / count, 4) if count else 0.0,
+            "errors": dict(self.errors),
+            "mean_ms": round(statistics.fmean(ordered), 3) if count else 0.0,
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "p99_ms": pct(0.99),
+            "max_ms": round(ordered[-1], 3) if count else 0.0,
+            "histogram": dict(zip(map(str, BUCKETS_MS), self.histogram())),
+        }
+
+
+def parse_mix(spec: str) -> dict[str, float]:
+    """Parse ``"list=70,get=20"`` into normalized operation weights."""
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in OPERATIONS:
+            raise argparse.ArgumentTypeError(
+                f"unknown operation {name.strip()!r}; choose from {sorted(OPERATIONS)}"
+            )
+        mix[name.strip()] = float(weight or 1)
+    total = sum(mix.values())
+    if total <= 0:
+        raise argparse.ArgumentTypeError("operation weights must add up to more than 0")
+    return {name: weight / total for name, weight in mix.items()}
+
+
+class Workload:
+    """Builds requests for each operation from a pool of known task ids.
+
+    Operations on an existing task return ``None`` once deletes have emptied
+    the pool; the stage counts those as skipped instead of sending them.
+    """
+
+    def __init__(self, ids: list[int], rng: random.Random) -> None:
+        self.ids = ids
+        self.rng = rng
+
+    def task_id(self) -> Optional[int]:
+        return self.rng.choice(self.ids) if self.ids else None
+
+    def list_tasks(self):
+        status = self.rng.choice(("", "", "&status=todo", "&status=completed"))
+        return "GET /api/tasks", "GET", f"/api/tasks?limit=20{status}", None
+
+    def get_task(self):
+        task_id = self.task_id()
+        if task_id is None:
+            return None
+        return "GET /api/tasks/{id}", "GET", f"/api/tasks/{task_id}", None
+
+    def patch_status(self):
+        task_id = self.task_id()
+        if task_id is None:
+            return None
+        return (
+            "PATCH /api/tasks/{id}/status",
+            "PATCH",
+            f"/api/tasks/{task_id}/status",
+            {"status": self.rng.choice(STATUSES)},
+        )
+
+    def update_task(self):
+        task_id = self.task_id()
+        if task_id is None:
+            return None
+        return (
+            "PUT /api/tasks/{id}",
+            "PUT",
+            f"/api/tasks/{task_id}",
+            {"title": f"Load test update {self.rng.randrange(10**6)}"},
+        )
+
+    def create_task(self):
+        due = datetime.now(timezone.utc) + timedelta(days=self.rng.randrange(1, 90))
+        body = {"title": "Load test task", "due_date": due.isoformat()}
+        return "POST /api/tasks", "POST", "/api/tasks", body
+
+    def delete_task(self):
+        if not self.ids:
+            return None
+        # Deleted ids leave the pool so later requests don't expect them
+        task_id = self.ids.pop(self.rng.randrange(len(self.ids)))
+        return "DELETE /api/tasks/{id}", "DELETE", f"/api/tasks/{task_id}", None
+
+    def task_stats(self):
+        return "GET /api/tasks/stats", "GET", "/api/tasks/stats", None
+
+
+OPERATIONS = {
+    "list": Workload.list_tasks,
+    "get": Workload.get_task,
+    "patch_status": Workload.patch_status,
+    "update": Workload.update_task,
+    "create": Workload.create_task,
+    "delete": Workload.delete_task,
+    "stats": Workload.task_stats,
+}
+
+
+async def _send(client, workload, request, scheduled, stats) -> None:
+    route, method, url, body = request
+    error = ""
+    try:
+        response = await client.request(method, url, json=body)
+        if response.status_code >= 400:
+            error = str(response.status_code)
+        elif method == "POST":
+            workload.ids.append(response.json()["id"])
+    except httpx.HTTPError as exc:
+        error = type(exc).__name__
+    stats[route].record((time.perf_counter() - scheduled) * 1000, error)
+
+
+async def run_stage(
+    client: httpx.AsyncClient,
+    workload: Workload,
+    mix: dict[str, float],
+    rate: float,
+    duration: float,
+    ramp_up: float,
+    max_in_flight: int,
+) -> dict:
+    """Offer ``rate`` requests/s for ``duration`` seconds and collect stats."""
+    rng = workload.rng
+    names, weights = list(mix), list(mix.values())
+    stats: dict[str, RouteStats] = defaultdict(RouteStats)
+    in_flight: set[asyncio.Task] = set()
+    dropped = skipped = 0
+    started = time.perf_counter()
+    elapsed = 0.0
+    while True:
+        # Poisson arrivals; during ramp-up the rate grows linearly to ``rate``
+        ramp = min(1.0, elapsed / ramp_up) if ramp_up else 1.0
+        current = rate * max(0.05, ramp)
+        elapsed += rng.expovariate(current)
+        if elapsed >= duration:
+            break
+        scheduled = started + elapsed
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(in_flight) >= max_in_flight:
+            dropped += 1
+            continue
+        request = OPERATIONS[rng.choices(names, weights)[0]](workload)
+        if request is None:
+            # No task ids left to act on
+            skipped += 1
+            continue
+        task = asyncio.create_task(_send(client, workload, request, scheduled, stats))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+    if in_flight:
+        await asyncio.wait(in_flight)
+    # Completions over wall time (including the drain of in-flight requests),
+    # so a saturated server shows throughput falling behind the offered rate
+    wall = time.perf_counter() - started
+    routes = {route: s.summary(wall) for route, s in sorted(stats.items())}
+    total = sum(r["requests"] for r in routes.values())
+    errors = sum(sum(r["errors"].values()) for r in routes.values())
+    return {
+        "offered_rate": rate,
+        "duration": duration,
+        "ramp_up": ramp_up,
+        "wall_time": round(wall, 2),
+        "requests": total,
+        "throughput": round(total / wall, 1),
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "dropped": dropped,
+        "skipped": skipped,
+        "routes": routes,
+    }
+
+
+async def discover_ids(client: httpx.AsyncClient, limit: int) -> list[int]:
+    """Collect up to ``limit`` existing task ids by walking the list cursor."""
+    ids: list[int] = []
+    cursor = ""
+    while len(ids) < limit:
+        response = await client.get(
+            f"/api/tasks?limit=500&include_total=false{cursor}"
+        )
+        response.raise_for_status()
+        page = response.json()
+        ids.extend(task["id"] for task in page["tasks"])
+        if not page["next_cursor"]:
+            break
+        cursor = f"&cursor={page['next_cursor']}"
+    return ids[:limit]
+
+
+def print_stage(result: dict) -> None:
+    print(
+        f"\noffered {result['offered_rate']:.0f} req/s -> achieved "
+        f"{result['throughput']:.1f} req/s, errors {result['error_rate']:.2%}, "
+        f"dropped {result['dropped']}, skipped {result['skipped']}"
+    )
+    print(
+        f"  {'route':<30} {'req/s':>8} {'err%':>6} {'p50':>8} {'p95':>8} "
+        f"{'p99':>8} {'max':>8}"
+    )
+    for route, r in result["routes"].items():
+        print(
+            f"  {route:<30} {r['throughput']:8.1f} {r['error_rate']:6.2%} "
+            f"{r['p50_ms']:8.1f} {r['p95_ms']:8.1f} {r['p99_ms']:8.1f} "
+            f"{r['max_ms']:8.1f}"
+        )
+        histogram = r["histogram"]
+        peak = max(histogram.values()) or 1
+        for bound, count in histogram.items():
+            if count:
+                label = f"<= {bound} ms" if bound != "inf" else "> 5000 ms"
+                print(f"      {label:>12} {count:7d} {'#' * max(1, 40 * count // peak)}")
+
+
+async def run(args, base_url: str, ids: list[int]) -> list[dict]:
+    limits = httpx.Limits(
+        max_connections=args.max_in_flight, max_keepalive_connections=args.max_in_flight
+    )
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        if not ids:
+            ids = await discover_ids(client, args.id_pool)
+        if not ids:
+            raise SystemExit("No tasks to target; seed the database or use --spawn")
+        workload = Workload(ids, random.Random(args.seed))
+        results = []
+        for i, rate in enumerate(args.rate):
+            result = await run_stage(
+                client,
+                workload,
+                args.mix,
+                rate,
+                args.duration,
+                args.ramp_up if i == 0 else 0.0,
+                args.max_in_flight,
+            )
+            print_stage(result)
+            results.append(result)
+        return results
+
+
+def _wait_for_server(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health").status_code == 200:
+                return
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise RuntimeError("uvicorn did not start in time")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument(
+        "--rate", type=float, nargs="+", default=[50.0], help="Requests/s per stage"
+    )
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per stage")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="Seconds")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX))
+    parser.add_argument("--max-in-flight", type=int, default=1000)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--id-pool", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument(
+        "--spawn",
+        action="store_true",
+        help="Start uvicorn app.main:app on a freshly seeded database",
+    )
+    parser.add_argument("--rows", type=int, default=10_000, help="Tasks to seed")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument(
+        "--uvicorn-arg",
+        action="append",
+        default=[],
+        help="Extra uvicorn argument for --spawn (repeatable)",
+    )
+    args = parser.parse_args()
+
+    server = None
+    ids: list[int] = []
+    base_url = args.base_url
+    if args.spawn:
+        db_path = os.path.join(tempfile.mkdtemp(), "loadgen.db")
+        seed_tasks(make_engine(f"sqlite:///{db_path}"), args.rows, seed=args.seed)
+        ids = list(range(1, args.rows + 1))
+        base_url = f"http://127.0.0.1:{args.port}"
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port",
+             str(args.port), "--log-level", "warning", *args.uvicorn_arg],
+            env={**os.environ, "DATABASE_URL": f"sqlite:///{db_path}"},
+        )
+    try:
+        if server:
+            _wait_for_server(base_url)
+        results = asyncio.run(run(args, base_url, ids))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {"mix": args.mix, "seed": args.seed, "stages": results}, f, indent=2
+            )
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""Reproducible latency benchmarks for the task CRUD layer and the ASGI app.
+
+Seeds the tasks table at each requested size with the deterministic
+generator from ``benchmarks.common`` and measures create, get, list (first
+and deep page, with and without a status filter), update, status update
+and delete, once through ``app.crud`` and once through the ASGI app. Each
+operation reports p50/p95/p99 latency and ops/sec; results are written as
+JSON so runs can be compared, and ``--baseline`` fails the run (exit code
+1) if any operation got slower than the threshold allows.
+
+Usage (from the ``backend`` directory)::
+
+    python -m benchmarks.suite --rows 10000 100000 1000000 --output new.json
+    python -m benchmarks.suite --rows 10000 --baseline old.json --threshold 0.25
+"""
+
+import argparse
+import json
+import platform
+import random
+import sqlite3
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import crud
+from app.cache import task_cache
+from app.database import get_read_db, get_write_db
+from app.main import app
+from app.models import TaskStatus
+from app.schemas import TaskCreate, TaskUpdate, TaskUpdateStatus
+from benchmarks.common import make_engine, sample, seed_tasks, summarize
+
+PAGE = 100
+LATENCY_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def _due_date() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(days=30)
+
+
+def crud_operations(
+    db: Session, rows: int, rng: random.Random, doomed: list[int]
+) -> dict[str, Callable[[], object]]:
+    """Build the benchmarked operations as calls into ``app.crud``."""
+    deep = rows - PAGE
+    statuses = list(TaskStatus)
+    return {
+        "create": lambda: crud.create_task(
+            db, TaskCreate(title="Benchmark task", due_date=_due_date())
+        ),
+        "get": lambda: crud.get_task(db, rng.randint(1, rows)),
+        "list_first": lambda: crud.get_all_tasks(db, limit=PAGE),
+        "list_deep": lambda: crud.get_all_tasks(db, skip=deep, limit=PAGE),
+        "list_filtered_first": lambda: crud.get_all_tasks(
+            db, status=TaskStatus.TODO, limit=PAGE
+        ),
+        "list_filtered_deep": lambda: crud.get_all_tasks(
+            db, status=TaskStatus.TODO, skip=deep // len(statuses), limit=PAGE
+        ),
+        "update": lambda: crud.update_task(
+            db, rng.randint(1, rows), TaskUpdate(title="Updated benchmark task")
+        ),
+        "update_status": lambda: crud.update_task_status(
+            db, rng.randint(1, rows), TaskUpdateStatus(status=rng.choice(statuses))
+        ),
+        "delete": lambda: crud.delete_task(db, doomed.pop()),
+    }
+
+
+def asgi_operations(
+    client: TestClient, rows: int, rng: random.Random, doomed: list[int]
+) -> dict[str, Callable[[], object]]:
+    """Build the benchmarked operations as requests to the ASGI app."""
+    deep = rows - PAGE
+    statuses = [task_status.value for task_status in TaskStatus]
+    payload = {"title": "Benchmark task", "due_date": _due_date().isoformat()}
+    return {
+        "create": lambda: client.post("/api/tasks", json=payload),
+        "get": lambda: client.get(f"/api/tasks/{rng.randint(1, rows)}"),
+        "list_first": lambda: client.get(f"/api/tasks?limit={PAGE}"),
+        "list_deep": lambda: client.get(f"/api/tasks?skip={deep}&limit={PAGE}"),
+        "list_filtered_first": lambda: client.get(
+            f"/api/tasks?status=todo&limit={PAGE}"
+        ),
+        "list_filtered_deep": lambda: client.get(
+            f"/api/tasks?status=todo&skip={deep // len(statuses)}&limit={PAGE}"
+        ),
+        "update": lambda: client.put(
+            f"/api/tasks/{rng.randint(1, rows)}",
+            json={"title": "Updated benchmark task"},
+        ),
+        "update_status": lambda: client.patch(
+            f"/api/tasks/{rng.randint(1, rows)}/status",
+            json={"status": rng.choice(statuses)},
+        ),
+        "delete": lambda: client.delete(f"/api/tasks/{doomed.pop()}"),
+    }
+
+
+def run_operations(
+    operations: dict[str, Callable[[], object]], repeat: int, warmup: int
+) -> dict[str, dict[str, float]]:
+    results = {}
+    for name, operation in operations.items():
+        for _ in range(warmup):
+            operation()
+        results[name] = summarize(sample(operation, repeat))
+    return results
+
+
+def run_size(args, rows: int) -> list[dict]:
+    """Seed a fresh table of ``rows`` tasks and benchmark both layers on it."""
+    engine = make_engine(args.url)
+    seed_tasks(engine, rows, seed=args.seed)
+    make_session = sessionmaker(bind=engine)
+    rng = random.Random(args.seed)
+    # Deletes draw from one shuffled pool so no id is deleted twice
+    doomed = list(range(1, rows + 1))
+    rng.shuffle(doomed)
+
+    results = []
+    with make_session() as db:
+        layer = crud_operations(db, rows, rng, doomed)
+        for op, stats in run_operations(layer, args.repeat, args.warmup).items():
+            results.append({"rows": rows, "layer": "crud", "op": op, **stats})
+
+    def _override_get_db():
+        with make_session() as db:
+            yield db
+
+    task_cache.clear()
+    app.dependency_overrides[get_read_db] = _override_get_db
+    app.dependency_overrides[get_write_db] = _override_get_db
+    try:
+        with TestClient(app) as client:
+            layer = asgi_operations(client, rows, rng, doomed)
+            for op, stats in run_operations(layer, args.repeat, args.warmup).items():
+                results.append({"rows": rows, "layer": "asgi", "op": op, **stats})
+    finally:
+        app.dependency_overrides.clear()
+        task_cache.clear()
+    engine.dispose()
+    return results
+
+
+def find_regressions(
+    results: list[dict], baseline: list[dict], metric: str, threshold: float
+) -> list[str]:
+    """Describe every result whose ``metric`` exceeds the baseline by ``threshold``."""
+    previous = {(r["rows"], r["layer"], r["op"]): r for r in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get((result["rows"], result["layer"], result["op"]))
+        if before is None:
+            continue
+        limit = before[metric] * (1 + threshold)
+        if result[metric] > limit:
+            regressions.append(
+                f"{result['layer']}.{result['op']} @ {result['rows']} rows: "
+                f"{metric} {result[metric]:.3f} ms > {limit:.3f} ms "
+                f"(baseline {before[metric]:.3f} ms)"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--url", default="sqlite:///./bench.db")
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline", help="Results JSON from an earlier run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown against the baseline (0.25 = 25%%)",
+    )
+    parser.add_argument("--metric", default="p95_ms", choices=LATENCY_METRICS)
+    args = parser.parse_args()
+
+    results = []
+    for rows in args.rows:
+        size_results = run_size(args, rows)
+        results.extend(size_results)
+        print(f"\n{rows} rows")
+        print(f"  {'operation':<26} {'p50':>9} {'p95':>9} {'p99':>9} {'ops/s':>9}")
+        for r in size_results:
+            print(
+                f"  {r['layer'] + '.' + r['op']:<26} {r['p50_ms']:9.3f} "
+                f"{r['p95_ms']:9.3f} {r['p99_ms']:9.3f} {r['ops_per_sec']:9.1f}"
+            )
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "warmup": args.warmup,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = find_regressions(results, baseline, args.metric, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No {args.metric} regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,14 @@
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from app.database import Base, get_db
+from app.cache import task_cache
+from app.database import Base, get_read_db, get_read_engine, get_write_db
 from app.main import app
+from app.metrics import instrument_engine
 
 # In-memory SQLite for test isolation
 TEST_DATABASE_URL = "sqlite:///:memory:"
@@ -18,12 +20,15 @@ engine = create_engine(
     poolclass=StaticPool,
 )
 
+instrument_engine(engine)
+
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
 @pytest.fixture(autouse=True)
 def setup_database():
     """Create tables before each test and drop after."""
+    task_cache.clear()
     Base.metadata.create_all(bind=engine)
     yield
     Base.metadata.drop_all(bind=engine)
@@ -39,6 +44,19 @@ def db_session():
         session.close()
 
 
+@pytest.fixture()
+def sql_statements():
+    """Record every SQL statement sent to the test database."""
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", _record)
+
+
 @pytest.fixture()
 def client(db_session):
     """Provide a FastAPI test client with a test database."""
@@ -49,7 +67,9 @@ def client(db_session):
         finally:
             pass
 
-    app.dependency_overrides[get_db] = _override_get_db
+    app.dependency_overrides[get_read_db] = _override_get_db
+    app.dependency_overrides[get_write_db] = _override_get_db
+    app.dependency_overrides[get_read_engine] = lambda: engine
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
@@ -1,5 +1,13 @@
 """Integration tests for the Task Management API endpoints — TDD style."""
 
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+from app import crud
+from app.cache import task_cache
+from app.models import Task
+
 
 class TestHealthCheck:
     """Tests for the health endpoint."""
@@ -130,6 +138,30 @@ class TestGetAllTasks:
         assert data["total"] == 5
         assert len(data["tasks"]) == 2
 
+    def test_get_all_tasks_cursor_pagination(self, client, sample_task_data):
+        for i in range(3):
+            client.post(
+                "/api/tasks", json={**sample_task_data, "title": f"Task {i}"}
+            )
+        first = client.get("/api/tasks?limit=2").json()
+        assert first["next_cursor"]
+        second = client.get(
+            f"/api/tasks?limit=2&cursor={first['next_cursor']}"
+        ).json()
+        assert len(second["tasks"]) == 1
+        assert second["next_cursor"] is None
+        ids = [t["id"] for t in first["tasks"] + second["tasks"]]
+        assert len(set(ids)) == 3
+
+    def test_get_all_tasks_without_total(self, client, created_task):
+        data = client.get("/api/tasks?include_total=false").json()
+        assert data["total"] is None
+        assert len(data["tasks"]) == 1
+
+    def test_get_all_tasks_invalid_cursor_returns_400(self, client):
+        response = client.get("/api/tasks?cursor=garbage")
+        assert response.status_code == 400
+
 
 class TestUpdateTaskStatus:
     """Tests for PATCH /api/tasks/{task_id}/status."""
@@ -197,3 +229,467 @@ class TestDeleteTask:
     def test_delete_task_not_found(self, client):
         response = client.delete("/api/tasks/99999")
         assert response.status_code == 404
+
+
+class TestBulkCreateTasks:
+    """Tests for POST /api/tasks/bulk."""
+
+    def test_bulk_create_json_array(self, client, sample_task_data):
+        payload = [{**sample_task_data, "title": f"Bulk {i}"} for i in range(3)]
+        response = client.post("/api/tasks/bulk", json=payload)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["created"] == 3
+        assert data["failed"] == 0
+        assert [r["index"] for r in data["results"]] == [0, 1, 2]
+        assert client.get("/api/tasks").json()["total"] == 3
+
+    def test_bulk_create_ndjson_with_partial_failure(self, client, sample_task_data):
+        lines = [
+            json.dumps(sample_task_data),
+            json.dumps({**sample_task_data, "title": ""}),
+            json.dumps({**sample_task_data, "title": "Second"}),
+        ]
+        response = client.post(
+            "/api/tasks/bulk",
+            content="\n".join(lines),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        data = response.json()
+        assert data["created"] == 2
+        assert data["failed"] == 1
+        assert data["results"][1]["id"] is None
+        assert data["results"][1]["errors"][0]["loc"] == ["title"]
+
+    def test_bulk_create_reports_every_error_per_item(self, client, sample_task_data):
+        payload = [
+            {"description": "no title or due date"},
+            sample_task_data,
+            "not an object",
+        ]
+        data = client.post("/api/tasks/bulk", json=payload).json()
+        assert [r["id"] is not None for r in data["results"]] == [False, True, False]
+        assert sorted(e["loc"] for e in data["results"][0]["errors"]) == [
+            ["due_date"],
+            ["title"],
+        ]
+        assert data["results"][2]["errors"][0]["loc"] == []
+
+    def test_bulk_create_malformed_body_returns_400(self, client):
+        response = client.post(
+            "/api/tasks/bulk",
+            content="{not json",
+            headers={"Content-Type": "application/json"},
+        )
+        assert response.status_code == 400
+
+
+class TestBulkUpdateTaskStatus:
+    """Tests for PATCH /api/tasks/bulk/status."""
+
+    def test_bulk_status_by_ids(self, client, sample_task_data):
+        ids = [
+            client.post("/api/tasks", json=sample_task_data).json()["id"]
+            for _ in range(3)
+        ]
+        response = client.patch(
+            "/api/tasks/bulk/status", json={"status": "completed", "ids": ids[:2]}
+        )
+        assert response.status_code == 200
+        assert response.json() == {"updated": 2, "ids": ids[:2]}
+        assert client.get("/api/tasks?status=completed").json()["total"] == 2
+
+    def test_bulk_status_by_filter(self, client, sample_task_data):
+        client.post("/api/tasks", json={**sample_task_data, "status": "in_progress"})
+        client.post(
+            "/api/tasks",
+            json={
+                **sample_task_data,
+                "status": "in_progress",
+                "due_date": "2031-01-01T10:00:00Z",
+            },
+        )
+        client.post("/api/tasks", json=sample_task_data)
+        response = client.patch(
+            "/api/tasks/bulk/status",
+            json={
+                "status": "completed",
+                "filter": {
+                    "status": "in_progress",
+                    "due_before": "2030-12-31T00:00:00Z",
+                },
+            },
+        )
+        assert response.json()["updated"] == 1
+        assert client.get("/api/tasks?status=in_progress").json()["total"] == 1
+
+    def test_bulk_status_requires_ids_or_filter(self, client):
+        response = client.patch("/api/tasks/bulk/status", json={"status": "completed"})
+        assert response.status_code == 422
+
+    def test_bulk_status_rejects_empty_filter(self, client):
+        response = client.patch(
+            "/api/tasks/bulk/status", json={"status": "completed", "filter": {}}
+        )
+        assert response.status_code == 422
+
+
+class TestStatementCounts:
+    """Each single-task mutation must cost exactly one SQL statement."""
+
+    def test_update_status_is_one_statement(
+        self, client, created_task, sql_statements
+    ):
+        sql_statements.clear()
+        client.patch(
+            f"/api/tasks/{created_task['id']}/status", json={"status": "completed"}
+        )
+        assert len(sql_statements) == 1
+
+    def test_update_is_one_statement(self, client, created_task, sql_statements):
+        sql_statements.clear()
+        client.put(f"/api/tasks/{created_task['id']}", json={"title": "Renamed"})
+        assert len(sql_statements) == 1
+
+    def test_delete_is_one_statement(self, client, created_task, sql_statements):
+        sql_statements.clear()
+        client.delete(f"/api/tasks/{created_task['id']}")
+        assert len(sql_statements) == 1
+
+    def test_missing_task_is_one_statement(self, client, sql_statements):
+        assert client.delete("/api/tasks/99999").status_code == 404
+        assert len(sql_statements) == 1
+
+
+class TestExportTasks:
+    """Tests for GET /api/tasks/export."""
+
+    def test_export_ndjson(self, client, sample_task_data):
+        for i in range(3):
+            client.post("/api/tasks", json={**sample_task_data, "title": f"Task {i}"})
+        response = client.get("/api/tasks/export")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["title"] for line in lines] == ["Task 0", "Task 1", "Task 2"]
+
+    def test_export_csv_with_filters(self, client, sample_task_data):
+        client.post("/api/tasks", json=sample_task_data)
+        client.post(
+            "/api/tasks",
+            json={
+                **sample_task_data,
+                "title": "Later",
+                "due_date": "2031-01-01T10:00:00Z",
+            },
+        )
+        response = client.get(
+            "/api/tasks/export?format=csv&due_after=2030-06-01T00:00:00Z"
+        )
+        assert response.headers["content-type"].startswith("text/csv")
+        header, *rows = response.text.strip().splitlines()
+        assert header.startswith("id,title,description,status")
+        assert len(rows) == 1
+        assert rows[0].split(",")[1] == "Later"
+
+    def test_export_invalid_format_returns_422(self, client):
+        assert client.get("/api/tasks/export?format=xml").status_code == 422
+
+
+class TestConditionalGet:
+    """Tests for ETag / If-None-Match support."""
+
+    def test_list_returns_304_until_data_changes(
+        self, client, sample_task_data, sql_statements
+    ):
+        client.post("/api/tasks", json=sample_task_data)
+        first = client.get("/api/tasks?limit=10")
+        etag = first.headers["etag"]
+
+        sql_statements.clear()
+        cached = client.get("/api/tasks?limit=10", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.headers["etag"] == etag
+        assert len(sql_statements) == 1  # the version lookup only
+
+        client.post("/api/tasks", json=sample_task_data)
+        fresh = client.get("/api/tasks?limit=10", headers={"If-None-Match": etag})
+        assert fresh.status_code == 200
+        assert fresh.json()["total"] == 2
+
+    def test_etag_differs_per_filter(self, client, created_task):
+        all_tasks = client.get("/api/tasks").headers["etag"]
+        todo = client.get("/api/tasks?status=todo").headers["etag"]
+        assert all_tasks != todo
+
+    def test_get_task_etag(self, client, created_task):
+        url = f"/api/tasks/{created_task['id']}"
+        etag = client.get(url).headers["etag"]
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+        client.patch(f"{url}/status", json={"status": "completed"})
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+
+
+class TestTaskCache:
+    """Tests for the read-through cache on GET /api/tasks/{task_id}."""
+
+    def test_repeat_get_served_from_cache(self, client, created_task, sql_statements):
+        url = f"/api/tasks/{created_task['id']}"
+        first = client.get(url)
+        sql_statements.clear()
+        second = client.get(url)
+        assert second.json() == first.json()
+        assert len(sql_statements) == 2  # the version and the row stamp
+
+    def test_write_to_another_task_keeps_entry(
+        self, client, created_task, sample_task_data
+    ):
+        url = f"/api/tasks/{created_task['id']}"
+        client.get(url)
+        client.post("/api/tasks", json=sample_task_data)
+        hits = task_cache.stats()["hits"]
+        client.get(url)
+        assert task_cache.stats()["hits"] == hits + 1
+
+    def test_update_invalidates_cached_task(self, client, created_task):
+        url = f"/api/tasks/{created_task['id']}"
+        client.get(url)
+        client.put(url, json={"title": "Renamed"})
+        assert client.get(url).json()["title"] == "Renamed"
+
+    def test_write_from_another_worker_is_seen(
+        self, client, created_task, db_session
+    ):
+        url = f"/api/tasks/{created_task['id']}"
+        client.get(url)
+        # Bypass crud so this process never invalidates the entry
+        task = db_session.get(Task, created_task["id"])
+        task.title = "Elsewhere"
+        db_session.commit()
+        assert client.get(url).json()["title"] == "Elsewhere"
+
+    def test_delete_invalidates_cached_task(self, client, created_task):
+        url = f"/api/tasks/{created_task['id']}"
+        client.get(url)
+        client.delete(url)
+        assert client.get(url).status_code == 404
+
+
+class TestChangeFeed:
+    """Tests for GET /api/tasks/changes."""
+
+    def test_feed_reports_creates_updates_and_deletes(
+        self, client, sample_task_data
+    ):
+        start = client.get("/api/tasks/changes").json()["last_seq"]
+        task_id = client.post("/api/tasks", json=sample_task_data).json()["id"]
+        client.patch(f"/api/tasks/{task_id}/status", json={"status": "completed"})
+        client.delete(f"/api/tasks/{task_id}")
+
+        feed = client.get(f"/api/tasks/changes?since={start}").json()
+        assert [c["op"] for c in feed["changes"]] == ["upsert", "upsert", "delete"]
+        assert all(c["task_id"] == task_id for c in feed["changes"])
+        assert feed["changes"][-1]["task"] is None
+        assert feed["last_seq"] == feed["changes"][-1]["seq"]
+        assert feed["has_more"] is False
+
+    def test_feed_only_returns_later_changes(self, client, sample_task_data):
+        client.post("/api/tasks", json=sample_task_data)
+        since = client.get("/api/tasks/changes").json()["last_seq"]
+        second = client.post("/api/tasks", json=sample_task_data).json()
+
+        feed = client.get(f"/api/tasks/changes?since={since}").json()
+        assert [c["task_id"] for c in feed["changes"]] == [second["id"]]
+        assert feed["changes"][0]["task"]["title"] == sample_task_data["title"]
+
+    def test_long_poll_times_out_empty(self, client):
+        since = client.get("/api/tasks/changes").json()["last_seq"]
+        feed = client.get(f"/api/tasks/changes?since={since}&wait=0.1").json()
+        assert feed == {"changes": [], "last_seq": since, "has_more": False}
+
+    def test_event_stream(self, client, created_task):
+        response = client.get(
+            "/api/tasks/changes?since=0",
+            headers={"Accept": "text/event-stream"},
+        )
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert "event: upsert\ndata: " in response.text
+        assert f'"task_id":{created_task["id"]}' in response.text
+
+    def test_compacted_since_returns_410(self, client, db_session, created_task):
+        client.delete(f"/api/tasks/{created_task['id']}")
+        crud.compact_task_changes(db_session, tombstone_ttl=timedelta(seconds=-1))
+        assert client.get("/api/tasks/changes?since=0").status_code == 410
+
+
+class TestSearchTasks:
+    """Tests for full-text search on GET /api/tasks."""
+
+    def test_search_ranks_matches(self, client, sample_task_data):
+        client.post("/api/tasks", json={**sample_task_data, "title": "Report"})
+        client.post(
+            "/api/tasks",
+            json={**sample_task_data, "title": "Report report", "description": None},
+        )
+        client.post("/api/tasks", json={**sample_task_data, "title": "Other"})
+
+        data = client.get("/api/tasks?q=report&limit=2").json()
+        assert [t["title"] for t in data["tasks"]] == ["Report report", "Report"]
+        assert data["total"] == 2
+        assert data["next_cursor"] is None
+
+    def test_search_with_cursor_returns_400(self, client, created_task):
+        cursor = client.get("/api/tasks?limit=1").json()["next_cursor"]
+        response = client.get(f"/api/tasks?q=test&cursor={cursor}")
+        assert response.status_code == 400
+
+
+class TestDueDateFilters:
+    """Tests for due-date filtering on GET /api/tasks."""
+
+    def test_due_range(self, client, sample_task_data):
+        client.post("/api/tasks", json=sample_task_data)
+        client.post(
+            "/api/tasks",
+            json={**sample_task_data, "due_date": "2031-03-01T10:00:00Z"},
+        )
+        data = client.get(
+            "/api/tasks?due_after=2031-01-01T00:00:00Z"
+            "&due_before=2032-01-01T00:00:00Z"
+        ).json()
+        assert data["total"] == 1
+        assert data["tasks"][0]["due_date"].startswith("2031-03-01")
+
+    def test_offset_due_date_stored_in_utc(self, client, sample_task_data):
+        created = client.post(
+            "/api/tasks",
+            json={**sample_task_data, "due_date": "2031-01-02T02:00:00+05:00"},
+        ).json()
+        assert created["due_date"].startswith("2031-01-01T21:00")
+        fetched = client.get(f"/api/tasks/{created['id']}").json()
+        assert fetched["due_date"].startswith("2031-01-01T21:00")
+
+    def test_offset_bound_is_compared_in_utc(self, client, sample_task_data):
+        for hour in ("05", "10"):
+            client.post(
+                "/api/tasks",
+                json={**sample_task_data, "due_date": f"2031-01-01T{hour}:00:00Z"},
+            )
+        data = client.get(
+            "/api/tasks", params={"due_before": "2031-01-01T12:00:00+05:00"}
+        ).json()
+        assert data["total"] == 1
+        assert data["tasks"][0]["due_date"].startswith("2031-01-01T05:00")
+
+    def test_overdue_etag_changes_when_a_task_falls_due(self, client, db_session):
+        db_session.add(
+            Task(
+                title="Due shortly",
+                due_date=datetime.now(timezone.utc) + timedelta(seconds=0.3),
+            )
+        )
+        db_session.commit()
+        first = client.get("/api/tasks?overdue=true")
+        assert first.json()["tasks"] == []
+
+        time.sleep(0.4)
+        response = client.get(
+            "/api/tasks?overdue=true",
+            headers={"If-None-Match": first.headers["etag"]},
+        )
+        assert response.status_code == 200
+        assert [t["title"] for t in response.json()["tasks"]] == ["Due shortly"]
+
+
+class TestTaskStats:
+    """Tests for GET /api/tasks/stats."""
+
+    def test_stats(self, client, sample_task_data):
+        client.post("/api/tasks", json=sample_task_data)
+        client.post("/api/tasks", json={**sample_task_data, "status": "completed"})
+        response = client.get("/api/tasks/stats?days=7")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 2
+        assert data["by_status"] == {"todo": 1, "in_progress": 0, "completed": 1}
+        assert data["overdue"] == 0
+        assert len(data["due_by_day"]) == 7
+
+    def test_stats_etag(self, client, created_task):
+        etag = client.get("/api/tasks/stats").headers["etag"]
+        cached = client.get("/api/tasks/stats", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+
+        client.delete(f"/api/tasks/{created_task['id']}")
+        fresh = client.get("/api/tasks/stats", headers={"If-None-Match": etag})
+        assert fresh.status_code == 200
+        assert fresh.json()["total"] == 0
+
+
+class TestSparseFields:
+    """Tests for the fields= projection on GET /api/tasks and /api/tasks/{id}."""
+
+    def test_list_returns_only_requested_fields(self, client, created_task):
+        data = client.get("/api/tasks?fields=title,status").json()
+        assert data["tasks"] == [
+            {"id": created_task["id"], "title": created_task["title"], "status": "todo"}
+        ]
+        assert data["total"] == 1
+
+    def test_cursor_works_without_created_at(self, client, sample_task_data):
+        for title in ("First", "Second", "Third"):
+            client.post("/api/tasks", json={**sample_task_data, "title": title})
+        first = client.get("/api/tasks?fields=title&limit=2").json()
+        second = client.get(
+            f"/api/tasks?fields=title&limit=2&cursor={first['next_cursor']}"
+        ).json()
+        titles = [t["title"] for t in first["tasks"] + second["tasks"]]
+        assert titles == ["Third", "Second", "First"]
+
+    def test_get_returns_only_requested_fields(self, client, created_task):
+        response = client.get(f"/api/tasks/{created_task['id']}?fields=due_date")
+        assert response.status_code == 200
+        assert response.json() == {
+            "id": created_task["id"],
+            "due_date": created_task["due_date"],
+        }
+        full = client.get(f"/api/tasks/{created_task['id']}")
+        assert full.json() == created_task
+        assert full.headers["etag"] != response.headers["etag"]
+
+    def test_unknown_field_returns_400(self, client, created_task):
+        assert client.get("/api/tasks?fields=nope").status_code == 400
+        assert (
+            client.get(f"/api/tasks/{created_task['id']}?fields=nope").status_code
+            == 400
+        )
+
+    def test_missing_task_returns_404(self, client):
+        assert client.get("/api/tasks/999?fields=title").status_code == 404
+
+
+class TestIncludeArchived:
+    """Tests for listing archived tasks alongside live ones."""
+
+    def test_archived_task_listed_only_on_request(
+        self, client, db_session, sample_task_data
+    ):
+        done = client.post(
+            "/api/tasks", json={**sample_task_data, "status": "completed"}
+        ).json()
+        client.post("/api/tasks", json=sample_task_data)
+        before = client.get("/api/tasks").headers["etag"]
+        assert crud.archive_completed_tasks(db_session, timedelta(0)) == 1
+
+        response = client.get("/api/tasks")
+        assert response.headers["etag"] != before
+        assert done["id"] not in [t["id"] for t in response.json()["tasks"]]
+
+        data = client.get("/api/tasks?include_archived=true").json()
+        assert data["total"] == 2
+        assert data["tasks"][1] == done
+
+    def test_include_archived_with_search_is_rejected(self, client):
+        response = client.get("/api/tasks?include_archived=true&q=case")
+        assert response.status_code == 400
@@ -0,0 +1,52 @@
+"""Tests for the in-process task payload cache."""
+
+from app.cache import TaskCache
+
+
+class TestTaskCache:
+    """Unit tests for TaskCache."""
+
+    def test_hit_and_miss_counters(self):
+        cache = TaskCache(capacity=10, ttl=60)
+        assert cache.get(1, stamp=1) is None
+        cache.put(1, 1, b"{}")
+        assert cache.get(1, stamp=1) == b"{}"
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_evicts_least_recently_used(self):
+        cache = TaskCache(capacity=2, ttl=60)
+        cache.put(1, 1, b"one")
+        cache.put(2, 1, b"two")
+        cache.get(1, stamp=1)
+        cache.put(3, 1, b"three")
+        assert cache.get(2, stamp=1) is None
+        assert cache.get(1, stamp=1) == b"one"
+        assert cache.stats()["evictions"] == 1
+
+    def test_entries_expire_after_ttl(self):
+        cache = TaskCache(capacity=10, ttl=0)
+        cache.put(1, 1, b"{}")
+        assert cache.get(1, stamp=1) is None
+
+    def test_stamp_change_invalidates_in_version_mode(self):
+        cache = TaskCache(capacity=10, ttl=60, coherence="version")
+        cache.put(1, 1, b"{}")
+        assert cache.needs_stamp(1) and not cache.needs_stamp(2)
+        assert cache.get(1, stamp=2) is None
+
+    def test_missing_row_is_a_miss_in_version_mode(self):
+        cache = TaskCache(capacity=10, ttl=60, coherence="version")
+        cache.put(1, 1, b"{}")
+        assert cache.get(1, stamp=None) is None
+
+    def test_ttl_mode_ignores_stamp(self):
+        cache = TaskCache(capacity=10, ttl=60, coherence="ttl")
+        cache.put(1, 1, b"{}")
+        assert not cache.needs_stamp(1)
+        assert cache.get(1, stamp=2) == b"{}"
+
+    def test_zero_capacity_disables_cache(self):
+        cache = TaskCache(capacity=0, ttl=60)
+        cache.put(1, 1, b"{}")
+        assert cache.get(1, stamp=1) is None
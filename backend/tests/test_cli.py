@@ -0,0 +1,61 @@
+"""Tests for the maintenance commands in app.cli."""
+
+from datetime import datetime
+
+from sqlalchemy import func, select
+
+from app import cli
+from app.models import ArchivedTask, Task, TaskChange, TaskDueStat, TaskStatus
+
+
+def test_rebuild_stats(db_session, monkeypatch, capsys):
+    bind = db_session.get_bind()
+    monkeypatch.setattr(cli, "get_engine", lambda: bind)
+    db_session.add(Task(title="Counted", due_date=datetime(2030, 3, 1, 10, 0)))
+    db_session.commit()
+    db_session.query(TaskDueStat).update({TaskDueStat.count: 3})
+    db_session.commit()
+
+    cli.main(["rebuild-stats"])
+
+    output = capsys.readouterr().out
+    assert "task_due_stats  todo         2030-03-01 +2" in output
+    assert db_session.get(TaskDueStat, (TaskStatus.TODO, "2030-03-01")).count == 1
+
+
+def test_archive(db_session, monkeypatch, capsys):
+    bind = db_session.get_bind()
+    monkeypatch.setattr(cli, "get_engine", lambda: bind)
+    due = datetime(2030, 3, 1, 10, 0)
+    db_session.add_all(
+        [
+            Task(
+                title="Long done",
+                status=TaskStatus.COMPLETED,
+                due_date=due,
+                updated_at=datetime(2020, 1, 1),
+            ),
+            Task(title="Open", due_date=due),
+        ]
+    )
+    db_session.commit()
+
+    cli.main(["archive", "--days", "30"])
+
+    assert "Archived 1 task(s)" in capsys.readouterr().out
+    assert db_session.scalar(select(ArchivedTask.title)) == "Long done"
+
+
+def test_compact_changes(db_session, monkeypatch, capsys):
+    bind = db_session.get_bind()
+    monkeypatch.setattr(cli, "get_engine", lambda: bind)
+    task = Task(title="Edited", due_date=datetime(2030, 3, 1, 10, 0))
+    db_session.add(task)
+    db_session.commit()
+    task.title = "Edited again"
+    db_session.commit()
+
+    cli.main(["compact-changes", "--tombstone-days", "7"])
+
+    assert "Removed 1 change log entries" in capsys.readouterr().out
+    assert db_session.scalar(select(func.count()).select_from(TaskChange)) == 1
@@ -0,0 +1,101 @@
+"""Tests for negotiated response compression."""
+
+import pytest
+
+from app.compression import choose_encoding, compressed_cache
+
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+@pytest.fixture(autouse=True)
+def clear_compressed_cache():
+    compressed_cache.clear()
+    yield
+    compressed_cache.clear()
+
+
+@pytest.fixture()
+def many_tasks(client, sample_task_data):
+    """Enough tasks for the list response to pass the size threshold."""
+    for i in range(20):
+        client.post("/api/tasks", json={**sample_task_data, "title": f"Task {i}"})
+
+
+class TestChooseEncoding:
+    """Tests for Accept-Encoding negotiation."""
+
+    AVAILABLE = ("zstd", "br", "gzip")
+
+    def test_prefers_earlier_codec_on_ties(self):
+        assert choose_encoding("gzip, br", self.AVAILABLE) == "br"
+
+    def test_honours_q_values(self):
+        assert choose_encoding("br;q=0.5, gzip", self.AVAILABLE) == "gzip"
+        assert choose_encoding("gzip;q=0", self.AVAILABLE) is None
+
+    def test_wildcard(self):
+        assert choose_encoding("*", ("gzip",)) == "gzip"
+        assert choose_encoding("*, gzip;q=0", ("gzip",)) is None
+
+    def test_unavailable_codec_means_identity(self):
+        assert choose_encoding("zstd", ("gzip",)) is None
+
+
+class TestCompressionMiddleware:
+    """Tests for compressing API responses."""
+
+    def test_large_list_is_gzipped(self, client, many_tasks):
+        response = client.get("/api/tasks", headers=GZIP)
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert int(response.headers["content-length"]) < len(response.content)
+        assert len(response.json()["tasks"]) == 20
+
+    def test_identity_without_accept_encoding(self, client, many_tasks):
+        response = client.get("/api/tasks", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+        assert len(response.json()["tasks"]) == 20
+
+    def test_small_response_is_not_compressed(self, client):
+        response = client.get("/health", headers=GZIP)
+        assert "content-encoding" not in response.headers
+
+    def test_repeat_page_served_from_cache(self, client, many_tasks):
+        first = client.get("/api/tasks", headers=GZIP)
+        hits = compressed_cache.stats()["hits"]
+        second = client.get("/api/tasks", headers=GZIP)
+        assert compressed_cache.stats()["hits"] == hits + 1
+        assert second.content == first.content
+
+    def test_write_changes_the_cache_key(self, client, many_tasks, sample_task_data):
+        client.get("/api/tasks", headers=GZIP)
+        client.post("/api/tasks", json=sample_task_data)
+        hits = compressed_cache.stats()["hits"]
+        response = client.get("/api/tasks", headers=GZIP)
+        assert compressed_cache.stats()["hits"] == hits
+        assert len(response.json()["tasks"]) == 21
+
+    def test_compressed_variant_has_its_own_etag(self, client, many_tasks):
+        plain = client.get("/api/tasks", headers={"Accept-Encoding": "identity"})
+        gzipped = client.get("/api/tasks", headers=GZIP)
+        assert gzipped.headers["etag"] == plain.headers["etag"][:-1] + '-gzip"'
+
+    def test_either_etag_revalidates(self, client, many_tasks):
+        plain = client.get("/api/tasks", headers={"Accept-Encoding": "identity"})
+        gzip_etag = client.get("/api/tasks", headers=GZIP).headers["etag"]
+        for sent, echoed in (
+            (plain.headers["etag"], plain.headers["etag"]),
+            (gzip_etag, gzip_etag),
+            (f"W/{gzip_etag}", gzip_etag),
+        ):
+            response = client.get("/api/tasks", headers={**GZIP, "If-None-Match": sent})
+            assert response.status_code == 304
+            assert response.headers["etag"] == echoed
+            if echoed == gzip_etag:
+                assert "Accept-Encoding" in response.headers["vary"]
+
+    def test_streaming_export_passes_through(self, client, many_tasks):
+        response = client.get("/api/tasks/export", headers=GZIP)
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+        assert len(response.text.splitlines()) == 20
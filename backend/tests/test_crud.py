@@ -1,9 +1,12 @@
 """Unit tests for task CRUD operations — TDD style."""
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, func, select, update
 
 from app import crud
-from app.models import Task, TaskStatus
+from app.models import ArchivedTask, Task, TaskCounter, TaskDueStat, TaskStatus
 from app.schemas import TaskCreate, TaskUpdate, TaskUpdateStatus
 
 
@@ -134,7 +137,7 @@ class TestUpdateTaskStatus:
             ),
         )
         updated = crud.update_task_status(
-            db_session, task, TaskUpdateStatus(status=TaskStatus.COMPLETED)
+            db_session, task.id, TaskUpdateStatus(status=TaskStatus.COMPLETED)
         )
         assert updated.status == TaskStatus.COMPLETED
 
@@ -147,7 +150,7 @@ class TestUpdateTaskStatus:
             ),
         )
         updated = crud.update_task_status(
-            db_session, task, TaskUpdateStatus(status=TaskStatus.IN_PROGRESS)
+            db_session, task.id, TaskUpdateStatus(status=TaskStatus.IN_PROGRESS)
         )
         assert updated.status == TaskStatus.IN_PROGRESS
 
@@ -155,6 +158,9 @@ class TestUpdateTaskStatus:
 class TestUpdateTask:
     """Tests for updating task fields."""
 
+    def test_update_nonexistent_task_returns_none(self, db_session):
+        assert crud.update_task(db_session, 99999, TaskUpdate(title="Nope")) is None
+
     def test_update_title(self, db_session):
         task = crud.create_task(
             db_session,
@@ -164,7 +170,7 @@ class TestUpdateTask:
             ),
         )
         updated = crud.update_task(
-            db_session, task, TaskUpdate(title="New title")
+            db_session, task.id, TaskUpdate(title="New title")
         )
         assert updated.title == "New title"
 
@@ -179,7 +185,7 @@ class TestUpdateTask:
         new_due = datetime(2030, 6, 1, 10, 0, tzinfo=timezone.utc)
         updated = crud.update_task(
             db_session,
-            task,
+            task.id,
             TaskUpdate(title="Updated", description="Added desc", due_date=new_due),
         )
         assert updated.title == "Updated"
@@ -191,6 +197,9 @@ class TestUpdateTask:
 class TestDeleteTask:
     """Tests for deleting a task."""
 
+    def test_delete_nonexistent_task_returns_false(self, db_session):
+        assert crud.delete_task(db_session, 99999) is False
+
     def test_delete_task(self, db_session):
         task = crud.create_task(
             db_session,
@@ -200,5 +209,599 @@ class TestDeleteTask:
             ),
         )
         task_id = task.id
-        crud.delete_task(db_session, task)
+        assert crud.delete_task(db_session, task.id)
         assert crud.get_task(db_session, task_id) is None
+
+
+class TestCursorPagination:
+    """Tests for keyset (cursor) pagination."""
+
+    def _create_many(self, db_session, count):
+        for i in range(count):
+            crud.create_task(
+                db_session,
+                TaskCreate(
+                    title=f"Task {i}",
+                    due_date=datetime(2030, 3, 1, 10, 0, tzinfo=timezone.utc),
+                ),
+            )
+
+    def test_cursor_walks_every_task_once(self, db_session):
+        self._create_many(db_session, 5)
+        first_page, _ = crud.get_all_tasks(db_session, limit=2)
+        seen = [t.id for t in first_page]
+        cursor = crud.encode_cursor(first_page[-1])
+        while cursor:
+            page, _ = crud.get_all_tasks(db_session, limit=2, cursor=cursor)
+            seen.extend(t.id for t in page)
+            cursor = crud.encode_cursor(page[-1]) if len(page) == 2 else None
+        assert sorted(seen) == sorted(set(seen))
+        assert len(seen) == 5
+
+    def test_cursor_matches_offset_order(self, db_session):
+        self._create_many(db_session, 4)
+        by_offset, _ = crud.get_all_tasks(db_session, skip=2, limit=2)
+        first_page, _ = crud.get_all_tasks(db_session, limit=2)
+        by_cursor, _ = crud.get_all_tasks(
+            db_session, limit=2, cursor=crud.encode_cursor(first_page[-1])
+        )
+        assert [t.id for t in by_cursor] == [t.id for t in by_offset]
+
+    def test_invalid_cursor_raises(self, db_session):
+        with pytest.raises(ValueError):
+            crud.get_all_tasks(db_session, cursor="not-a-cursor")
+
+
+class TestTaskCounters:
+    """Tests for the maintained per-status task counters."""
+
+    def test_counters_follow_every_mutation(self, db_session):
+        due = datetime(2030, 3, 1, 10, 0, tzinfo=timezone.utc)
+        first = crud.create_task(db_session, TaskCreate(title="One", due_date=due))
+        second = crud.create_task(db_session, TaskCreate(title="Two", due_date=due))
+        assert crud.count_tasks(db_session) == 2
+        assert crud.count_tasks(db_session, TaskStatus.TODO) == 2
+
+        crud.update_task_status(
+            db_session, first.id, TaskUpdateStatus(status=TaskStatus.COMPLETED)
+        )
+        crud.update_task(db_session, second.id, TaskUpdate(status=TaskStatus.IN_PROGRESS))
+        assert crud.count_tasks(db_session, TaskStatus.TODO) == 0
+        assert crud.count_tasks(db_session, TaskStatus.IN_PROGRESS) == 1
+        assert crud.count_tasks(db_session, TaskStatus.COMPLETED) == 1
+
+        crud.delete_task(db_session, first.id)
+        assert crud.count_tasks(db_session) == 1
+        assert crud.count_tasks(db_session, TaskStatus.COMPLETED) == 0
+
+    def test_reconcile_repairs_drift(self, db_session):
+        crud.create_task(
+            db_session,
+            TaskCreate(
+                title="Counted",
+                due_date=datetime(2030, 3, 1, 10, 0, tzinfo=timezone.utc),
+            ),
+        )
+        db_session.merge(TaskCounter(status=TaskStatus.TODO, count=7))
+        db_session.commit()
+
+        drift = crud.reconcile_task_counters(db_session)
+        assert drift == {TaskStatus.TODO: 6}
+        assert crud.count_tasks(db_session) == 1
+        assert crud.reconcile_task_counters(db_session) == {}
+
+    def test_get_all_tasks_without_total(self, db_session):
+        tasks, total = crud.get_all_tasks(db_session, include_total=False)
+        assert total is None
+
+
+class TestBulkCreateTasks:
+    """Tests for creating tasks in bulk."""
+
+    def test_bulk_create_returns_ids_in_order(self, db_session):
+        tasks = [
+            TaskCreate(
+                title=f"Bulk {i}",
+                due_date=datetime(2030, 3, 1, 10, 0, tzinfo=timezone.utc),
+            )
+            for i in range(5)
+        ]
+        ids = crud.bulk_create_tasks(db_session, tasks, chunk_size=2)
+        assert len(ids) == 5
+        assert [crud.get_task(db_session, i).title for i in ids] == [
+            f"Bulk {i}" for i in range(5)
+        ]
+        assert crud.count_tasks(db_session, TaskStatus.TODO) == 5
+
+
+class TestBulkUpdateTaskStatus:
+    """Tests for moving many tasks to a new status."""
+
+    def test_bulk_update_skips_tasks_already_in_status(self, db_session):
+        due = datetime(2030, 3, 1, 10, 0, tzinfo=timezone.utc)
+        todo = crud.create_task(db_session, TaskCreate(title="Todo", due_date=due))
+        done = crud.create_task(
+            db_session,
+            TaskCreate(title="Done", status=TaskStatus.COMPLETED, due_date=due),
+        )
+        changed = crud.bulk_update_task_status(
+            db_session, TaskStatus.COMPLETED, ids=[todo.id, done.id]
+        )
+        assert changed == [todo.id]
+        assert crud.count_tasks(db_session, TaskStatus.COMPLETED) == 2
+        assert crud.count_tasks(db_session, TaskStatus.TODO) == 0
+
+
+class TestDataVersion:
+    """Tests for the data version bumped by every write."""
+
+    def test_every_write_bumps_version(self, db_session):
+        start = crud.get_data_version(db_session)
+        task = crud.create_task(
+            db_session,
+            TaskCreate(
+                title="Versioned",
+                due_date=datetime(2030, 3, 1, 10, 0, tzinfo=timezone.utc),
+            ),
+        )
+        after_create = crud.get_data_version(db_session)
+        crud.update_task(db_session, task.id, TaskUpdate(title="Renamed"))
+        after_update = crud.get_data_version(db_session)
+        crud.delete_task(db_session, task.id)
+        after_delete = crud.get_data_version(db_session)
+        assert start < after_create < after_update < after_delete
+
+
+class TestChangeLog:
+    """Tests for the task change log and its compaction."""
+
+    def test_compaction_keeps_latest_entry_per_task(self, db_session):
+        task = crud.create_task(
+            db_session,
+            TaskCreate(
+                title="Logged",
+                due_date=datetime(2030, 3, 1, 10, 0, tzinfo=timezone.utc),
+            ),
+        )
+        crud.update_task(db_session, task.id, TaskUpdate(title="Once"))
+        crud.update_task(db_session, task.id, TaskUpdate(title="Twice"))
+        assert len(crud.get_task_changes(db_session, since=0)) == 3
+
+        removed = crud.compact_task_changes(db_session, timedelta(days=7))
+        changes = crud.get_task_changes(db_session, since=0)
+        assert removed == 2
+        assert len(changes) == 1
+        assert changes[0][1].title == "Twice"
+        assert crud.get_change_horizon(db_session) == 0
+
+    def test_expired_tombstones_advance_horizon(self, db_session):
+        task = crud.create_task(
+            db_session,
+            TaskCreate(
+                title="Gone",
+                due_date=datetime(2030, 3, 1, 10, 0, tzinfo=timezone.utc),
+            ),
+        )
+        crud.delete_task(db_session, task.id)
+        last_seq = crud.get_last_change_seq(db_session)
+
+        crud.compact_task_changes(db_session, timedelta(seconds=-1))
+        assert crud.get_task_changes(db_session, since=0) == []
+        assert crud.get_change_horizon(db_session) == last_seq
+        assert crud.get_last_change_seq(db_session) == last_seq
+
+
+class TestSearch:
+    """Tests for full-text search over title and description."""
+
+    def _create(self, db_session, title, description=None, **kwargs):
+        return crud.create_task(
+            db_session,
+            TaskCreate(
+                title=title,
+                description=description,
+                due_date=datetime(2030, 3, 1, 10, 0, tzinfo=timezone.utc),
+                **kwargs,
+            ),
+        )
+
+    def test_fts_query_quotes_terms(self):
+        assert crud.fts_query('file "report" OR') == '"file" """report""" "OR"'
+        assert crud.fts_query("rep*") == '"rep"*'
+        with pytest.raises(ValueError):
+            crud.fts_query(" * ")
+
+    def test_matches_title_and_description(self, db_session):
+        by_title = self._create(db_session, "Quarterly report")
+        by_description = self._create(db_session, "Paperwork", "Draft the report")
+        self._create(db_session, "Unrelated")
+
+        tasks, total = crud.get_all_tasks(db_session, q="report")
+        assert {t.id for t in tasks} == {by_title.id, by_description.id}
+        assert total == 2
+
+    def test_prefix_and_status_filter(self, db_session):
+        done = self._create(db_session, "Reporting", status=TaskStatus.COMPLETED)
+        self._create(db_session, "Reports")
+
+        tasks, total = crud.get_all_tasks(
+            db_session, q="rep*", status=TaskStatus.COMPLETED
+        )
+        assert [t.id for t in tasks] == [done.id]
+        assert total == 1
+
+    def test_index_follows_updates_and_deletes(self, db_session):
+        task = self._create(db_session, "Old title")
+        crud.update_task(db_session, task.id, TaskUpdate(title="New title"))
+        assert crud.get_all_tasks(db_session, q="old")[0] == []
+        assert len(crud.get_all_tasks(db_session, q="new")[0]) == 1
+
+        crud.delete_task(db_session, task.id)
+        assert crud.get_all_tasks(db_session, q="new") == ([], 0)
+
+    def test_rejects_cursor(self, db_session):
+        task = self._create(db_session, "Cursor")
+        with pytest.raises(ValueError):
+            crud.get_all_tasks(db_session, q="cursor", cursor=crud.encode_cursor(task))
+
+
+class TestDueDateFilters:
+    """Tests for due-date range and overdue filtering."""
+
+    def _add(self, db_session, title, due_date, status=TaskStatus.TODO):
+        task = Task(title=title, status=status, due_date=due_date)
+        db_session.add(task)
+        db_session.commit()
+        return task
+
+    def _plans(self, db_session, **filters):
+        """Run ``get_task_rows`` and return the query plan of each statement."""
+        captured = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            captured.append((statement, parameters))
+
+        bind = db_session.get_bind()
+        event.listen(bind, "before_cursor_execute", _record)
+        try:
+            crud.get_task_rows(db_session, **filters)
+        finally:
+            event.remove(bind, "before_cursor_execute", _record)
+        connection = db_session.connection()
+        return [
+            " ".join(
+                row[3]
+                for row in connection.exec_driver_sql(
+                    "EXPLAIN QUERY PLAN " + statement, parameters
+                )
+            )
+            for statement, parameters in captured
+        ]
+
+    def test_due_range(self, db_session):
+        self._add(db_session, "Early", datetime(2030, 1, 1, tzinfo=timezone.utc))
+        middle = self._add(
+            db_session, "Middle", datetime(2030, 2, 1, tzinfo=timezone.utc)
+        )
+        self._add(db_session, "Late", datetime(2030, 3, 1, tzinfo=timezone.utc))
+
+        tasks, total = crud.get_all_tasks(
+            db_session,
+            due_after=datetime(2030, 2, 1, tzinfo=timezone.utc),
+            due_before=datetime(2030, 3, 1, tzinfo=timezone.utc),
+        )
+        assert [t.id for t in tasks] == [middle.id]
+        assert total == 1
+
+    def test_offset_bounds_compare_in_utc(self, db_session):
+        early = self._add(
+            db_session, "Early", datetime(2030, 1, 1, 5, tzinfo=timezone.utc)
+        )
+        self._add(db_session, "Late", datetime(2030, 1, 1, 10, tzinfo=timezone.utc))
+
+        plus_five = timezone(timedelta(hours=5))
+        tasks, total = crud.get_all_tasks(
+            db_session, due_before=datetime(2030, 1, 1, 12, tzinfo=plus_five)
+        )
+        assert [t.id for t in tasks] == [early.id]
+        assert total == 1
+
+    def test_overdue_keeps_open_past_due_tasks(self, db_session):
+        past = datetime.now(timezone.utc) - timedelta(days=1)
+        late = self._add(db_session, "Late", past)
+        self._add(db_session, "Done", past, status=TaskStatus.COMPLETED)
+        future = datetime.now(timezone.utc) + timedelta(days=1)
+        self._add(db_session, "Upcoming", future)
+
+        tasks, total = crud.get_all_tasks(db_session, overdue=True)
+        assert [t.id for t in tasks] == [late.id]
+        assert total == 1
+        assert crud.get_all_tasks(
+            db_session, overdue=True, status=TaskStatus.COMPLETED
+        ) == ([], 0)
+
+    def test_next_overdue_at(self, db_session):
+        soon = datetime(2030, 1, 1, tzinfo=timezone.utc)
+        assert crud.next_overdue_at(db_session) is None
+        self._add(db_session, "Soon", soon)
+        self._add(db_session, "Done", datetime(2029, 1, 1), TaskStatus.COMPLETED)
+        self._add(db_session, "Later", datetime(2031, 1, 1, tzinfo=timezone.utc))
+        assert crud.next_overdue_at(db_session) == soon.replace(tzinfo=None)
+
+    @pytest.mark.parametrize(
+        "filters",
+        [
+            {"overdue": True},
+            {"status": TaskStatus.TODO, "due_before": datetime(2030, 1, 1)},
+            {"due_after": datetime(2030, 1, 1), "due_before": datetime(2030, 2, 1)},
+        ],
+    )
+    def test_due_filters_use_status_due_date_index(self, db_session, filters):
+        plans = self._plans(db_session, **filters)
+        assert len(plans) == 2  # page and total
+        for plan in plans:
+            assert "INDEX ix_tasks_status_due_date (status=? AND due_date" in plan
+
+
+class TestTaskStats:
+    """Tests for the maintained dashboard statistics."""
+
+    def _summary(self, db_session):
+        return {
+            (stat.status, stat.due_day): stat.count
+            for stat in db_session.scalars(select(TaskDueStat))
+        }
+
+    def _group_by(self, db_session):
+        due_day = func.date(Task.due_date)
+        statement = select(Task.status, due_day, func.count()).group_by(
+            Task.status, due_day
+        )
+        return {(s, day): count for s, day, count in db_session.execute(statement)}
+
+    def test_summary_matches_group_by_after_mutations(self, db_session):
+        tasks = [
+            crud.create_task(
+                db_session,
+                TaskCreate(
+                    title=f"Task {i}",
+                    due_date=datetime(2030, 3, 1 + i % 4, 10, tzinfo=timezone.utc),
+                ),
+            )
+            for i in range(12)
+        ]
+        crud.bulk_create_tasks(
+            db_session,
+            [
+                TaskCreate(title="Bulk", due_date=datetime(2030, 3, 2, 9, 0))
+                for _ in range(5)
+            ],
+        )
+        crud.update_task_status(
+            db_session, tasks[0].id, TaskUpdateStatus(status=TaskStatus.IN_PROGRESS)
+        )
+        crud.update_task(
+            db_session,
+            tasks[1].id,
+            TaskUpdate(
+                status=TaskStatus.COMPLETED,
+                due_date=datetime(2030, 4, 1, 10, tzinfo=timezone.utc),
+            ),
+        )
+        crud.update_task(db_session, tasks[2].id, TaskUpdate(title="Title only"))
+        crud.bulk_update_task_status(
+            db_session, TaskStatus.COMPLETED, ids=[t.id for t in tasks[3:6]]
+        )
+        crud.delete_task(db_session, tasks[6].id)
+        crud.delete_task(db_session, tasks[7].id)
+
+        assert self._summary(db_session) == self._group_by(db_session)
+
+    def test_stats(self, db_session):
+        now = datetime.now(timezone.utc)
+        for due_date, task_status in [
+            (now - timedelta(days=3), TaskStatus.TODO),
+            (now - timedelta(days=3), TaskStatus.COMPLETED),
+            (now - timedelta(seconds=1), TaskStatus.IN_PROGRESS),
+            (now + timedelta(days=1), TaskStatus.TODO),
+            (now + timedelta(days=1), TaskStatus.TODO),
+            (now + timedelta(days=1), TaskStatus.COMPLETED),
+            (now + timedelta(days=30), TaskStatus.TODO),
+        ]:
+            db_session.add(Task(title="Task", status=task_status, due_date=due_date))
+        db_session.commit()
+
+        stats = crud.get_task_stats(db_session, days=3)
+        assert stats["total"] == 7
+        assert stats["by_status"] == {
+            TaskStatus.TODO: 4,
+            TaskStatus.IN_PROGRESS: 1,
+            TaskStatus.COMPLETED: 2,
+        }
+        assert stats["overdue"] == 2
+        tomorrow = (now + timedelta(days=1)).date()
+        assert [d["day"] for d in stats["due_by_day"]][1] == tomorrow
+        assert stats["due_by_day"][1]["count"] == 2
+        assert stats["due_by_day"][2]["count"] == 0
+
+    def test_rebuild_corrects_drift(self, db_session):
+        task = crud.create_task(
+            db_session,
+            TaskCreate(title="Counted", due_date=datetime(2030, 3, 1, 10, 0)),
+        )
+        db_session.execute(TaskDueStat.__table__.update().values(count=5))
+        db_session.add(
+            TaskDueStat(status=TaskStatus.COMPLETED, due_day="2030-01-01", count=2)
+        )
+        db_session.commit()
+
+        drift = crud.rebuild_task_stats(db_session)
+        assert drift == {
+            (task.status, "2030-03-01"): 4,
+            (TaskStatus.COMPLETED, "2030-01-01"): 2,
+        }
+        assert self._summary(db_session) == self._group_by(db_session)
+        assert crud.rebuild_task_stats(db_session) == {}
+
+
+class TestSparseFields:
+    """Tests for selecting a subset of task columns."""
+
+    def test_parse_fields(self):
+        assert crud.parse_fields(None) is None
+        assert crud.parse_fields(" , ") is None
+        assert crud.parse_fields("status, title") == ("id", "title", "status")
+
+    def test_unknown_field_raises(self):
+        with pytest.raises(ValueError, match="secret"):
+            crud.parse_fields("title,secret")
+
+    def test_rows_select_only_requested_columns(self, db_session, sql_statements):
+        crud.create_task(
+            db_session,
+            TaskCreate(
+                title="Sparse",
+                description="Long text",
+                due_date=datetime(2030, 3, 1, tzinfo=timezone.utc),
+            ),
+        )
+        sql_statements.clear()
+        rows, _ = crud.get_task_rows(
+            db_session, include_total=False, fields=("id", "title")
+        )
+        assert "description" not in sql_statements[0]
+        assert rows[0]._fields == ("id", "title", "created_at")
+
+        row = crud.get_task_row(db_session, rows[0].id, ("id", "status"))
+        assert row._fields == ("id", "status")
+        assert "description" not in sql_statements[-1]
+
+
+class TestArchive:
+    """Tests for moving completed tasks to the archive table."""
+
+    def _create(self, db_session, title, status=TaskStatus.TODO, age_days=0):
+        task = crud.create_task(
+            db_session,
+            TaskCreate(
+                title=title,
+                status=status,
+                due_date=datetime(2030, 3, 1, tzinfo=timezone.utc),
+            ),
+        )
+        if age_days:
+            finished = datetime.now(timezone.utc) - timedelta(days=age_days)
+            db_session.execute(
+                update(Task).where(Task.id == task.id).values(updated_at=finished)
+            )
+            db_session.commit()
+        return task
+
+    @pytest.fixture()
+    def archived(self, db_session):
+        """Five tasks, of which the two long-completed ones get archived."""
+        done = TaskStatus.COMPLETED
+        ids = [
+            self._create(db_session, "Old done", done, age_days=40).id,
+            self._create(db_session, "Old open", age_days=40).id,
+            self._create(db_session, "Older done", done, age_days=60).id,
+            self._create(db_session, "Recent done", done).id,
+            self._create(db_session, "Newest").id,
+        ]
+        moved = crud.archive_completed_tasks(db_session, timedelta(days=30))
+        assert moved == 2
+        return ids
+
+    def test_moves_only_long_completed_tasks(self, db_session, archived):
+        live = db_session.scalars(select(Task.title).order_by(Task.id)).all()
+        assert live == ["Old open", "Recent done", "Newest"]
+        rows = db_session.scalars(select(ArchivedTask).order_by(ArchivedTask.id))
+        assert [(t.id, t.title) for t in rows] == [
+            (archived[0], "Old done"),
+            (archived[2], "Older done"),
+        ]
+        assert crud.count_tasks(db_session, TaskStatus.COMPLETED) == 1
+
+    def test_moves_in_chunks(self, db_session):
+        for i in range(5):
+            self._create(db_session, f"Done {i}", TaskStatus.COMPLETED, age_days=40)
+        self._create(db_session, "Newest")
+        commits = []
+        event.listen(db_session, "after_commit", commits.append)
+        assert crud.archive_completed_tasks(db_session, timedelta(days=30), 2) == 5
+        assert len(commits) == 3
+        assert db_session.scalar(select(func.count()).select_from(Task)) == 1
+
+    def test_list_excludes_archive_by_default(self, db_session, archived):
+        rows, total = crud.get_task_rows(db_session)
+        assert total == 3
+        assert archived[0] not in [row.id for row in rows]
+
+    def test_list_includes_archive_in_order(self, db_session, archived):
+        rows, total = crud.get_task_rows(db_session, include_archived=True)
+        assert total == 5
+        assert [row.id for row in rows] == archived[::-1]
+
+        rows, total = crud.get_task_rows(
+            db_session, status=TaskStatus.COMPLETED, include_archived=True
+        )
+        assert total == 3
+        assert {row.title for row in rows} == {"Old done", "Older done", "Recent done"}
+
+    def test_offset_and_cursor_pages_span_both_tables(self, db_session, archived):
+        expected = archived[::-1]
+        by_offset = []
+        for skip in range(0, 5, 2):
+            rows, _ = crud.get_task_rows(
+                db_session, skip=skip, limit=2, include_archived=True
+            )
+            by_offset += [row.id for row in rows]
+        assert by_offset == expected
+
+        rows, _ = crud.get_task_rows(db_session, limit=2, include_archived=True)
+        by_cursor = [row.id for row in rows]
+        while len(rows) == 2:
+            rows, _ = crud.get_task_rows(
+                db_session,
+                limit=2,
+                cursor=crud.encode_cursor(rows[-1]),
+                include_archived=True,
+            )
+            by_cursor += [row.id for row in rows]
+        assert by_cursor == expected
+
+    def test_archive_rejects_search(self, db_session):
+        with pytest.raises(ValueError):
+            crud.get_task_rows(db_session, q="done", include_archived=True)
+
+    def test_ids_are_not_reused_after_archiving(self, db_session):
+        archived = self._create(db_session, "Done", TaskStatus.COMPLETED, age_days=40)
+        newest = self._create(db_session, "Newest")
+        archived_id, newest_id = archived.id, newest.id
+        assert crud.archive_completed_tasks(db_session, timedelta(days=30)) == 1
+        crud.delete_task(db_session, newest_id)
+
+        task = self._create(db_session, "Created after")
+        assert task.id > newest_id
+        rows, total = crud.get_task_rows(db_session, include_archived=True)
+        assert [row.id for row in rows] == [task.id, archived_id]
+        assert total == 2
+
+    def test_cursor_overrides_skip(self, db_session, archived):
+        first, _ = crud.get_task_rows(db_session, limit=2, include_archived=True)
+        rows, _ = crud.get_task_rows(
+            db_session,
+            skip=2,
+            limit=3,
+            cursor=crud.encode_cursor(first[-1]),
+            include_archived=True,
+        )
+        assert [row.id for row in rows] == archived[::-1][2:]
+
+    def test_archive_total_uses_counters(self, db_session, archived, sql_statements):
+        sql_statements.clear()
+        _, total = crud.get_task_rows(
+            db_session, status=TaskStatus.COMPLETED, include_archived=True
+        )
+        assert total == 3
+        assert not any("count(*)" in sql.lower() for sql in sql_statements)
@@ -0,0 +1,212 @@
+"""Tests for database configuration and SQLite tuning."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app import database
+from app.database import (
+    SQLITE_PROFILES,
+    apply_sqlite_pragmas,
+    read_only_url,
+    sqlite_pragmas,
+)
+from app.metrics import CHECKOUT_WAIT
+from app.models import SCHEMA_VERSION, init_schema
+
+
+class TestSqlitePragmas:
+    """Tests for the per-connection PRAGMA profiles."""
+
+    def test_production_profile_applied_on_connect(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'tuned.db'}")
+        apply_sqlite_pragmas(engine, sqlite_pragmas("production"))
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+            assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+
+    def test_none_profile_is_empty(self):
+        assert SQLITE_PROFILES["none"] == {}
+
+    def test_env_override(self, monkeypatch):
+        monkeypatch.setenv("SQLITE_PRAGMA_BUSY_TIMEOUT", "12000")
+        assert sqlite_pragmas("production")["busy_timeout"] == "12000"
+
+    def test_unknown_profile_raises(self):
+        with pytest.raises(ValueError):
+            sqlite_pragmas("turbo")
+
+
+class TestSchemaInit:
+    """Tests for the versioned schema setup run at startup."""
+
+    def test_creates_schema_once(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+        assert init_schema(engine) is True
+        assert init_schema(engine) is False
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA user_version")).scalar() == SCHEMA_VERSION
+            assert conn.execute(text("SELECT COUNT(*) FROM tasks")).scalar() == 0
+
+    def test_upgrade_adds_missing_indexes(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+        init_schema(engine)
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX ix_tasks_status_due_date"))
+            conn.execute(text("PRAGMA user_version = 0"))
+
+        assert init_schema(engine) is True
+        with engine.connect() as conn:
+            indexes = {row[1] for row in conn.execute(text("PRAGMA index_list(tasks)"))}
+        assert "ix_tasks_status_due_date" in indexes
+
+    def test_upgrade_rebuilds_tasks_with_autoincrement(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'reuse.db'}")
+        init_schema(engine)
+        with engine.begin() as conn:
+            ddl = conn.execute(
+                text("SELECT sql FROM sqlite_master WHERE name = 'tasks'")
+            ).scalar()
+            conn.execute(text("DROP TABLE tasks"))
+            conn.execute(text(ddl.replace("AUTOINCREMENT", "")))
+            conn.execute(
+                text(
+                    "INSERT INTO tasks VALUES (1, 'Kept', NULL, 'TODO', "
+                    "'2030-03-01', '2030-01-01', '2030-01-01')"
+                )
+            )
+            conn.execute(
+                text(
+                    "INSERT INTO archived_tasks VALUES (5, 'Archived', NULL, "
+                    "'COMPLETED', '2030-03-01', '2029-01-01', '2029-01-01', "
+                    "'2029-02-01')"
+                )
+            )
+            conn.execute(text("PRAGMA user_version = 2"))
+
+        assert init_schema(engine) is True
+        with engine.begin() as conn:
+            assert "AUTOINCREMENT" in conn.execute(
+                text("SELECT sql FROM sqlite_master WHERE name = 'tasks'")
+            ).scalar()
+            conn.execute(
+                text(
+                    "INSERT INTO tasks (title, status, due_date, created_at, "
+                    "updated_at) VALUES ('New', 'TODO', '2030-03-01', "
+                    "'2030-01-02', '2030-01-02')"
+                )
+            )
+            rows = conn.execute(text("SELECT id, title FROM tasks ORDER BY id")).all()
+            todo = conn.execute(
+                text("SELECT count FROM task_counters WHERE status = 'TODO'")
+            ).scalar()
+            indexes = {row[1] for row in conn.execute(text("PRAGMA index_list(tasks)"))}
+        assert rows == [(1, "Kept"), (6, "New")]
+        assert todo == 2  # seeded with the kept row, then counted by the trigger
+        assert "ix_tasks_status_due_date" in indexes
+
+    def test_read_only_database_at_version(self, tmp_path):
+        path = tmp_path / "ro.db"
+        init_schema(create_engine(f"sqlite:///{path}"))
+        read_only = create_engine(f"sqlite:///file:{path}?mode=ro&uri=true")
+        assert init_schema(read_only) is False
+
+    def test_newer_schema_raises(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'new.db'}")
+        with engine.begin() as conn:
+            conn.execute(text(f"PRAGMA user_version = {SCHEMA_VERSION + 1}"))
+        with pytest.raises(RuntimeError):
+            init_schema(engine)
+
+    def test_import_touches_no_database(self, tmp_path):
+        missing = tmp_path / "missing" / "tasks.db"
+        code = (
+            "import sys, app.main; "
+            "assert 'sqlalchemy.ext.asyncio' not in sys.modules"
+        )
+        env = {**os.environ, "DATABASE_URL": f"sqlite:///{missing}"}
+        env.pop("DATABASE_MODE", None)
+        backend = Path(__file__).resolve().parents[1]
+        subprocess.run([sys.executable, "-c", code], env=env, cwd=backend, check=True)
+        assert not missing.parent.exists()
+
+
+@pytest.fixture()
+def split_engines(tmp_path, monkeypatch):
+    """Point the lazy engines at a file database with the read pool on."""
+    monkeypatch.setattr(database, "DATABASE_URL", f"sqlite:///{tmp_path / 'rw.db'}")
+    monkeypatch.setattr(database, "READ_POOL_SIZE", 4)
+    monkeypatch.setattr(database, "_engine", None)
+    monkeypatch.setattr(database, "_read_engine", None)
+    init_schema(database.get_engine())
+    yield
+    database.get_engine().dispose()
+    if database._read_engine is not None:
+        database._read_engine.dispose()
+
+
+class TestReadWriteSplit:
+    """Tests for the read-only pool and the single writer connection."""
+
+    def test_read_only_url(self):
+        assert (
+            read_only_url("sqlite:///./tasks.db")
+            == "sqlite:///file:./tasks.db?mode=ro&uri=true"
+        )
+        assert read_only_url("sqlite:///:memory:") is None
+        assert read_only_url("sqlite://") is None
+
+    def test_pools(self, split_engines):
+        assert database.get_engine().pool.size() == 1
+        assert database.get_read_engine().pool.size() == 4
+        assert set(database.pool_status()) == {"write", "read"}
+
+    def test_read_session_cannot_write(self, split_engines):
+        db = next(database.get_read_db())
+        try:
+            with pytest.raises(OperationalError, match="readonly"):
+                db.execute(text("DELETE FROM tasks"))
+        finally:
+            db.close()
+
+    def test_reads_see_committed_writes(self, split_engines):
+        writer = next(database.get_write_db())
+        writer.execute(
+            text(
+                "INSERT INTO tasks (title, status, due_date, created_at, updated_at) "
+                "VALUES ('a', 'TODO', '2030-01-01', '2030-01-01', '2030-01-01')"
+            )
+        )
+        writer.commit()
+        writer.close()
+        reader = next(database.get_read_db())
+        assert reader.execute(text("SELECT COUNT(*) FROM tasks")).scalar() == 1
+        reader.close()
+
+    def test_session_checks_out_on_first_use(self, split_engines):
+        pool = database.get_read_engine().pool
+
+        def observed() -> int:
+            counts = CHECKOUT_WAIT._values.get(("read",), [[0]])[0]
+            return sum(counts)
+
+        before = observed()
+        sessions = database.get_read_db()
+        db = next(sessions)
+        assert pool.checkedout() == 0
+        db.execute(text("SELECT 1"))
+        assert pool.checkedout() == 1
+        assert observed() == before + 1
+        sessions.close()
+        assert pool.checkedout() == 0
+
+    def test_disabled_shares_the_writer_engine(self, split_engines, monkeypatch):
+        monkeypatch.setattr(database, "READ_POOL_SIZE", 0)
+        assert database.get_read_engine() is database.get_engine()
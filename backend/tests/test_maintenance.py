@@ -0,0 +1,44 @@
+"""Tests for the periodic maintenance jobs."""
+
+import threading
+
+from app import maintenance
+from app.maintenance import PeriodicJob
+
+
+def test_job_runs_every_interval_and_survives_errors():
+    calls = []
+    ran_twice = threading.Event()
+
+    def flaky() -> int:
+        calls.append(1)
+        if len(calls) == 2:
+            ran_twice.set()
+        if len(calls) == 1:
+            raise RuntimeError("database is locked")
+        return 0
+
+    job = PeriodicJob("test-job", 0.01, flaky)
+    assert ran_twice.wait(5)
+    job.close()
+    assert not job._thread.is_alive()
+
+
+def test_first_run_waits_an_interval():
+    calls = []
+    job = PeriodicJob("test-job", 60, lambda: calls.append(1))
+    job.close()
+    assert calls == []
+
+
+def test_start_maintenance_honours_settings(monkeypatch):
+    monkeypatch.setattr(maintenance, "ARCHIVE_AFTER_DAYS", 0)
+    monkeypatch.setattr(maintenance, "CHANGE_COMPACT_INTERVAL", 60)
+    jobs = maintenance.start_maintenance(engine=None)
+    try:
+        assert [job.name for job in jobs] == ["change-compactor"]
+    finally:
+        maintenance.stop_maintenance(jobs)
+
+    monkeypatch.setattr(maintenance, "CHANGE_COMPACT_INTERVAL", 0)
+    assert maintenance.start_maintenance(engine=None) == []
@@ -0,0 +1,54 @@
+"""Tests for request/SQL instrumentation and the /metrics endpoint."""
+
+from app.metrics import Histogram
+
+
+def sample(text: str, line_prefix: str) -> float:
+    """Return the value of the first exposition line starting with the prefix."""
+    for line in text.splitlines():
+        if line.startswith(line_prefix):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+class TestHistogram:
+    """Unit tests for the Histogram exposition."""
+
+    def test_buckets_are_cumulative(self):
+        histogram = Histogram("demo_seconds", "Demo.", (0.1, 1.0), ("route",))
+        histogram.observe(0.05, "/a")
+        histogram.observe(0.5, "/a")
+        histogram.observe(5, "/a")
+        lines = histogram.render()
+        assert 'demo_seconds_bucket{route="/a",le="0.1"} 1' in lines
+        assert 'demo_seconds_bucket{route="/a",le="1.0"} 2' in lines
+        assert 'demo_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+        assert 'demo_seconds_count{route="/a"} 3' in lines
+        assert "# TYPE demo_seconds histogram" in lines
+
+
+class TestMetricsEndpoint:
+    """Tests for GET /metrics."""
+
+    def test_records_route_latency_and_sql(self, client, created_task):
+        route = 'method="GET",route="/api/tasks/{task_id}"'
+        before = client.get("/metrics").text
+        client.get(f"/api/tasks/{created_task['id']}")
+        client.get("/api/tasks/999999")
+        after = client.get("/metrics").text
+
+        ok = f'http_requests_total{{{route},status="200"}}'
+        missing = f'http_requests_total{{{route},status="404"}}'
+        assert sample(after, ok) == sample(before, ok) + 1
+        assert sample(after, missing) == sample(before, missing) + 1
+        count = f"http_request_duration_seconds_count{{{route}}}"
+        assert sample(after, count) == sample(before, count) + 2
+        statements = f"http_request_sql_statements_sum{{{route}}}"
+        assert sample(after, statements) > sample(before, statements)
+
+    def test_exposes_threadpool_and_cache_gauges(self, client):
+        response = client.get("/metrics")
+        assert response.headers["content-type"].startswith("text/plain")
+        assert sample(response.text, "threadpool_threads_limit ") > 0
+        assert "threadpool_queue_depth " in response.text
+        assert "task_cache_hits_total " in response.text
@@ -0,0 +1,89 @@
+"""Tests for the slow-query log and N+1 detection."""
+
+import logging
+
+import pytest
+
+from app import querylog
+from app.querylog import query_log
+
+
+@pytest.fixture(autouse=True)
+def restore_query_log():
+    """Restore the query log settings and clear its entries after each test."""
+    settings = query_log.settings()
+    query_log.recent.clear()
+    yield
+    query_log.configure(**settings)
+    query_log.recent.clear()
+
+
+def entries(kind: str) -> list[dict]:
+    return [entry for entry in query_log.recent if entry["kind"] == kind]
+
+
+class TestSlowQueries:
+    """Tests for slow statement capture."""
+
+    def test_logs_statement_with_plan_and_route(self, client, created_task, caplog):
+        query_log.configure(slow_ms=0, parameters=True)
+        with caplog.at_level(logging.WARNING, logger="app.querylog"):
+            client.get("/api/tasks?status=todo")
+
+        listing = [
+            entry
+            for entry in entries("slow_query")
+            if entry["statement"].lstrip().startswith("SELECT tasks.id")
+        ]
+        assert listing[0]["route"] == "GET /api/tasks"
+        assert "TODO" in listing[0]["parameters"]
+        plan = "\n".join(listing[0]["plan"])
+        assert "ix_tasks_status_created_at_id" in plan
+        assert "Slow query" in caplog.text
+
+    def test_parameters_redacted_by_default(self, client, created_task):
+        query_log.configure(slow_ms=0, parameters=False)
+        client.get("/api/tasks?status=todo")
+        assert {entry["parameters"] for entry in entries("slow_query")} == {
+            "(redacted)"
+        }
+
+    def test_fast_statements_are_not_logged(self, client, created_task):
+        query_log.configure(slow_ms=10_000)
+        client.get("/api/tasks")
+        assert entries("slow_query") == []
+
+    def test_disabled(self, client, created_task):
+        query_log.configure(enabled=False, slow_ms=0, max_statements=1)
+        client.get("/api/tasks")
+        assert list(query_log.recent) == []
+
+
+class TestStatementCount:
+    """Tests for flagging requests with too many statements."""
+
+    def test_flags_request_over_limit(self, client, created_task):
+        query_log.configure(slow_ms=10_000, max_statements=1)
+        client.get("/api/tasks")
+        flagged = entries("too_many_statements")
+        assert flagged[0]["route"] == "GET /api/tasks"
+        assert flagged[0]["statements"] > 1
+
+
+class TestQueryLogEndpoint:
+    """Tests for the runtime toggle."""
+
+    def test_hidden_unless_enabled(self, client):
+        assert client.get("/debug/query-log").status_code == 404
+        assert client.put("/debug/query-log", json={"slow_ms": 0}).status_code == 404
+        assert query_log.slow_ms != 0
+
+    def test_put_changes_settings(self, client, monkeypatch):
+        monkeypatch.setattr(querylog, "QUERY_LOG_DEBUG_ENDPOINTS", True)
+        response = client.put(
+            "/debug/query-log", json={"slow_ms": 5, "max_statements": 3}
+        )
+        assert response.json()["slow_ms"] == 5
+        assert response.json()["max_statements"] == 3
+        assert query_log.slow_ms == 5
+        assert client.get("/debug/query-log").json()["recent"] == []
@@ -1,7 +1,7 @@
 """Tests for Pydantic schema validation — TDD style."""
 
 import pytest
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pydantic import ValidationError
 
 from app.schemas import TaskCreate, TaskUpdateStatus, TaskUpdate
@@ -71,6 +71,14 @@ class TestTaskCreateSchema:
         )
         assert task.title == "Future task"
 
+    def test_due_date_normalized_to_utc(self):
+        task = TaskCreate(
+            title="Offset task",
+            due_date=datetime(2030, 6, 1, 12, 0, tzinfo=timezone(timedelta(hours=5))),
+        )
+        assert task.due_date == datetime(2030, 6, 1, 7, 0, tzinfo=timezone.utc)
+        assert task.due_date.utcoffset() == timedelta(0)
+
 
 class TestTaskUpdateStatusSchema:
     """Validation tests for TaskUpdateStatus."""
@@ -112,3 +120,7 @@ class TestTaskUpdateSchema:
             due_date=datetime(2030, 6, 1, 10, 0, tzinfo=timezone.utc),
         )
         assert update.due_date is not None
+
+    def test_naive_due_date_taken_as_utc(self):
+        update = TaskUpdate(due_date=datetime(2030, 6, 1, 10, 0))
+        assert update.due_date == datetime(2030, 6, 1, 10, 0, tzinfo=timezone.utc)
@@ -0,0 +1,169 @@
+"""Tests for the group-commit writer."""
+
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import Session
+
+from app import crud, writer
+from app.cache import task_cache
+from app.models import Task, TaskStatus, init_schema
+from app.schemas import TaskCreate, TaskUpdateStatus
+from app.writer import GroupCommitWriter
+
+
+@pytest.fixture()
+def file_engine(tmp_path):
+    """A file database, so the writer thread gets its own connections."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'writer.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    init_schema(engine)
+    yield engine
+    writer.close_writers()
+    engine.dispose()
+
+
+def new_task(title: str) -> TaskCreate:
+    return TaskCreate(title=title, due_date=datetime(2030, 3, 1, tzinfo=timezone.utc))
+
+
+def count_commits(engine) -> list:
+    commits = []
+    event.listen(engine, "commit", lambda conn: commits.append(conn))
+    return commits
+
+
+def task_count(engine) -> int:
+    with Session(engine) as db:
+        return db.scalar(select(func.count()).select_from(Task))
+
+
+class TestGroupCommitWriter:
+    """Tests for batching mutations into one transaction."""
+
+    def test_concurrent_calls_share_one_commit(self, file_engine):
+        group = GroupCommitWriter(file_engine, window=0.2, max_ops=10)
+        commits = count_commits(file_engine)
+        futures = [
+            group.submit(crud.create_task, new_task(f"Task {n}"))
+            for n in range(10)
+        ]
+        tasks = [future.result() for future in futures]
+        group.close()
+
+        assert sorted(task.title for task in tasks) == [f"Task {n}" for n in range(10)]
+        assert len({task.id for task in tasks}) == 10
+        assert len(commits) == 1
+        assert task_count(file_engine) == 10
+
+    def test_failing_call_is_rolled_back_alone(self, file_engine):
+        def create_then_fail(db, task_data):
+            crud.create_task(db, task_data)
+            raise ValueError("boom")
+
+        group = GroupCommitWriter(file_engine, window=0.2)
+        kept = group.submit(crud.create_task, new_task("Kept"))
+        failed = group.submit(create_then_fail, new_task("Dropped"))
+        after = group.submit(crud.create_task, new_task("Also kept"))
+
+        assert kept.result().title == "Kept"
+        with pytest.raises(ValueError, match="boom"):
+            failed.result()
+        assert after.result().title == "Also kept"
+        group.close()
+        with Session(file_engine) as db:
+            assert sorted(db.scalars(select(Task.title))) == ["Also kept", "Kept"]
+
+    def test_commit_failure_reaches_every_caller(self, file_engine):
+        group = GroupCommitWriter(file_engine, window=0.2)
+
+        def _fail(conn):
+            raise RuntimeError("disk full")
+
+        event.listen(file_engine, "commit", _fail)
+        futures = [
+            group.submit(crud.create_task, new_task(f"Task {n}"))
+            for n in range(3)
+        ]
+        for future in futures:
+            with pytest.raises(RuntimeError, match="disk full"):
+                future.result()
+        event.remove(file_engine, "commit", _fail)
+        group.close()
+        assert task_count(file_engine) == 0
+
+    def test_cancelled_call_is_skipped_and_writer_survives(self, file_engine):
+        group = GroupCommitWriter(file_engine, window=0.2)
+        kept = group.submit(crud.create_task, new_task("Kept"))
+        cancelled = group.submit(crud.create_task, new_task("Cancelled"))
+        assert cancelled.cancel()
+
+        assert kept.result(timeout=5).title == "Kept"
+        later = group.submit(crud.create_task, new_task("Later"))
+        assert later.result(timeout=5).title == "Later"
+        assert group._thread.is_alive()
+        group.close()
+        with Session(file_engine) as db:
+            assert sorted(db.scalars(select(Task.title))) == ["Kept", "Later"]
+
+    def test_unexpected_error_does_not_stop_the_writer(
+        self, file_engine, monkeypatch
+    ):
+        group = GroupCommitWriter(file_engine, window=0.01)
+        monkeypatch.setattr(group, "_commit_batch", lambda batch: 1 / 0)
+        with pytest.raises(ZeroDivisionError):
+            group.submit(crud.create_task, new_task("Lost")).result(timeout=5)
+        monkeypatch.undo()
+        assert group.run(crud.create_task, new_task("Kept")).title == "Kept"
+        group.close()
+
+    def test_max_ops_splits_batches(self, file_engine):
+        group = GroupCommitWriter(file_engine, window=0.2, max_ops=2)
+        commits = count_commits(file_engine)
+        futures = [
+            group.submit(crud.create_task, new_task(f"Task {n}"))
+            for n in range(5)
+        ]
+        for future in futures:
+            future.result()
+        group.close()
+        assert len(commits) == 3
+
+    def test_cache_invalidated_after_commit(self, file_engine):
+        with Session(file_engine) as db:
+            task = crud.create_task(db, new_task("Cached"))
+        task_cache.put(task.id, 1, b"stale")
+        group = GroupCommitWriter(file_engine, window=0)
+
+        def _recache(db, task_id, status_data):
+            # A reader caching the old row after crud's own invalidation
+            updated = crud.update_task_status(db, task_id, status_data)
+            task_cache.put(task_id, 1, b"stale")
+            return updated
+
+        group.run(_recache, task.id, TaskUpdateStatus(status=TaskStatus.COMPLETED))
+        group.close()
+        assert task_cache.get(task.id, 1) is None
+
+
+class TestWrite:
+    """Tests for the route-facing helper."""
+
+    def test_runs_inline_when_disabled(self, file_engine, monkeypatch):
+        monkeypatch.setattr(writer, "WRITE_BATCHING", False)
+        with Session(file_engine) as db:
+            task = writer.write(db, crud.create_task, new_task("Inline"))
+            assert task in db
+        assert writer._writers == {}
+
+    def test_uses_the_sessions_engine_when_enabled(self, file_engine, monkeypatch):
+        monkeypatch.setattr(writer, "WRITE_BATCHING", True)
+        with Session(file_engine) as db:
+            task = writer.write(db, crud.create_task, new_task("Batched"))
+            assert task not in db
+            assert writer.write(db, crud.delete_task, task.id) is True
+        assert list(writer._writers) == [file_engine]
+        assert task_count(file_engine) == 0
@@ -59,13 +59,13 @@ export const taskApi = {
     const params = new URLSearchParams();
     if (status && status !== "all") params.set("status", status);
     const url = `${API_BASE_URL}/api/tasks${params.toString() ? `?${params}` : ""}`;
-    const res = await fetch(url, { cache: "no-store" });
+    const res = await fetch(url, { cache: "no-cache" });
     return handleResponse<TaskListResponse>(res);
   },
 
   async getById(id: number): Promise<Task> {
     const res = await fetch(`${API_BASE_URL}/api/tasks/${id}`, {
-      cache: "no-store",
+      cache: "no-cache",
     });
     return handleResponse<Task>(res);
   },